@@ -0,0 +1,70 @@
+"""
+Benchmark: RDF nativo por bloques de frames con 1..N procesos.
+Verifica además que el resultado en paralelo coincide con el serie.
+
+Uso:
+    python -m benchmarks.bench_parallel_rdf [n_frames] [n_moleculas] [max_procesos]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from src.model.rdf_engine import MultiRdfEngine, make_group
+from src.model.xtc_reader import write_xtc_frame
+from src.model.parallel_frames import default_workers
+
+
+def write_synthetic_xtc(path, n_frames, n_mol, box=6.0):
+    """Mezcla binaria: soluto triatómico + solvente diatómico, posiciones aleatorias"""
+    rng = np.random.default_rng(0)
+    n_atoms = 3 * n_mol + 2 * n_mol
+    with open(path, 'wb') as f:
+        for i in range(n_frames):
+            centers = np.repeat(rng.random((2 * n_mol, 3)) * box, [3] * n_mol + [2] * n_mol, axis=0)
+            coords = (centers + rng.normal(0.0, 0.05, (n_atoms, 3))) % box
+            write_xtc_frame(f, coords, [box, box, box], i * 1000, i * 2.0)
+
+
+def build_pairs(n_mol):
+    solute_atoms = np.arange(3 * n_mol)
+    solvent_atoms = np.arange(3 * n_mol, 5 * n_mol)
+    solute = make_group(solute_atoms, mol_ids=solute_atoms // 3, masses=np.tile([12.0, 1.0, 1.0], n_mol))
+    solvent = make_group(solvent_atoms, mol_ids=(solvent_atoms - 3 * n_mol) // 2)
+    return [(solute, solute), (solvent, solvent), (solute, solvent)]
+
+
+def main():
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    n_mol = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else default_workers()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xtc")
+        print(f"Generando {n_frames} frames con {5 * n_mol} átomos...")
+        write_synthetic_xtc(path, n_frames, n_mol)
+        pairs = build_pairs(n_mol)
+
+        reference = None
+        base_time = None
+        workers = 1
+        while workers <= max_workers:
+            engine = MultiRdfEngine(pairs, bin_width=0.002, cutoff=2.5, use_com=True)
+            t0 = time.perf_counter()
+            _, g_list = engine.compute_trajectory(path, n_workers=workers, index_dir=tmp)
+            elapsed = time.perf_counter() - t0
+
+            if reference is None:
+                reference, base_time = g_list, elapsed
+                check = "referencia"
+            else:
+                ok = all(np.allclose(a, b, rtol=1e-12, atol=0.0) for a, b in zip(reference, g_list))
+                check = "OK" if ok else "DIFERENTE"
+
+            print(f"{workers:>3} procesos: {elapsed:8.2f} s  speedup {base_time / elapsed:5.2f}x  [{check}]")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: carga de varias series para graficar, en serie vs. get_plot_series_batch
+(pool de procesos). Sin caché binaria, para medir el parseo de texto.
+
+Uso:
+    python -m benchmarks.bench_plot_series_batch [n_archivos] [n_filas] [procesos]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from src.model.analysis_parser import AnalysisParser
+from benchmarks.bench_xvg_reader import write_synthetic_xvg
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    n_workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    parser = AnalysisParser()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(n_files):
+            path = os.path.join(tmp, f"serie_{i}.xvg")
+            write_synthetic_xvg(path, n_rows, 1)
+            paths.append(path)
+        size_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+
+        t0 = time.perf_counter()
+        serial = {p: parser.get_plot_series(p) for p in paths}
+        t_serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch = parser.get_plot_series_batch(paths, max_workers=n_workers)
+        t_batch = time.perf_counter() - t0
+
+    for p in paths:
+        assert np.array_equal(serial[p][1], batch[p][1]) and np.array_equal(serial[p][2], batch[p][2])
+
+    print(f"{n_files} archivos x {n_rows} filas ({size_mb:.1f} MB en total)")
+    print(f"En serie        : {t_serial:8.3f} s")
+    print(f"Lote (procesos) : {t_batch:8.3f} s  (x{t_serial / t_batch:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: lector masivo de .xvg vs. el bucle clásico línea a línea.
+
+Uso:
+    python -m benchmarks.bench_xvg_reader [n_filas] [n_columnas]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from src.model.xvg_reader import XvgReader
+
+
+def write_synthetic_xvg(path, n_rows, n_cols):
+    """Genera un .xvg estilo 'gmx energy' con n_cols columnas Y"""
+    rng = np.random.default_rng(0)
+    data = np.column_stack([np.arange(n_rows) * 2.0, rng.normal(300.0, 5.0, (n_rows, n_cols))])
+    with open(path, 'w') as f:
+        f.write("# Benchmark sintético\n")
+        f.write('@    title "GROMACS Energies"\n')
+        f.write('@    xaxis  label "Time (ps)"\n')
+        f.write('@    yaxis  label "(kJ/mol), (K), (bar)"\n')
+        for i in range(n_cols):
+            f.write(f'@ s{i} legend "Term{i}"\n')
+        np.savetxt(f, data, fmt="%12.6f")
+
+
+def legacy_loop(filepath):
+    """Copia del bucle original de AnalysisParser.get_data_from_file"""
+    labels = ["Eje X", "Eje Y"]
+    with open(filepath, 'r') as f:
+        lines = f.readlines()
+
+    raw_data = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith("@"):
+            if "xaxis" in line and "label" in line:
+                parts = line.split('"')
+                if len(parts) > 1:
+                    labels[0] = parts[1]
+            if "yaxis" in line and "label" in line:
+                parts = line.split('"')
+                if len(parts) > 1:
+                    labels[1] = parts[1]
+            continue
+        if line.startswith("#"):
+            continue
+        try:
+            parts = line.split()
+            nums = [float(p) for p in parts]
+            raw_data.append(nums)
+        except ValueError:
+            pass
+
+    data_np = np.array(raw_data)
+    return labels, data_np[:, 0], [data_np[:, i] for i in range(1, data_np.shape[1])]
+
+
+def best_of(func, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    reader = XvgReader()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xvg")
+        write_synthetic_xvg(path, n_rows, n_cols)
+        size_mb = os.path.getsize(path) / 1e6
+
+        _, legacy_x, legacy_y = legacy_loop(path)
+        header, data = reader.read(path)
+        assert np.allclose(legacy_x, data[:, 0])
+        assert all(np.allclose(legacy_y[i], data[:, i + 1]) for i in range(n_cols))
+
+        t_legacy = best_of(lambda: legacy_loop(path))
+        t_bulk64 = best_of(lambda: reader.read(path, dtype=np.float64))
+        t_bulk32 = best_of(lambda: reader.read(path, dtype=np.float32))
+
+    print(f"Archivo: {n_rows} filas x {n_cols + 1} columnas ({size_mb:.1f} MB)")
+    print(f"Leyendas detectadas: {header['legends']}")
+    print(f"Bucle clásico   : {t_legacy:8.3f} s")
+    print(f"Masivo float64  : {t_bulk64:8.3f} s  (x{t_legacy / t_bulk64:.1f})")
+    print(f"Masivo float32  : {t_bulk32:8.3f} s  (x{t_legacy / t_bulk32:.1f})")
+
+
+if __name__ == "__main__":
+    main()
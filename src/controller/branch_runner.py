@@ -0,0 +1,235 @@
+import os
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.controller.job_scheduler import CommandJob, JobScheduler
+from src.model.mdrun_checkpoint import MdrunCheckpoint
+from src.model.mdrun_telemetry import MdrunTelemetry
+
+
+class BranchRunner(QObject):
+    """
+    Ejecuta el árbol de simulación como un grafo de dependencias.
+    Cada nodo depende solo de su padre (usa su .gro), así que todos los nodos
+    cuyo padre ya terminó se lanzan a la vez: grompp y luego mdrun. Los núcleos
+    se reparten entre los mdrun concurrentes y cada uno se fija a un bloque de
+    núcleos propio (-ntomp / -pin on -pinoffset) para que no compitan entre sí.
+    """
+    node_started = pyqtSignal(str)               # nombre
+    node_finished = pyqtSignal(str, bool, str)   # nombre, éxito, mensaje
+    log_signal = pyqtSignal(str, str)            # nombre, línea
+    progress_signal = pyqtSignal(str, object)    # nombre, registro de telemetría
+    finished_signal = pyqtSignal(bool, str)
+
+    DONE_STATUSES = ("Completado",)
+
+    def __init__(self, storage_dir, nodes, prepare_fn=None, total_cores=None, scheduler=None):
+        """
+        Args:
+            storage_dir (str): Carpeta con .mdp/.gro/topol.top del sistema.
+            nodes (list): [(nombre, nombre_padre o None, estado)] en el orden del árbol.
+            prepare_fn (callable, opcional): prepare_fn(nombre) -> bool, asegura el .mdp en disco.
+            total_cores (int, opcional): Núcleos a repartir (por defecto, los del planificador).
+        """
+        super().__init__()
+        self.storage_dir = storage_dir
+        self.scheduler = scheduler or JobScheduler.instance()
+        self.total_cores = max(int(total_cores or self.scheduler.total_cores), 1)
+        self.prepare_fn = prepare_fn
+
+        self.parent = {name: parent for name, parent, _ in nodes}
+        self.status = {name: status for name, _, status in nodes}
+        self.order = [name for name, _, _ in nodes]
+
+        # Bloque de núcleos de cada nodo en ejecución: nombre -> (offset, n)
+        self.slots = {}
+        self.jobs = {}
+        self.restarts = {}
+        self.failed = []
+        self.stopped = False
+        self._dispatching = False
+
+    # =========================================================================
+    # API
+    # =========================================================================
+
+    def start(self):
+        if not self.ready_nodes():
+            self.finished_signal.emit(False, "No hay pasos listos para ejecutar.")
+            return
+        self._dispatch()
+        self._check_finished()
+
+    def stop(self):
+        """Detiene los trabajos en curso y no lanza más nodos"""
+        self.stopped = True
+        for job in list(self.jobs.values()):
+            job.stop_process()
+
+    def is_running(self):
+        return bool(self.slots)
+
+    # =========================================================================
+    # GRAFO
+    # =========================================================================
+
+    def ready_nodes(self):
+        """Nodos pendientes cuyo padre ya tiene su .gro (o la raíz, con system.gro)"""
+        ready = []
+        for name in self.order:
+            if name in self.slots or self.status[name] in self.DONE_STATUSES or name in self.failed:
+                continue
+            parent = self.parent[name]
+            if parent is None:
+                parent_ok = os.path.exists(os.path.join(self.storage_dir, "system.gro"))
+            else:
+                parent_ok = self.status.get(parent) in self.DONE_STATUSES
+            if parent_ok:
+                ready.append(name)
+        return ready
+
+    def _dispatch(self):
+        if self.stopped:
+            return
+        ready = self.ready_nodes()
+        free = self.total_cores - sum(n for _, n in self.slots.values())
+        if not ready or free <= 0:
+            return
+
+        # Reparto equitativo de los núcleos libres entre los nodos listos
+        launch = ready[:free]
+        per_node = max(free // len(launch), 1)
+        self._dispatching = True
+        for name in launch:
+            offset = self._allocate(per_node)
+            if offset is None:
+                break
+            self.slots[name] = (offset, per_node)
+            self._run_grompp(name)
+        self._dispatching = False
+
+    def _allocate(self, n):
+        """Primer bloque contiguo de n núcleos libres (offset) o None"""
+        used = [False] * self.total_cores
+        for offset, count in self.slots.values():
+            for c in range(offset, offset + count):
+                used[c] = True
+        run = 0
+        for c in range(self.total_cores):
+            run = 0 if used[c] else run + 1
+            if run == n:
+                return c - n + 1
+        return None
+
+    # =========================================================================
+    # EJECUCIÓN DE UN NODO
+    # =========================================================================
+
+    def _run_grompp(self, name):
+        # Un paso pausado conserva su .tpr: se reanuda directamente desde el .cpt
+        if MdrunCheckpoint(self.storage_dir, name).has_checkpoint() and \
+                os.path.exists(os.path.join(self.storage_dir, f"{name}.tpr")):
+            self.node_started.emit(name)
+            self._run_mdrun(name)
+            return
+
+        if self.prepare_fn and not self.prepare_fn(name):
+            self._node_done(name, False, f"No se pudo preparar {name}.mdp")
+            return
+
+        parent = self.parent[name]
+        input_gro = f"{parent}.gro" if parent else "system.gro"
+        cmd = ["gmx", "grompp", "-f", f"{name}.mdp", "-c", input_gro, "-p", "topol.top",
+               "-o", f"{name}.tpr", "-maxwarn", "2"]
+
+        job = CommandJob(cmd, self.storage_dir, name=f"grompp {name}", scheduler=self.scheduler)
+        job.log_signal.connect(lambda s, n=name: self.log_signal.emit(n, s))
+        job.finished_signal.connect(lambda ok, msg, n=name: self._on_grompp_finished(n, ok, msg))
+        self.jobs[name] = job
+        self.node_started.emit(name)
+        job.start()
+
+    def _on_grompp_finished(self, name, success, msg):
+        if self.stopped:
+            self._node_stopped(name, mdrun_ran=False)
+            return
+        if not success:
+            self._node_done(name, False, msg)
+            return
+        self._run_mdrun(name)
+
+    def _run_mdrun(self, name):
+        offset, n = self.slots[name]
+        cmd = ["gmx", "mdrun", "-v", "-deffnm", name,
+               "-ntmpi", "1", "-ntomp", str(n),
+               "-pin", "on", "-pinoffset", str(offset), "-pinstride", "1"]
+        cmd += MdrunCheckpoint(self.storage_dir, name).mdrun_args()
+
+        job = CommandJob(cmd, self.storage_dir, name=f"mdrun {name}", cores=n, priority=1,
+                         scheduler=self.scheduler,
+                         line_parser=MdrunTelemetry.for_step(self.storage_dir, name))
+        job.log_signal.connect(lambda s, nm=name: self.log_signal.emit(nm, s))
+        job.progress_signal.connect(lambda rec, nm=name: self.progress_signal.emit(nm, rec))
+        job.finished_signal.connect(lambda ok, m, nm=name: self._on_mdrun_finished(nm, ok, m))
+        self.jobs[name] = job
+        job.start()
+
+    def _on_mdrun_finished(self, name, success, msg):
+        # Detener = SIGTERM: mdrun sale con código 0 tras escribir .cpt y .gro,
+        # por eso la parada se comprueba antes que 'success'
+        if self.stopped:
+            job = self.jobs.get(name)
+            self._node_stopped(name, mdrun_ran=job is not None and job.was_started())
+            return
+        # Fallo no pedido por el usuario: se reintenta desde el checkpoint (conserva su bloque de núcleos).
+        # Sin .cpt y fallando al arrancar (TPR inválido...) no se repite
+        job = self.jobs.get(name)
+        run_seconds = job.run_seconds() if job is not None else 0.0
+        if not success and self.restarts.get(name, 0) < MdrunCheckpoint.MAX_RESTARTS and \
+                MdrunCheckpoint(self.storage_dir, name).should_restart(run_seconds):
+            self.restarts[name] = self.restarts.get(name, 0) + 1
+            self.log_signal.emit(name, f"mdrun falló ({msg}); reintento {self.restarts[name]}/{MdrunCheckpoint.MAX_RESTARTS}")
+            self._run_mdrun(name)
+            return
+        self._node_done(name, success, msg)
+
+    def _node_done(self, name, success, msg):
+        self.slots.pop(name, None)
+        self.jobs.pop(name, None)
+        if success:
+            MdrunCheckpoint(self.storage_dir, name).clear_paused()
+            self.status[name] = "Completado"
+        else:
+            self.status[name] = "Error"
+            self.failed.append(name)
+        self.node_finished.emit(name, success, msg)
+
+        # Completar un nodo desbloquea a sus hijos
+        if not self._dispatching:
+            self._dispatch()
+            self._check_finished()
+
+    def _node_stopped(self, name, mdrun_ran):
+        """
+        Nodo detenido por el usuario: queda pausado (reanudable) si su mdrun llegó
+        a correr y dejó el .cpt. Un grompp o un mdrun cancelados en cola no pausan nada.
+        """
+        self.slots.pop(name, None)
+        self.jobs.pop(name, None)
+        ckpt = MdrunCheckpoint(self.storage_dir, name)
+        if mdrun_ran:
+            ckpt.mark_paused()
+        if ckpt.has_checkpoint():
+            self.status[name] = ckpt.status_text()
+        self.node_finished.emit(name, False, "Detenido por el usuario.")
+        if not self._dispatching:
+            self._check_finished()
+
+    def _check_finished(self):
+        if not self.slots and not self._dispatching:
+            if self.stopped:
+                self.finished_signal.emit(False, "Ejecución detenida: los pasos con checkpoint quedan pausados.")
+            elif self.failed:
+                self.finished_signal.emit(False, f"Pasos con error: {', '.join(self.failed)}")
+            else:
+                self.finished_signal.emit(True, "Se completaron las simulaciones.")
@@ -0,0 +1,299 @@
+import heapq
+import itertools
+import os
+import re
+import datetime
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.controller.workers import CommandWorker, FunctionWorker
+
+
+def host_cores():
+    """Núcleos disponibles para este proceso (respeta la afinidad de CPU)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# =============================================================================
+# TRABAJOS
+# =============================================================================
+
+class Job(QObject):
+    """
+    Trabajo encolable en el JobScheduler.
+    Expone la misma interfaz que los workers (log_signal, finished_signal,
+    start, stop_process, isRunning, wait), así las pestañas solo cambian la
+    clase que instancian: start() encola el trabajo y el planificador lo lanza
+    cuando hay núcleos libres.
+    """
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+    started_signal = pyqtSignal()
+    progress_signal = pyqtSignal(object)
+
+    def __init__(self, name, cores=1, priority=0, scheduler=None, max_cores=None):
+        """
+        Args:
+            name (str): Nombre descriptivo (ej. 'mdrun prod').
+            cores (int): Núcleos que ocupa mientras corre. 0 = trabajo ligero
+                (E/S, lectura de archivos) que no pasa por la admisión de núcleos.
+            priority (int): Mayor valor = se lanza antes.
+            scheduler (JobScheduler, opcional): Por defecto, el planificador global.
+            max_cores (int, opcional): Trabajo elástico: se admite con 'cores' libres
+                y al lanzarse recibe hasta max_cores según los núcleos libres EN ESE
+                MOMENTO (no al encolarse). El valor final queda en self.cores.
+        """
+        super().__init__()
+        self.name = name
+        self.cores = max(int(cores), 0)
+        self.max_cores = int(max_cores) if max_cores else None
+        self.priority = priority
+        self.scheduler = scheduler
+        self.state = 'pending'   # pending -> queued -> running -> done / cancelled
+        self.worker = None
+        self.cancel_requested = False
+        self.launched_at = None
+        self.finished_at = None
+        self._delete_when_done = False
+
+    def create_worker(self):
+        """Crea el QThread que ejecuta el trabajo (lo implementan las subclases)"""
+        raise NotImplementedError
+
+    # --- Interfaz compatible con los workers ---
+
+    def start(self):
+        (self.scheduler or JobScheduler.instance()).submit(self)
+
+    def stop_process(self):
+        (self.scheduler or JobScheduler.instance()).cancel(self)
+
+    def isRunning(self):
+        return self.state in ('queued', 'running')
+
+    def was_started(self):
+        """El planificador llegó a lanzarlo (False si se canceló estando en cola)"""
+        return self.worker is not None
+
+    def run_seconds(self):
+        """Segundos de ejecución (desde que se lanzó, no desde que se encoló)"""
+        if self.launched_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.launched_at
+
+    def quit(self):
+        pass
+
+    def deleteLater(self):
+        # El planificador necesita el objeto hasta que el hilo termine
+        if self.state in ('queued', 'running'):
+            self._delete_when_done = True
+        else:
+            super().deleteLater()
+
+    def tail(self, n=None):
+        """Últimas líneas de salida guardadas en memoria por el worker"""
+        return self.worker.tail(n) if self.worker is not None and hasattr(self.worker, 'tail') else []
+
+    def wait(self, msecs=None):
+        if self.worker is None:
+            return True
+        return self.worker.wait(msecs) if msecs is not None else self.worker.wait()
+
+    # --- Uso interno del planificador ---
+
+    def _launch(self, on_done):
+        self._on_done = on_done
+        self.state = 'running'
+        self.launched_at = time.monotonic()
+        self.worker = self.create_worker()
+        self.worker.log_signal.connect(self.log_signal)
+        if hasattr(self.worker, 'progress_signal'):
+            self.worker.progress_signal.connect(self.progress_signal)
+        # Slot de un QObject del hilo principal: la señal llega encolada desde el hilo
+        self.worker.finished_signal.connect(self._on_worker_finished)
+        self.started_signal.emit()
+        self.worker.start()
+
+    def _on_worker_finished(self, success, msg):
+        self.finished_at = time.monotonic()
+        self.state = 'cancelled' if self.cancel_requested else 'done'
+        self.finished_signal.emit(success, msg)
+        self._on_done(self, success, msg)
+        if self._delete_when_done:
+            super().deleteLater()
+
+
+class CommandJob(Job):
+    """Programa externo (packmol, grompp, mdrun, trjconv...) ejecutado con CommandWorker"""
+
+    def __init__(self, command_list, working_dir, input_file_path=None, name=None,
+                 cores=1, priority=0, scheduler=None, line_parser=None, log_path=None,
+                 emit_interval=CommandWorker.DEFAULT_EMIT_INTERVAL):
+        # Nombre por defecto: 'packmol', 'gmx mdrun', ...
+        default = " ".join(command_list[:2]) if command_list[0] == "gmx" else command_list[0]
+        super().__init__(name or default, cores, priority, scheduler)
+        self.command = command_list
+        self.wd = working_dir
+        self.input_file_path = input_file_path
+        self.line_parser = line_parser
+        self.emit_interval = emit_interval
+        # Salida completa del trabajo: <carpeta>/logs/<nombre>_<fecha>.log
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        slug = re.sub(r"[^\w.-]+", "_", self.name)
+        self.log_path = log_path or os.path.join(working_dir, "logs", f"{slug}_{stamp}.log")
+
+    def create_worker(self):
+        return CommandWorker(self.command, self.wd, self.input_file_path, self.line_parser,
+                             log_path=self.log_path, emit_interval=self.emit_interval)
+
+
+class FunctionJob(Job):
+    """Función Python que retorna (bool, str), ejecutada con FunctionWorker"""
+
+    def __init__(self, func, *args, job_name=None, cores=1, priority=0, scheduler=None,
+                 max_cores=None, cores_kwarg=None, **kwargs):
+        """
+        cores_kwarg (str, opcional): Argumento de func que recibe los núcleos
+            concedidos al lanzarse (ej. 'n_workers' con max_cores).
+        """
+        super().__init__(job_name or getattr(func, '__name__', 'tarea'), cores, priority, scheduler, max_cores)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.cores_kwarg = cores_kwarg
+
+    def create_worker(self):
+        kwargs = dict(self.kwargs)
+        if self.cores_kwarg:
+            kwargs[self.cores_kwarg] = max(self.cores, 1)
+        return FunctionWorker(self.func, *self.args, **kwargs)
+
+
+# =============================================================================
+# PLANIFICADOR
+# =============================================================================
+
+class JobScheduler(QObject):
+    """
+    Cola central de trabajos con límite de núcleos.
+    Un trabajo se admite cuando los núcleos en uso más los suyos caben en los
+    núcleos del equipo; la cola se atiende por prioridad y, a igual prioridad,
+    por orden de llegada. No se adelantan trabajos pequeños a uno grande que
+    espera (evita que mdrun quede bloqueado indefinidamente). Los trabajos con
+    0 núcleos (tareas ligeras de E/S) se lanzan al momento sin pasar por la cola.
+    Los trabajos elásticos (max_cores) reciben los núcleos libres al admitirse.
+
+    Todas las llamadas se hacen desde el hilo de la interfaz, salvo
+    submit_threadsafe / cancel_threadsafe.
+    """
+    job_queued = pyqtSignal(object)
+    job_started = pyqtSignal(object)
+    job_finished = pyqtSignal(object, bool, str)
+    # Peticiones desde hilos de trabajo: la conexión encolada las ejecuta en el hilo de la interfaz
+    _submit_request = pyqtSignal(object)
+    _cancel_request = pyqtSignal(object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """Planificador global de la aplicación"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, total_cores=None):
+        super().__init__()
+        self.total_cores = max(int(total_cores or host_cores()), 1)
+        self._queue = []            # heap de (-prioridad, orden, job)
+        self._running = []
+        self._counter = itertools.count()
+        self._submit_request.connect(self.submit)
+        self._cancel_request.connect(self.cancel)
+
+    # =========================================================================
+    # API
+    # =========================================================================
+
+    def submit(self, job):
+        """Encola un trabajo y lanza lo que quepa"""
+        if job.state in ('queued', 'running'):
+            return job
+        # Un trabajo nunca pide más núcleos que los del equipo
+        job.cores = min(job.cores, self.total_cores)
+        if job.cores == 0:
+            # Tarea ligera: no ocupa núcleos ni espera detrás de un mdrun
+            self._start(job)
+            return job
+        job.state = 'queued'
+        heapq.heappush(self._queue, (-job.priority, next(self._counter), job))
+        job.log_signal.emit(f"En cola: {job.name} ({job.cores} núcleos)")
+        self.job_queued.emit(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job):
+        """Cancela un trabajo en cola (se descarta) o en ejecución (se detiene el proceso)"""
+        if job.state == 'queued':
+            self._queue = [entry for entry in self._queue if entry[2] is not job]
+            heapq.heapify(self._queue)
+            job.state = 'cancelled'
+            job.cancel_requested = True
+            job.finished_signal.emit(False, "Trabajo cancelado antes de iniciar.")
+            self.job_finished.emit(job, False, "cancelado")
+        elif job.state == 'running':
+            job.cancel_requested = True
+            job.worker.stop_process()
+
+    def submit_threadsafe(self, job):
+        """
+        submit() desde otro hilo (ej. un generador consumido en un QThread).
+        El trabajo pasa al hilo de la interfaz y se encola allí.
+        """
+        job.moveToThread(self.thread())
+        self._submit_request.emit(job)
+
+    def cancel_threadsafe(self, job):
+        """cancel() desde otro hilo"""
+        self._cancel_request.emit(job)
+
+    def used_cores(self):
+        return sum(job.cores for job in self._running)
+
+    def pending_jobs(self):
+        return [entry[2] for entry in sorted(self._queue)]
+
+    def running_jobs(self):
+        return list(self._running)
+
+    # =========================================================================
+    # ADMISIÓN
+    # =========================================================================
+
+    def _dispatch(self):
+        while self._queue:
+            job = self._queue[0][2]
+            if self._running and self.used_cores() + job.cores > self.total_cores:
+                break
+            heapq.heappop(self._queue)
+            if job.max_cores:
+                # Elástico: los núcleos libres se reparten al admitir, no al encolar
+                free = self.total_cores - self.used_cores()
+                job.cores = max(job.cores, min(job.max_cores, free))
+            self._start(job)
+
+    def _start(self, job):
+        self._running.append(job)
+        job._launch(self._on_job_done)
+        self.job_started.emit(job)
+
+    def _on_job_done(self, job, success, msg):
+        if job in self._running:
+            self._running.remove(job)
+        self.job_finished.emit(job, success, msg)
+        self._dispatch()
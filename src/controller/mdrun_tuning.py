@@ -0,0 +1,86 @@
+import os
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.controller.job_scheduler import CommandJob, JobScheduler
+from src.model.mdrun_tuner import MdrunTuner
+
+
+class MdrunTuningSession(QObject):
+    """
+    Ejecuta una a una las pruebas cortas de mdrun sobre un .tpr y elige la
+    distribución de hilos más rápida. Cada prueba ocupa todos los núcleos, así
+    que el planificador no la solapa con otros trabajos (la medida sería falsa).
+    """
+    progress_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+
+    def __init__(self, storage_dir, step_name, n_cores=None, nsteps=MdrunTuner.DEFAULT_TRIAL_STEPS,
+                 scheduler=None):
+        super().__init__()
+        self.tuner = MdrunTuner()
+        self.scheduler = scheduler or JobScheduler.instance()
+        self.n_cores = int(n_cores or self.scheduler.total_cores)
+        self.storage_dir = storage_dir
+        self.step_name = step_name
+        self.nsteps = nsteps
+
+        self.layouts = self.tuner.candidate_layouts(self.n_cores)
+        self.results = []       # [(layout, ns_dia)]
+        self.best = None        # {'layout', 'ns_per_day', 'cores', 'tpr'}
+        self.job = None
+        self.stopped = False
+
+    def start(self):
+        self.work_dir = self.tuner.trial_dir(self.storage_dir)
+        self._run_trial(0)
+
+    def stop(self):
+        self.stopped = True
+        if self.job:
+            self.job.stop_process()
+
+    def _run_trial(self, i):
+        if self.stopped:
+            self.finished_signal.emit(False, "Ajuste cancelado.")
+            return
+        if i >= len(self.layouts):
+            self._finish()
+            return
+
+        layout = self.layouts[i]
+        trial = f"trial_{i}"
+        # Borrar el log de una prueba anterior para no leer un resultado viejo
+        log_file = os.path.join(self.work_dir, f"{trial}.log")
+        if os.path.exists(log_file):
+            os.remove(log_file)
+
+        tpr = os.path.join("..", f"{self.step_name}.tpr")
+        cmd = self.tuner.trial_command(tpr, trial, layout, self.nsteps)
+        self.progress_signal.emit(f"Prueba {i + 1}/{len(self.layouts)}: {' '.join(self.tuner.layout_args(layout))}")
+
+        self.job = CommandJob(cmd, self.work_dir, name=f"tune {self.step_name} #{i + 1}",
+                              cores=self.n_cores, priority=2, scheduler=self.scheduler)
+        self.job.finished_signal.connect(lambda ok, msg, i=i, log=log_file: self._on_trial_finished(i, ok, log))
+        self.job.start()
+
+    def _on_trial_finished(self, i, success, log_file):
+        perf = self.tuner.parse_performance(log_file) if success else None
+        self.results.append((self.layouts[i], perf))
+        self.progress_signal.emit(f"  -> {perf:.2f} ns/día" if perf else "  -> falló (distribución no válida)")
+        self._run_trial(i + 1)
+
+    def _finish(self):
+        layout, perf = self.tuner.best_layout(self.results)
+        if layout is None:
+            self.finished_signal.emit(False, "Ninguna prueba terminó correctamente.")
+            return
+        self.best = {
+            'layout': layout,
+            'ns_per_day': perf,
+            'cores': self.n_cores,
+            'tpr': f"{self.step_name}.tpr",
+            'trials': [{'layout': l, 'ns_per_day': p} for l, p in self.results],
+        }
+        args = " ".join(self.tuner.layout_args(layout))
+        self.finished_signal.emit(True, f"Mejor distribución: {args} ({perf:.2f} ns/día)")
@@ -1,6 +1,9 @@
 import os
+import queue
 import numpy as np
+from src.controller.job_scheduler import JobScheduler, FunctionJob
 from src.model.analysis_parser import AnalysisParser
+from src.model.edr_reader import EdrReader
 from src.model.thermo_solubility import ThermoMath
 
 class SolubilityManager:
@@ -12,6 +15,10 @@ class SolubilityManager:
         self.project_mgr = project_mgr
         self.parser = AnalysisParser()
         self.math_model = ThermoMath()
+        
+        # Reutilizar la caché binaria de series del proyecto
+        if project_mgr:
+            self.parser.set_cache_dir(project_mgr.get_cache_dir())
 
     def get_system_path(self, sys_name):
         """Devuelve la ruta absoluta a la carpeta storage de un sistema específico"""
@@ -23,82 +30,142 @@ class SolubilityManager:
     # 1. GENERACIÓN DE DATOS (BATCH RDF)
     # =========================================================================
 
-    def run_batch_rdfs(self, systems_config, step_name, solute_group, solvent_group):
+    def run_batch_rdfs(self, systems_config, step_name, solute_group, solvent_group,
+                       max_parallel=None, cancel_event=None, scheduler=None):
         """
         Genera las 3 RDFs necesarias (1-1, 2-2, 1-2) para cada sistema en la lista.
+        Cada sistema es un trabajo del JobScheduler, así el batch comparte los núcleos
+        con mdrun y con el resto de la aplicación; el progreso se reporta a medida
+        que cada sistema termina. Se consume desde un hilo (BatchWorker).
         
         Args:
             systems_config (list): Lista de dicts [{'name': 'SysA', ...}, ...]
             step_name (str): Nombre del paso de producción (ej: 'prod')
             solute_group (str): Nombre del grupo Soluto en index.ndx
             solvent_group (str): Nombre del grupo Solvente en index.ndx
+            max_parallel (int, opcional): Sistemas simultáneos; los núcleos del equipo
+                se reparten entre ellos. None = un núcleo por sistema.
+            cancel_event (threading.Event, opcional): Si se activa, los sistemas aún
+                en cola se descartan y el generador termina.
+            scheduler (JobScheduler, opcional): Por defecto, el planificador global.
             
         Returns:
             generator: Yields (progreso_str, exito_bool)
         """
+        if not systems_config:
+            return
+
+        scheduler = scheduler or JobScheduler.instance()
+        n_parallel = max(1, min(int(max_parallel or scheduler.total_cores), len(systems_config)))
+        n_workers = max(1, scheduler.total_cores // n_parallel)
+
+        # Todos a la cola: el planificador admite n_parallel a la vez (n_workers núcleos cada uno)
+        results = queue.Queue()
+        pending = {}
         for sys_data in systems_config:
-            sys_name = sys_data['name']
-            path = self.get_system_path(sys_name)
-            
-            if not path or not os.path.exists(path):
-                yield f"Error: No existe carpeta para {sys_name}", False
-                continue
+            name = sys_data['name']
+            job = FunctionJob(
+                self.run_system_rdfs, name, step_name, solute_group, solvent_group,
+                n_workers=n_workers, job_name=f"RDF solubilidad {name}",
+                cores=n_workers, scheduler=scheduler
+            )
+            # Se emite en el hilo de la interfaz; la cola lo pasa a este hilo
+            job.finished_signal.connect(lambda ok, msg, job=job: results.put((job, ok, msg)))
+            pending[job] = name
 
-            # Archivos base
-            tpr = os.path.join(path, f"{step_name}.tpr")
-            xtc = os.path.join(path, f"{step_name}.xtc") # O clean
-            if not os.path.exists(xtc):
-                xtc = os.path.join(path, f"{step_name}_clean.xtc")
+        try:
+            for job in list(pending):
+                scheduler.submit_threadsafe(job)
+            done = 0
+            total = len(pending)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                try:
+                    job, ok, msg = results.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                pending.pop(job, None)
+                done += 1
+                yield f"[{done}/{total}] {msg}", ok
+        finally:
+            # Cancelación o cierre del generador: los sistemas en cola se descartan
+            for job in pending:
+                scheduler.cancel_threadsafe(job)
+
+    def run_system_rdfs(self, sys_name, step_name, solute_group, solvent_group, n_workers=1):
+        """
+        Genera las 3 RDFs necesarias (1-1, 2-2, 1-2) de un sistema.
+        Lo ejecuta run_batch_rdfs como trabajo del JobScheduler (uno por sistema).
+        Las 3 RDFs se calculan con el motor nativo en una sola pasada por el .xtc.
+        
+        Args:
+            sys_name (str): Nombre del sistema.
+            step_name (str): Nombre del paso de producción (ej: 'prod')
+            solute_group (str): Nombre del grupo Soluto en index.ndx
+            solvent_group (str): Nombre del grupo Solvente en index.ndx
+            n_workers (int): Procesos entre los que se reparten los frames.
             
-            if not os.path.exists(tpr) or not os.path.exists(xtc):
-                yield f"Saltando {sys_name}: Faltan archivos .tpr/.xtc", False
-                continue
+        Returns:
+            tuple: (bool, mensaje)
+        """
+        path = self.get_system_path(sys_name)
+        
+        if not path or not os.path.exists(path):
+            return False, f"Error: No existe carpeta para {sys_name}"
 
-            # Obtener IDs de grupos
-            groups = self.parser.get_gromacs_groups(tpr, path)
-            id_solute = groups.get(solute_group)
-            id_solvent = groups.get(solvent_group)
+        # Archivos base
+        tpr = os.path.join(path, f"{step_name}.tpr")
+        xtc = os.path.join(path, f"{step_name}.xtc") # O clean
+        if not os.path.exists(xtc):
+            xtc = os.path.join(path, f"{step_name}_clean.xtc")
+        
+        if not os.path.exists(tpr) or not os.path.exists(xtc):
+            return False, f"Saltando {sys_name}: Faltan archivos .tpr/.xtc"
 
-            if id_solute is None or id_solvent is None:
-                # Intentar crearlos si no existen
-                yield f"Generando grupos para {sys_name}...", True
-                if id_solute is None:
-                    self.parser.add_custom_group(tpr, path, f"a {solute_group}" if len(solute_group)<4 else f"r {solute_group}")
-                if id_solvent is None:
-                    self.parser.add_custom_group(tpr, path, f"a {solvent_group}" if len(solvent_group)<4 else f"r {solvent_group}")
-                
-                # Recargar
-                groups = self.parser.get_gromacs_groups(tpr, path)
-                id_solute = groups.get(solute_group)
-                id_solvent = groups.get(solvent_group)
-            
-            if id_solute is None or id_solvent is None:
-                yield f"Error {sys_name}: No se pudieron identificar grupos {solute_group}/{solvent_group}", False
-                continue
+        # Obtener IDs de grupos (los que falten se crean en memoria, una sola escritura del .ndx)
+        def selection_for(name):
+            return f"a {name}" if len(name) < 4 else f"r {name}"
 
-            # Carpeta de salida organizada
-            out_dir = os.path.join(path, "solubility_data")
-            os.makedirs(out_dir, exist_ok=True)
+        groups = self.parser.ensure_groups(tpr, path, {
+            solute_group: selection_for(solute_group),
+            solvent_group: selection_for(solvent_group),
+        })
+        id_solute = groups.get(solute_group)
+        id_solvent = groups.get(solvent_group)
+        
+        if id_solute is None or id_solvent is None:
+            return False, f"Error {sys_name}: No se pudieron identificar grupos {solute_group}/{solvent_group}"
+
+        # Carpeta de salida organizada
+        out_dir = os.path.join(path, "solubility_data")
+        os.makedirs(out_dir, exist_ok=True)
 
-            # Definir las 3 parejas: 1-1, 2-2, 1-2
-            pairs = [
-                (id_solute, id_solute, "rdf_11.xvg"),
-                (id_solvent, id_solvent, "rdf_22.xvg"),
-                (id_solute, id_solvent, "rdf_12.xvg")
-            ]
+        # Definir las 3 parejas: 1-1, 2-2, 1-2
+        pairs = [
+            (id_solute, id_solute, os.path.join(out_dir, "rdf_11.xvg")),
+            (id_solvent, id_solvent, os.path.join(out_dir, "rdf_22.xvg")),
+            (id_solute, id_solvent, os.path.join(out_dir, "rdf_12.xvg"))
+        ]
 
-            for ref, sel, fname in pairs:
-                out_xvg = os.path.join(out_dir, fname)
-                # Ejecutar RDF con Centros de Masa (CRÍTICO para Yousefi method)
-                # Bin width default 0.002 nm
+        # Las 3 RDFs en una sola lectura del .xtc con Centros de Masa (CRÍTICO para Yousefi method)
+        result = self.parser.run_native_rdf_groups(tpr, xtc, path, pairs, use_com=True, bin_width=0.002,
+                                                   cutoff=2.5, n_workers=n_workers)
+        if result is not None:
+            success, msg = result
+            if not success:
+                return False, f"Error RDF {sys_name}: {msg}"
+        else:
+            # Grupos no resolubles desde el .gro/.ndx: una ejecución de gmx rdf por pareja
+            for ref, sel, out_xvg in pairs:
                 success, msg = self.parser.run_gmx_rdf(
                     tpr, xtc, out_xvg, ref, sel, path, 
                     use_com=True, bin_width=0.002, cutoff=2.5
                 )
                 if not success:
-                    yield f"Error RDF {sys_name} ({fname}): {msg}", False
-            
-            yield f"RDFs calculadas para {sys_name}", True
+                    return False, f"Error RDF {sys_name} ({os.path.basename(out_xvg)}): {msg}"
+        
+        return True, f"RDFs calculadas para {sys_name}"
 
     # =========================================================================
     # 2. EXTRACCIÓN DE DATOS FÍSICOS (Densidad y Volumen)
@@ -106,25 +173,25 @@ class SolubilityManager:
 
     def get_system_volume_average(self, sys_name, step_name):
         """
-        Ejecuta gmx energy para obtener el volumen promedio (nm^3).
+        Lee el volumen promedio (nm^3) directamente del .edr.
         Necesario para calcular la densidad numérica exacta.
         """
         path = self.get_system_path(sys_name)
+        if not path:
+            return None
         edr = os.path.join(path, f"{step_name}.edr")
-        out = os.path.join(path, "temp_vol.xvg")
+        if not os.path.exists(edr):
+            return None
         
-        # Ejecutar energy solo para Volumen
-        success, _ = self.parser.run_gmx_energy(edr, out, ["Volume"])
-        if not success: return None
+        try:
+            _, series = EdrReader(edr).get_series(["Volume"])
+        except Exception as e:
+            print(f"Error leyendo volumen de {edr}: {e}")
+            return None
         
-        # Leer y promediar
-        _, _, y_list = self.parser.get_data_from_file(out)
-        if y_list:
-            vol_avg = np.mean(y_list[0]) # nm^3
-            # Limpiar temporal
-            try: os.remove(out)
-            except: pass
-            return vol_avg
+        volume = next(iter(series.values()))
+        if len(volume):
+            return float(np.mean(volume)) # nm^3
         return None
 
     # =========================================================================
@@ -1,17 +1,48 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 import subprocess
 import os
+import time
+import queue
+import threading
+from collections import deque
+
+# Marca de fin de la salida del proceso (la pone el hilo lector)
+_EOF = object()
+
 
 class CommandWorker(QThread):
+    """
+    Ejecuta un programa externo y reenvía su salida.
+    Las líneas no se emiten una a una: se agrupan y log_signal recibe un bloque
+    (líneas separadas por '\n') como mucho cada emit_interval segundos. La salida
+    completa va a log_path en disco y en memoria solo se guardan las últimas
+    tail_lines líneas (ver tail()).
+    """
     log_signal = pyqtSignal(str)      
     finished_signal = pyqtSignal(bool, str) 
+    progress_signal = pyqtSignal(object)    # registros estructurados (ej. telemetría de mdrun)
 
-    def __init__(self, command_list, working_dir, input_file_path=None):
+    DEFAULT_EMIT_INTERVAL = 0.1   # 10 Hz
+    DEFAULT_TAIL_LINES = 2000
+
+    def __init__(self, command_list, working_dir, input_file_path=None, line_parser=None,
+                 log_path=None, emit_interval=DEFAULT_EMIT_INTERVAL, tail_lines=DEFAULT_TAIL_LINES):
         super().__init__()
         self.command = command_list
         self.wd = working_dir
         self.input_file_path = input_file_path
+        # Se llama en este hilo con cada línea; si devuelve algo se emite por progress_signal
+        self.line_parser = line_parser
+        self.log_path = log_path
+        self.emit_interval = emit_interval
+        self.lines = deque(maxlen=tail_lines)
         self.process = None
+        self.cancelled = False
+
+    def tail(self, n=None):
+        """Últimas n líneas de salida (todas las del búfer si n es None)"""
+        lines = list(self.lines)
+        return lines if n is None else lines[-n:]
 
     def run(self):
         file_obj = None
@@ -23,6 +54,11 @@ class CommandWorker(QThread):
                     self.finished_signal.emit(False, f"Input no encontrado: {self.input_file_path}")
                     return
 
+            if self.cancelled:
+                if file_obj: file_obj.close()
+                self.finished_signal.emit(False, "Proceso detenido por el usuario.")
+                return
+
             self.log_signal.emit(f"CMD: {' '.join(self.command)}")
             
             # --- FIX: FORZAR SALIDA SIN BUFFER PARA VER EL AVANCE EN TIEMPO REAL ---
@@ -41,17 +77,13 @@ class CommandWorker(QThread):
                 env=env        # Aplicar entorno
             )
 
-            # Leer línea a línea
-            while True:
-                line = self.process.stdout.readline()
-                if not line and self.process.poll() is not None:
-                    break
-                if line:
-                    self.log_signal.emit(line.strip())
+            self._stream_output()
 
             # Esperar a que el proceso muera realmente
             self.process.wait()
             rc = self.process.returncode
+            if hasattr(self.line_parser, 'close'):
+                self.line_parser.close()
             
             if file_obj: file_obj.close()
 
@@ -66,7 +98,87 @@ class CommandWorker(QThread):
             if file_obj: file_obj.close()
             self.finished_signal.emit(False, f"Error crítico: {str(e)}")
 
+    def _stream_output(self):
+        """
+        Un hilo lector mete las líneas en una cola; este bucle las guarda en
+        disco y en el búfer circular y emite un bloque por intervalo, también
+        cuando el proceso deja de escribir (la espera en la cola tiene timeout).
+        """
+        lines_q = queue.Queue()
+
+        def reader():
+            for line in self.process.stdout:
+                lines_q.put(line)
+            lines_q.put(_EOF)
+
+        threading.Thread(target=reader, daemon=True).start()
+
+        log_file = None
+        if self.log_path:
+            try:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                log_file = open(self.log_path, 'a')
+            except OSError as e:
+                print(f"No se pudo abrir el log del trabajo: {e}")
+
+        pending = []
+        last_emit = time.monotonic()
+        try:
+            while True:
+                try:
+                    line = lines_q.get(timeout=self.emit_interval)
+                except queue.Empty:
+                    line = None
+                if line is _EOF:
+                    break
+
+                if line is not None:
+                    line = line.rstrip()
+                    self.lines.append(line)
+                    pending.append(line)
+                    if log_file:
+                        log_file.write(line + "\n")
+                    if self.line_parser:
+                        record = self.line_parser(line)
+                        if record:
+                            self.progress_signal.emit(record)
+
+                now = time.monotonic()
+                if pending and now - last_emit >= self.emit_interval:
+                    self.log_signal.emit("\n".join(pending))
+                    pending = []
+                    last_emit = now
+        finally:
+            if pending:
+                self.log_signal.emit("\n".join(pending))
+            if log_file:
+                log_file.close()
+
     def stop_process(self):
+        self.cancelled = True
         if self.process and self.process.poll() is None:
             self.process.terminate()
-            self.process.wait() # Esperar a que muera antes de seguir
\ No newline at end of file
+            self.process.wait() # Esperar a que muera antes de seguir
+
+
+class FunctionWorker(QThread):
+    """Ejecuta en un hilo una función que retorna (bool, str)"""
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            success, msg = self.func(*self.args, **self.kwargs)
+            self.finished_signal.emit(success, msg)
+        except Exception as e:
+            self.finished_signal.emit(False, f"Error inesperado en Worker: {str(e)}")
+
+    def stop_process(self):
+        # Las funciones Python no se pueden interrumpir: se deja terminar
+        pass
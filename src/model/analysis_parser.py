@@ -2,10 +2,27 @@ import os
 import subprocess
 import numpy as np
 import csv
+from concurrent.futures import ProcessPoolExecutor
+from src.model.xvg_reader import XvgReader
+from src.model.edr_reader import EdrReader
+from src.model.gro_reader import GroReader, residue_atom_pairs
+from src.model.ndx_selection import (SelectionEngine, read_ndx, write_ndx, ndx_group_names, default_groups,
+                                      selection_group_name, find_group, set_group)
+from src.model.data_cache import SeriesCache
+from src.model.parallel_frames import pool_context, default_workers
+from src.model.rdf_engine import MultiRdfEngine, make_group, guess_masses, box_lengths
+from src.model.decimation import MinMaxDecimator, bucket_size_for, decimate_minmax
 
 class AnalysisParser:
     def __init__(self):
-        pass
+        # Lector vectorizado de .xvg
+        self.xvg_reader = XvgReader()
+        # Lector vectorizado de .gro
+        self.gro_reader = GroReader()
+        # Estructura del último .gro leído (para selecciones de grupos)
+        self._structure_cache = {}
+        # Caché binaria opcional (se activa por proyecto con set_cache_dir)
+        self.cache = None
 
     # =========================================================================
     # SECCIÓN 1: LECTURA Y PARSEO DE ARCHIVOS DE DATOS
@@ -22,8 +39,6 @@ class AnalysisParser:
         Returns:
             tuple: (lista_etiquetas, array_x, lista_de_arrays_y)
         """
-        x_data = []
-        y_data = []
         labels = ["Eje X", "Eje Y"]
         
         if not os.path.exists(filepath):
@@ -32,85 +47,276 @@ class AnalysisParser:
         try:
             # --- CASO A: ARCHIVO TRAVIS (.CSV) ---
             if filepath.endswith('.csv'):
-                with open(filepath, 'r') as f:
-                    # Travis suele usar punto y coma ';' como delimitador
-                    reader = csv.reader(f, delimiter=';')
-                    
-                    for row in reader:
-                        if not row:
-                            continue
-                        
-                        # Intentar detectar etiquetas en la cabecera
-                        if not row[0][0].isdigit() and not row[0].startswith('-'): 
-                            if len(row) > 1 and ("r / pm" in row[0] or "Distance" in row[0]):
-                                labels = [row[0], row[1]]
-                            continue
-                        
-                        try:
-                            # Columna 0: X (Distancia), Columna 1: Y (RDF)
-                            val_x = float(row[0])
-                            val_y = float(row[1])
-                            x_data.append(val_x)
-                            y_data.append(val_y)
-                        except ValueError:
-                            continue
+                cached = self._load_from_cache(filepath, np.float64)
+                if cached is not None:
+                    header, columns = cached
+                    return header['labels'], columns[0], [columns[1]]
+
+                st = self._source_stat(filepath)
+                labels, x_data, y_data = self._read_travis_csv(filepath)
+                if len(x_data):
+                    header = {'title': "", 'labels': labels, 'legends': [""]}
+                    self._store_in_cache(filepath, header, np.column_stack([x_data, y_data]), st)
                 
                 # Retornar formato estándar (Y como lista de arrays)
-                return labels, np.array(x_data), [np.array(y_data)]
+                return labels, x_data, [y_data]
 
             # --- CASO B: ARCHIVO GROMACS (.XVG) ---
             else:
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-
-                raw_data = []
-                for line in lines:
-                    line = line.strip()
-                    
-                    # Leer metadatos de los ejes (@)
-                    if line.startswith("@"):
-                        if "xaxis" in line and "label" in line:
-                            parts = line.split('"')
-                            if len(parts) > 1:
-                                labels[0] = parts[1]
-                        if "yaxis" in line and "label" in line:
-                            parts = line.split('"')
-                            if len(parts) > 1:
-                                labels[1] = parts[1]
-                        continue
-                    
-                    # Ignorar comentarios (#)
-                    if line.startswith("#"):
-                        continue
-                    
-                    # Leer datos numéricos
-                    try:
-                        parts = line.split()
-                        nums = [float(p) for p in parts]
-                        raw_data.append(nums)
-                    except ValueError:
-                        pass
-
-                if not raw_data:
-                    return labels, [], []
-                
-                # Convertir a matriz numpy
-                data_np = np.array(raw_data)
-                
-                # La primera columna es X
-                x_col = data_np[:, 0]
-                
-                # El resto de columnas son Y
-                y_cols = []
-                for i in range(1, data_np.shape[1]):
-                    y_cols.append(data_np[:, i])
-                
-                return labels, x_col, y_cols
+                header, x_col, y_cols = self.get_xvg_data(filepath)
+                return header['labels'], x_col, y_cols
 
         except Exception as e:
             print(f"Error parseando archivo {filepath}: {e}")
             return labels, [], []
 
+    def _read_travis_csv(self, filepath):
+        """Lee el CSV de TRAVIS (delimitado por ';'). Retorna (etiquetas, x, y)"""
+        x_data = []
+        y_data = []
+        labels = ["Eje X", "Eje Y"]
+
+        with open(filepath, 'r') as f:
+            # Travis suele usar punto y coma ';' como delimitador
+            reader = csv.reader(f, delimiter=';')
+            
+            for row in reader:
+                if not row:
+                    continue
+                
+                # Intentar detectar etiquetas en la cabecera
+                if not row[0][0].isdigit() and not row[0].startswith('-'): 
+                    if len(row) > 1 and ("r / pm" in row[0] or "Distance" in row[0]):
+                        labels = [row[0], row[1]]
+                    continue
+                
+                try:
+                    # Columna 0: X (Distancia), Columna 1: Y (RDF)
+                    val_x = float(row[0])
+                    val_y = float(row[1])
+                    x_data.append(val_x)
+                    y_data.append(val_y)
+                except ValueError:
+                    continue
+
+        return labels, np.array(x_data), np.array(y_data)
+
+    def get_xvg_data(self, filepath, dtype=np.float64):
+        """
+        Lee un .xvg con el lector masivo conservando los metadatos.
+        Si hay caché configurada, la usa (memmap) y la rellena en caso de fallo.
+
+        Returns:
+            tuple: (cabecera_dict, array_x, lista_de_arrays_y)
+                cabecera_dict incluye 'labels', 'title' y 'legends' (una por columna Y).
+        """
+        cached = self._load_from_cache(filepath, dtype)
+        if cached is not None:
+            header, columns = cached
+            return header, columns[0], [columns[i] for i in range(1, columns.shape[0])]
+
+        st = self._source_stat(filepath)
+        header, data = self.xvg_reader.read(filepath, dtype=dtype)
+
+        if data.size == 0:
+            return header, [], []
+
+        self._store_in_cache(filepath, header, data, st)
+
+        # La primera columna es X, el resto son Y
+        x_col = data[:, 0]
+        y_cols = [data[:, i] for i in range(1, data.shape[1])]
+        return header, x_col, y_cols
+
+    def get_plot_series(self, filepath, max_points=4000, column=1, x_range=None):
+        """
+        Devuelve una serie lista para graficar, reducida a ~max_points puntos
+        (mín/máx por cubeta) para no dibujar más puntos que píxeles.
+        Si la ventana x_range contiene pocas filas, se entregan a resolución completa.
+
+        Args:
+            filepath (str): Ruta al .xvg / .csv.
+            max_points (int): Límite aproximado de puntos devueltos.
+            column (int): Columna Y (1 = primera serie).
+            x_range (tuple, opcional): (x_min, x_max) para limitar la ventana (zoom).
+
+        Returns:
+            tuple: (lista_etiquetas, array_x, array_y, n_filas_totales)
+        """
+        labels = ["Eje X", "Eje Y"]
+        if not os.path.exists(filepath):
+            return labels, np.empty(0), np.empty(0), 0
+
+        try:
+            # 1. Datos ya en memoria/memmap (caché o archivos pequeños): decimación directa
+            cached = self._load_from_cache(filepath, np.float64)
+            if cached is None and (filepath.endswith('.csv') or os.path.getsize(filepath) < 16 * 1024 * 1024):
+                labels, x, y_list = self.get_data_from_file(filepath)
+                if len(y_list) < column:
+                    return labels, np.empty(0), np.empty(0), 0
+                x_full, y_full = np.asarray(x), np.asarray(y_list[column - 1])
+            elif cached is not None:
+                header, columns = cached
+                labels = header['labels']
+                if columns.shape[0] <= column:
+                    return labels, np.empty(0), np.empty(0), 0
+                x_full, y_full = columns[0], columns[column]
+            else:
+                # 2. Archivo grande sin caché: lectura por bloques con memoria acotada
+                return self._stream_plot_series(filepath, max_points, column, x_range)
+
+            n_total = len(y_full)
+            if x_range is not None:
+                x_full, y_full = self._slice_x_range(x_full, y_full, x_range)
+            x_out, y_out = decimate_minmax(x_full, y_full, max_points)
+            return labels, x_out, y_out, n_total
+
+        except Exception as e:
+            print(f"Error preparando serie {filepath}: {e}")
+            return labels, np.empty(0), np.empty(0), 0
+
+    # Por debajo de este volumen de datos sin caché, arrancar procesos cuesta más que leer en serie
+    BATCH_PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+    def get_plot_series_batch(self, filepaths, max_points=4000, max_workers=None):
+        """
+        Prepara varias series a la vez (ej. al restaurar la pestaña Análisis).
+        El parseo de texto es mayormente Python (retiene el GIL), así que los
+        archivos sin caché se reparten en un pool de procesos, como los bloques
+        de frames de FrameBlockRunner. Cada hijo usa su propio lector y escribe
+        sus propias entradas de caché; al padre solo vuelven las series ya
+        decimadas. Las series en caché (memmap) y los lotes pequeños se leen en serie.
+
+        Args:
+            filepaths (list): Rutas a .xvg / .csv (los duplicados se leen una vez).
+            max_points (int): Límite aproximado de puntos por serie.
+            max_workers (int, opcional): Procesos. None = núcleos disponibles.
+
+        Returns:
+            dict: {ruta: (lista_etiquetas, array_x, array_y, n_filas_totales)}
+        """
+        unique = list(dict.fromkeys(p for p in filepaths if p))
+        pending = [p for p in unique if os.path.exists(p) and self._load_from_cache(p, np.float64) is None]
+        pending_bytes = sum(os.path.getsize(p) for p in pending)
+        n_workers = max(1, min(int(max_workers or default_workers()), len(pending)))
+
+        results = {}
+        if n_workers > 1 and pending_bytes >= self.BATCH_PARALLEL_MIN_BYTES:
+            cache_dir = self.cache.cache_dir if self.cache is not None else None
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=pool_context()) as pool:
+                futures = {p: pool.submit(plot_series_task, p, max_points, cache_dir) for p in pending}
+                for p, fut in futures.items():
+                    try:
+                        results[p] = fut.result()
+                    except Exception as e:
+                        print(f"Error preparando serie {p}: {e}")
+                        results[p] = self.get_plot_series(p, max_points)
+
+        for p in unique:
+            if p not in results:
+                results[p] = self.get_plot_series(p, max_points)
+        return {p: results[p] for p in unique}
+
+    def _stream_plot_series(self, filepath, max_points, column, x_range):
+        """
+        Lectura por bloques de un archivo grande sin caché. Los bloques también se
+        vuelcan a la caché binaria: los zooms siguientes recortan el memmap en vez
+        de volver a parsear el texto completo.
+        """
+        header = self.xvg_reader.new_header()
+        est_rows = self.xvg_reader.estimate_rows(filepath)
+        writer = self.cache.open_writer(filepath, self._source_stat(filepath)) if self.cache is not None else None
+        n_total = 0
+        complete = True
+
+        if x_range is None:
+            dec = MinMaxDecimator(bucket_size_for(est_rows, max_points))
+        else:
+            # Con zoom: primero se recoge la ventana (acotada) y luego se decima
+            xs, ys = [], []
+
+        for chunk in self.xvg_reader.iter_chunks(filepath, header=header):
+            if chunk.shape[1] <= column:
+                complete = False
+                break
+            if writer is not None:
+                writer.append(chunk)
+            n_total += len(chunk)
+            if x_range is None:
+                dec.feed(chunk[:, 0], chunk[:, column])
+                continue
+            x_win, y_win = self._slice_x_range(chunk[:, 0], chunk[:, column], x_range)
+            if len(x_win):
+                xs.append(np.array(x_win))
+                ys.append(np.array(y_win))
+
+        if writer is not None:
+            if complete:
+                writer.commit(header)
+            else:
+                writer.abort()
+
+        if x_range is None:
+            x_out, y_out = dec.finish()
+            return header['labels'], x_out, y_out, n_total
+        if not xs:
+            return header['labels'], np.empty(0), np.empty(0), n_total
+        x_out, y_out = decimate_minmax(np.concatenate(xs), np.concatenate(ys), max_points)
+        return header['labels'], x_out, y_out, n_total
+
+    def _slice_x_range(self, x, y, x_range):
+        """Recorta (x, y) a la ventana [x_min, x_max]. Usa búsqueda binaria si X es monótono"""
+        lo, hi = min(x_range), max(x_range)
+        n = len(x)
+        if n == 0:
+            return x, y
+        if n < 2 or x[0] <= x[n - 1]:
+            i0 = int(np.searchsorted(x, lo, side='left'))
+            i1 = int(np.searchsorted(x, hi, side='right'))
+            if i1 <= i0:
+                return x[:0], y[:0]
+            # Incluir un punto a cada lado para que la línea llegue a los bordes
+            i0 = max(i0 - 1, 0)
+            i1 = min(i1 + 1, n)
+            return x[i0:i1], y[i0:i1]
+        mask = (x >= lo) & (x <= hi)
+        return x[mask], y[mask]
+
+    # =========================================================================
+    # CACHÉ BINARIA DE SERIES
+    # =========================================================================
+
+    def set_cache_dir(self, cache_dir):
+        """Activa (o desactiva con None) la caché binaria de series parseadas"""
+        if not cache_dir:
+            self.cache = None
+        elif self.cache is None or self.cache.cache_dir != cache_dir:
+            self.cache = SeriesCache(cache_dir)
+
+    def _load_from_cache(self, filepath, dtype):
+        if self.cache is None:
+            return None
+        cached = self.cache.load(filepath)
+        if cached is None:
+            return None
+        header, columns = cached
+        if columns.ndim != 2 or columns.shape[0] < 2 or columns.dtype != np.dtype(dtype):
+            return None
+        return header, columns
+
+    def _source_stat(self, filepath):
+        """stat del archivo fuente tomado antes de leerlo (para validar la caché)"""
+        if self.cache is None:
+            return None
+        try:
+            return os.stat(filepath)
+        except OSError:
+            return None
+
+    def _store_in_cache(self, filepath, header, data, source_stat=None):
+        if self.cache is not None:
+            self.cache.store(filepath, header, data, source_stat)
+
     # =========================================================================
     # SECCIÓN 2: HERRAMIENTAS GROMACS (ENERGÍA Y PBC)
     # =========================================================================
@@ -141,6 +347,40 @@ class AnalysisParser:
         except Exception as Ex:
             return False, str(Ex)
 
+    def run_native_energy(self, edr_file, output_xvg, terms, begin=None, end=None):
+        """
+        Extrae propiedades del .edr en proceso (sin 'gmx energy') y las escribe
+        en un .xvg con el mismo formato que produce GROMACS.
+        """
+        if not os.path.exists(edr_file):
+            return False, "No existe el archivo .edr"
+        try:
+            reader = EdrReader(edr_file)
+            times, series = reader.get_series(terms, begin=begin, end=end)
+            names = list(series.keys())
+            units = ", ".join(f"({reader.get_unit(n)})" for n in names)
+            
+            with open(output_xvg, 'w') as f:
+                f.write("# Generado por ChemSimGUI (lector EDR nativo)\n")
+                f.write('@    title "GROMACS Energies"\n')
+                f.write('@    xaxis  label "Time (ps)"\n')
+                f.write(f'@    yaxis  label "{units}"\n')
+                f.write("@TYPE xy\n")
+                for i, name in enumerate(names):
+                    f.write(f'@ s{i} legend "{name}"\n')
+                np.savetxt(f, np.column_stack([times] + [series[n] for n in names]), fmt="%12.6f")
+            return True, "Análisis de energía completado."
+        except Exception as e:
+            return False, f"Error lector EDR: {e}"
+
+    def extract_energy(self, edr_file, output_xvg, terms):
+        """Lector nativo del .edr; si falla (formato no soportado) recurre a 'gmx energy'."""
+        success, msg = self.run_native_energy(edr_file, output_xvg, terms)
+        if success:
+            return success, msg
+        print(f"{msg} -> usando gmx energy")
+        return self.run_gmx_energy(edr_file, output_xvg, terms)
+
     def run_trjconv(self, tpr_file, xtc_file, output_xtc, center_group_id, output_group_id):
         """
         Corrige PBC centrando un grupo.
@@ -187,30 +427,98 @@ class AnalysisParser:
         structure_map = {}
         
         try:
-            with open(gro_file, 'r') as f:
-                lines = f.readlines()
+            atoms = self.gro_reader.read(gro_file)['atoms']
             
-            for line in lines[2:-1]:
-                if len(line) < 15:
-                    continue
-                    
-                res_name = line[5:10].strip()
-                atom_name = line[10:15].strip()
-                
+            # Parejas únicas (residuo, átomo) sin recorrer átomo a átomo
+            for res_name, atom_name in residue_atom_pairs(atoms):
                 if not res_name or not atom_name:
                     continue
-                
-                if res_name not in structure_map:
-                    structure_map[res_name] = set()
-                
-                structure_map[res_name].add(atom_name)
+                structure_map.setdefault(res_name, set()).add(atom_name)
                 
             return structure_map
         except Exception as e:
             print(f"Error escaneando GRO: {e}")
             return {}
 
+    def load_structure(self, gro_file):
+        """
+        Arrays de estructura del .gro (GroReader), cacheados en memoria mientras
+        el archivo no cambie (tamaño y fecha de modificación).
+        """
+        st = os.stat(gro_file)
+        key = (os.path.abspath(gro_file), st.st_size, st.st_mtime_ns)
+        cached = self._structure_cache
+        if cached.get('key') == key:
+            return cached['data']
+        # Se reemplaza el diccionario entero: seguro con varios sistemas en hilos
+        data = self.gro_reader.read(gro_file)
+        self._structure_cache = {'key': key, 'data': data}
+        return data
+
+    def _structure_for(self, tpr_file, working_dir):
+        """Busca un .gro con el mismo orden de átomos que el .tpr (mismo nombre o system.gro)"""
+        base = os.path.splitext(os.path.basename(tpr_file))[0]
+        for name in (f"{base}.gro", "system.gro"):
+            path = os.path.join(working_dir, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _load_index_groups(self, tpr_file, working_dir):
+        """
+        Grupos del index.ndx como pares (nombre, índices base 0) en orden de ID.
+        Si no existe, se generan los grupos por defecto desde el .gro.
+        Devuelve (grupos, atoms) o (None, None) si no hay estructura legible.
+        """
+        gro_file = self._structure_for(tpr_file, working_dir)
+        if gro_file is None:
+            return None, None
+        atoms = self.load_structure(gro_file)['atoms']
+
+        ndx_file = os.path.join(working_dir, "index.ndx")
+        if os.path.exists(ndx_file):
+            groups = read_ndx(ndx_file)
+        else:
+            groups = default_groups(atoms)
+            write_ndx(ndx_file, groups)
+        return groups, atoms
+
     def add_custom_group(self, tpr_file, working_dir, selection_str):
+        """
+        Crea un grupo en index.ndx a partir de una selección ('r SOL', 'a OW',
+        'r 1-2', '2 & a O*', 'resname CBD and name O*', ...). Se evalúa en memoria
+        sobre el .gro; si no hay estructura disponible o la orden no es una
+        selección que el motor entienda (ej. 'del 5', 'splitres 3'), se recurre
+        a gmx make_ndx.
+        """
+        try:
+            groups, atoms = self._load_index_groups(tpr_file, working_dir)
+        except Exception as e:
+            print(f"Error leyendo estructura/índice: {e}")
+            groups = None
+
+        if groups is None:
+            return self._run_make_ndx(tpr_file, working_dir, selection_str)
+        if selection_str.strip().lower() == "q":
+            return True, "Índice por defecto generado."
+
+        try:
+            selected = SelectionEngine(atoms, groups).select(selection_str)
+        except ValueError as e:
+            print(f"Selección no reconocida '{selection_str}' ({e}); se usa gmx make_ndx")
+            return self._run_make_ndx(tpr_file, working_dir, selection_str)
+        if len(selected) == 0:
+            return False, f"La selección '{selection_str}' no contiene átomos."
+
+        # Un nombre repetido se reemplaza en su sitio para no desplazar los IDs
+        set_group(groups, selection_group_name(selection_str, groups), selected)
+        try:
+            write_ndx(os.path.join(working_dir, "index.ndx"), groups)
+        except Exception as e:
+            return False, str(e)
+        return True, "Grupo agregado exitosamente."
+
+    def _run_make_ndx(self, tpr_file, working_dir, selection_str):
         """Usa make_ndx para crear un grupo personalizado."""
         ndx_file = os.path.join(working_dir, "index.ndx")
         
@@ -238,10 +546,74 @@ class AnalysisParser:
         except Exception as e:
             return False, str(e)
 
+    def ensure_groups(self, tpr_file, working_dir, selections):
+        """
+        Garantiza que existan los grupos pedidos, creando los que falten con una
+        sola escritura del index.ndx.
+
+        Args:
+            selections (dict): {nombre_grupo: selección}, ej. {'CBD': 'r CBD'}.
+
+        Returns:
+            dict: {Nombre: ID} actualizado (igual que get_gromacs_groups).
+        """
+        groups = self.get_gromacs_groups(tpr_file, working_dir)
+        missing = {name: sel for name, sel in selections.items() if name not in groups}
+        if not missing:
+            return groups
+
+        try:
+            index_groups, atoms = self._load_index_groups(tpr_file, working_dir)
+        except Exception as e:
+            print(f"Error leyendo estructura/índice: {e}")
+            index_groups = None
+
+        if index_groups is None:
+            for sel in missing.values():
+                self._run_make_ndx(tpr_file, working_dir, sel)
+        else:
+            engine = SelectionEngine(atoms, index_groups)
+            unparsed = []
+            for name, sel in missing.items():
+                try:
+                    selected = engine.select(sel)
+                except ValueError as e:
+                    print(f"Selección no reconocida '{sel}' ({e}); se usa gmx make_ndx")
+                    unparsed.append(sel)
+                    continue
+                if len(selected):
+                    set_group(index_groups, name, selected)
+            write_ndx(os.path.join(working_dir, "index.ndx"), index_groups)
+            # Después de escribir el .ndx, para que make_ndx parta del índice actualizado
+            for sel in unparsed:
+                self._run_make_ndx(tpr_file, working_dir, sel)
+        return self.get_gromacs_groups(tpr_file, working_dir)
+
+    def get_group_atoms(self, tpr_file, working_dir, group):
+        """
+        Índices base 0 de un grupo del index.ndx (None si no existe).
+
+        Args:
+            group (int | str): ID del grupo (posición en el .ndx, como en gmx) o nombre.
+        """
+        try:
+            groups, _ = self._load_index_groups(tpr_file, working_dir)
+        except Exception as e:
+            print(f"Error leyendo índice: {e}")
+            return None
+        if groups is None:
+            ndx_file = os.path.join(working_dir, "index.ndx")
+            groups = read_ndx(ndx_file) if os.path.exists(ndx_file) else []
+        i = group if isinstance(group, int) else find_group(groups, group)
+        if i is None or not 0 <= i < len(groups):
+            return None
+        return groups[i][1]
+
     def get_gromacs_groups(self, tpr_file, working_dir):
         """
         Obtiene el diccionario de grupos {Nombre: ID} del archivo index.ndx.
-        Si no existe, ejecuta gmx make_ndx una vez para generarlo por defecto.
+        Si no existe, se generan los grupos por defecto (desde el .gro, o con
+        gmx make_ndx si no hay estructura).
         """
         ndx_file = os.path.join(working_dir, "index.ndx")
         
@@ -249,19 +621,15 @@ class AnalysisParser:
         if not os.path.exists(ndx_file):
             self.add_custom_group(tpr_file, working_dir, "q")
             
-        groups = {}
         if not os.path.exists(ndx_file):
-            return groups
+            return {}
         
-        current_id = 0
         try:
-            with open(ndx_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("[") and line.endswith("]"):
-                        group_name = line.strip()[1:-1].strip()
-                        groups[group_name] = current_id
-                        current_id += 1
+            # El ID es la posición de la cabecera en el archivo; con nombres repetidos
+            # vale el primero, que es el que toma gmx al escribir el nombre
+            groups = {}
+            for group_id, name in enumerate(ndx_group_names(ndx_file)):
+                groups.setdefault(name, group_id)
             return groups
         except Exception:
             return {}
@@ -319,6 +687,105 @@ class AnalysisParser:
         except Exception as e:
             return False, str(e)
 
+    def run_rdf(self, tpr_file, xtc_file, output_xvg, ref_id, sel_id, working_dir, use_com, bin_width, cutoff,
+                n_workers=None):
+        """
+        RDF de la pestaña Análisis: motor nativo (una lectura del .xtc, frames
+        repartidos entre procesos). Si los grupos no se pueden resolver desde el
+        .gro / index.ndx, se recurre a gmx rdf.
+        
+        Args:
+            ref_id, sel_id (int): IDs de grupo del index.ndx (los de los combos).
+            n_workers (int, opcional): Procesos para el motor nativo.
+        """
+        result = self.run_native_rdf_groups(tpr_file, xtc_file, working_dir, [(ref_id, sel_id, output_xvg)],
+                                            use_com, bin_width, cutoff, n_workers=n_workers)
+        if result is None:
+            return self.run_gmx_rdf(tpr_file, xtc_file, output_xvg, ref_id, sel_id, working_dir,
+                                    use_com, bin_width, cutoff)
+        return result
+
+    def get_rdf_group(self, tpr_file, working_dir, group):
+        """
+        Grupo del index.ndx listo para el motor nativo: índices, molécula de cada
+        átomo (residuo del .gro) y masas estimadas por nombre (para mol_com).
+        
+        Returns:
+            dict | None: Grupo de rdf_engine.make_group(), o None si no se puede resolver.
+        """
+        atoms_idx = self.get_group_atoms(tpr_file, working_dir, group)
+        gro_file = self._structure_for(tpr_file, working_dir)
+        if atoms_idx is None or len(atoms_idx) == 0 or gro_file is None:
+            return None
+        structure = self.load_structure(gro_file)
+        atoms = structure['atoms']
+        if atoms_idx.max() >= len(atoms):
+            return None
+        # Molécula = residuo consecutivo (no depende del resid, que se reinicia tras 99999)
+        residue = np.searchsorted(structure['res_starts'], atoms_idx, side='right') - 1
+        masses = guess_masses(atoms['atomname'][atoms_idx], atoms['resname'][atoms_idx])
+        return make_group(atoms_idx, mol_ids=residue, masses=masses)
+
+    def run_native_rdf_groups(self, tpr_file, xtc_file, working_dir, pair_specs, use_com, bin_width, cutoff,
+                              n_workers=None):
+        """
+        Varios RDFs nativos en una sola pasada por el .xtc a partir de grupos del index.ndx.
+        
+        Args:
+            pair_specs (list): Tuplas (grupo_ref, grupo_sel, output_xvg); grupo = ID o nombre.
+            bin_width (float): Ancho del bin en nm (<= 0 usa 0.002, como gmx rdf).
+            cutoff (float): Distancia máxima en nm (<= 0 usa media caja, como gmx rdf).
+        
+        Returns:
+            tuple | None: (bool, mensaje), o None si algún grupo no se pudo resolver.
+        """
+        try:
+            resolved = {}
+            for ref, sel, _ in pair_specs:
+                for group in (ref, sel):
+                    if group not in resolved:
+                        resolved[group] = self.get_rdf_group(tpr_file, working_dir, group)
+        except Exception as e:
+            print(f"Error resolviendo grupos RDF: {e}")
+            return None
+        if any(g is None for g in resolved.values()):
+            return None
+
+        if bin_width <= 0:
+            bin_width = 0.002
+        if cutoff <= 0:
+            box = self.load_structure(self._structure_for(tpr_file, working_dir))['box']
+            cutoff = 0.5 * float(np.min(box_lengths(box[:3])))
+
+        pair_jobs = [(resolved[ref], resolved[sel], out) for ref, sel, out in pair_specs]
+        return self.run_native_rdf_trajectory(xtc_file, pair_jobs, use_com, bin_width, cutoff, n_workers=n_workers)
+
+    def run_native_rdf_trajectory(self, traj_file, pair_jobs, use_com, bin_width, cutoff,
+                                  n_workers=None, begin=None, end=None, stride=1):
+        """
+        RDFs nativos leyendo el .xtc directamente, con los frames repartidos en
+        bloques entre varios procesos (n_workers=None usa todos los núcleos).
+        
+        Args:
+            traj_file (str): Trayectoria .xtc.
+            pair_jobs (list): Tuplas (ref_group, sel_group, output_xvg).
+            begin, end (float): Ventana de tiempo en ps (equivalente a -b / -e).
+            stride (int): Tomar uno de cada 'stride' frames.
+        """
+        try:
+            pairs = [(ref, sel) for ref, sel, _ in pair_jobs]
+            outputs = [out for _, _, out in pair_jobs]
+            engine = MultiRdfEngine(pairs, bin_width=bin_width, cutoff=cutoff, use_com=use_com)
+            index_dir = self.cache.cache_dir if self.cache else None
+            engine.compute_trajectory(traj_file, n_workers=n_workers, begin=begin, end=end,
+                                      stride=stride, index_dir=index_dir)
+            if engine.n_frames == 0:
+                return False, "La trayectoria no contiene frames en el rango pedido."
+            engine.write_xvgs(outputs)
+            return True, f"{len(outputs)} RDFs nativos calculados ({engine.n_frames} frames)."
+        except Exception as e:
+            return False, f"Error RDF nativo: {e}"
+
     def run_travis_rdf(self, struct_file, traj_file, output_csv, mol1_name, mol2_name):
         """Ejecuta TRAVIS para RDF."""
         input_filename = "travis_input.txt"
@@ -363,4 +830,14 @@ class AnalysisParser:
                 return False, f"No se encontró salida de Travis.\nLog:\n{stdout}\n{stderr}"
                 
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+
+def plot_series_task(filepath, max_points, cache_dir):
+    """
+    Tarea de get_plot_series_batch en un proceso hijo (nivel de módulo: picklable).
+    Cada proceso crea su propio AnalysisParser: no comparte lector ni caché en memoria.
+    """
+    parser = AnalysisParser()
+    parser.set_cache_dir(cache_dir)
+    return parser.get_plot_series(filepath, max_points)
@@ -0,0 +1,267 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+
+
+class SeriesCache:
+    """
+    Caché binaria en disco para series ya parseadas (.xvg / .csv).
+    Cada archivo fuente genera un par de ficheros en el directorio de caché:
+        <clave>.npy  -> matriz transpuesta (columnas contiguas), leída con memmap
+        <clave>.json -> metadatos (ruta, tamaño, mtime, etiquetas, leyendas)
+    La entrada es válida solo si tamaño y mtime del archivo fuente no cambiaron.
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB por proyecto
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    # =========================================================================
+    # LECTURA / ESCRITURA
+    # =========================================================================
+
+    def load(self, filepath):
+        """
+        Busca la serie en caché.
+
+        Returns:
+            tuple | None: (cabecera_dict, matriz_columnas) con la matriz en modo
+                memmap de solo lectura, o None si no existe o está desactualizada.
+        """
+        npy_path, meta_path = self._entry_paths(filepath)
+        if not os.path.exists(meta_path) or not os.path.exists(npy_path):
+            return None
+
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+
+            st = os.stat(filepath)
+            if meta.get('size') != st.st_size or meta.get('mtime_ns') != st.st_mtime_ns:
+                self._remove_entry(npy_path, meta_path)
+                return None
+
+            columns = np.load(npy_path, mmap_mode='r')
+        except Exception:
+            self._remove_entry(npy_path, meta_path)
+            return None
+
+        # Marcar uso reciente (política LRU por mtime de los metadatos)
+        try:
+            os.utime(meta_path, None)
+        except OSError:
+            pass
+
+        return meta['header'], columns
+
+    def store(self, filepath, header, data, source_stat=None):
+        """
+        Guarda una matriz (n_filas, n_columnas) parseada desde filepath.
+        Escritura atómica: fichero temporal + os.replace. Los metadatos se
+        escriben al final, cuando el .npy ya está en disco.
+
+        Args:
+            source_stat (os.stat_result, opcional): stat del archivo fuente tomado
+                ANTES de leerlo. Si el archivo crece durante el parseo, la entrada
+                queda con el tamaño antiguo y se invalida en la próxima lectura.
+        """
+        if data is None or data.size == 0:
+            return False
+
+        try:
+            st = source_stat if source_stat is not None else os.stat(filepath)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            npy_path, _ = self._entry_paths(filepath)
+
+            # Guardar por columnas: cada serie queda contigua en disco
+            columns = np.ascontiguousarray(np.asarray(data).T)
+            tmp_npy = npy_path + ".tmp"
+            with open(tmp_npy, 'wb') as f:
+                np.save(f, columns)
+            self._publish(filepath, tmp_npy, header, st)
+        except Exception as e:
+            print(f"Aviso: no se pudo escribir caché para {filepath}: {e}")
+            return False
+
+        self.enforce_limit()
+        return True
+
+    def open_writer(self, filepath, source_stat=None):
+        """
+        Escritor para series leídas por bloques (archivos grandes): los bloques se
+        vuelcan a disco a medida que llegan y al final se publican como una entrada
+        normal, sin tener nunca el archivo completo en memoria.
+
+        Returns:
+            SeriesCacheWriter | None: None si no se puede leer el archivo fuente.
+        """
+        try:
+            st = source_stat if source_stat is not None else os.stat(filepath)
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Aviso: no se pudo escribir caché para {filepath}: {e}")
+            return None
+        return SeriesCacheWriter(self, filepath, st)
+
+    def _publish(self, filepath, tmp_npy, header, st):
+        """Coloca el .npy temporal y escribe los metadatos al final"""
+        npy_path, meta_path = self._entry_paths(filepath)
+        # Los metadatos anteriores no deben describir el .npy nuevo
+        try:
+            os.remove(meta_path)
+        except OSError:
+            pass
+        os.replace(tmp_npy, npy_path)
+
+        meta = {
+            'source': os.path.abspath(filepath),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'header': header
+        }
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    # =========================================================================
+    # MANTENIMIENTO
+    # =========================================================================
+
+    def enforce_limit(self):
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes"""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            npy_path = meta_path[:-5] + ".npy"
+            try:
+                size = os.path.getsize(meta_path)
+                if os.path.exists(npy_path):
+                    size += os.path.getsize(npy_path)
+                last_use = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((last_use, size, npy_path, meta_path))
+            total += size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, npy_path, meta_path in sorted(entries):
+            self._remove_entry(npy_path, meta_path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def purge(self):
+        """Borra todo el directorio de caché"""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_size(self):
+        """Tamaño total en bytes de la caché"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            try:
+                total += os.path.getsize(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+        return total
+
+    # =========================================================================
+    # HELPERS INTERNOS
+    # =========================================================================
+
+    def _entry_paths(self, filepath):
+        key = hashlib.sha1(os.path.abspath(filepath).encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".npy", base + ".json"
+
+    def _remove_entry(self, npy_path, meta_path):
+        for p in (npy_path, meta_path):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+class SeriesCacheWriter:
+    """
+    Construye una entrada de SeriesCache bloque a bloque.
+    Las filas se añaden a un archivo binario temporal (orden por filas) y en
+    commit() se transponen por tramos a un .npy por columnas con memmap, así la
+    memoria usada queda acotada al tamaño de un bloque.
+    """
+
+    TRANSPOSE_ROWS = 500000
+
+    def __init__(self, cache, filepath, source_stat):
+        self.cache = cache
+        self.filepath = filepath
+        self.source_stat = source_stat
+        npy_path, _ = cache._entry_paths(filepath)
+        self.raw_path = npy_path + ".rows.tmp"
+        self.n_rows = 0
+        self.n_cols = None
+        self.failed = False
+        self._raw = open(self.raw_path, 'wb')
+
+    def append(self, chunk):
+        """Añade un bloque (n_filas, n_columnas) float64. Deja de escribir si supera el límite."""
+        if self.failed:
+            return
+        if self.n_cols is None:
+            self.n_cols = chunk.shape[1]
+        if chunk.shape[1] != self.n_cols or \
+                (self.n_rows + len(chunk)) * self.n_cols * 8 > self.cache.max_bytes:
+            # Columnas irregulares o serie mayor que toda la caché: no se guarda
+            self.abort()
+            return
+        np.ascontiguousarray(chunk, dtype=np.float64).tofile(self._raw)
+        self.n_rows += len(chunk)
+
+    def commit(self, header):
+        """Publica la entrada. Returns: bool"""
+        if self.failed or not self.n_rows:
+            self.abort()
+            return False
+        self._raw.close()
+        npy_path, _ = self.cache._entry_paths(self.filepath)
+        tmp_npy = npy_path + ".tmp"
+        try:
+            rows = np.memmap(self.raw_path, dtype=np.float64, mode='r', shape=(self.n_rows, self.n_cols))
+            columns = np.lib.format.open_memmap(tmp_npy, mode='w+', dtype=np.float64,
+                                                shape=(self.n_cols, self.n_rows))
+            for i in range(0, self.n_rows, self.TRANSPOSE_ROWS):
+                columns[:, i:i + self.TRANSPOSE_ROWS] = rows[i:i + self.TRANSPOSE_ROWS].T
+            columns.flush()
+            del columns, rows
+            self.cache._publish(self.filepath, tmp_npy, header, self.source_stat)
+        except Exception as e:
+            print(f"Aviso: no se pudo escribir caché para {self.filepath}: {e}")
+            if os.path.exists(tmp_npy):
+                os.remove(tmp_npy)
+            self.abort()
+            return False
+        os.remove(self.raw_path)
+        self.cache.enforce_limit()
+        return True
+
+    def abort(self):
+        self.failed = True
+        if not self._raw.closed:
+            self._raw.close()
+        if os.path.exists(self.raw_path):
+            os.remove(self.raw_path)
@@ -0,0 +1,88 @@
+import math
+import numpy as np
+
+
+class MinMaxDecimator:
+    """
+    Decimador en streaming (mín/máx por cubeta) para series muy largas.
+    Recibe bloques (x, y) en orden y conserva, por cada cubeta de `bucket_size`
+    filas, el punto mínimo y el máximo de Y (en su orden original). El resultado
+    tiene ~2 puntos por cubeta y preserva los picos visibles en pantalla.
+    """
+
+    def __init__(self, bucket_size):
+        self.bucket_size = max(int(bucket_size), 1)
+        self._x_parts = []
+        self._y_parts = []
+        self._x_rest = None
+        self._y_rest = None
+
+    def feed(self, x, y):
+        """Procesa un bloque. Las filas que no completan cubeta se guardan para el siguiente"""
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if self._x_rest is not None and len(self._x_rest):
+            x = np.concatenate([self._x_rest, x])
+            y = np.concatenate([self._y_rest, y])
+
+        bs = self.bucket_size
+        n_full = (len(y) // bs) * bs
+        if n_full:
+            self._reduce(x[:n_full], y[:n_full], bs)
+
+        self._x_rest = x[n_full:]
+        self._y_rest = y[n_full:]
+
+    def finish(self):
+        """
+        Cierra la última cubeta (parcial) y retorna la serie decimada.
+
+        Returns:
+            tuple: (array_x, array_y)
+        """
+        if self._y_rest is not None and len(self._y_rest):
+            self._reduce(self._x_rest, self._y_rest, len(self._y_rest))
+            self._x_rest = self._y_rest = None
+
+        if not self._x_parts:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(self._x_parts), np.concatenate(self._y_parts)
+
+    def _reduce(self, x, y, bs):
+        if bs <= 2:
+            # Cubetas de 1-2 filas: no hay nada que descartar
+            self._x_parts.append(np.array(x, copy=True))
+            self._y_parts.append(np.array(y, copy=True))
+            return
+
+        n_buckets = len(y) // bs
+        yb = y.reshape(n_buckets, bs)
+        offsets = np.arange(n_buckets) * bs
+
+        # nanargmin/max fallan con cubetas todo-NaN; usamos la variante segura
+        i_min = np.argmin(np.where(np.isnan(yb), np.inf, yb), axis=1) + offsets
+        i_max = np.argmax(np.where(np.isnan(yb), -np.inf, yb), axis=1) + offsets
+
+        # Mantener el orden temporal dentro de cada cubeta
+        idx = np.empty(2 * n_buckets, dtype=np.int64)
+        idx[0::2] = np.minimum(i_min, i_max)
+        idx[1::2] = np.maximum(i_min, i_max)
+
+        self._x_parts.append(np.asarray(x)[idx])
+        self._y_parts.append(np.asarray(y)[idx])
+
+
+def bucket_size_for(n_rows, max_points):
+    """Tamaño de cubeta para que n_rows filas queden en ~max_points puntos (2 por cubeta)"""
+    n_buckets = max(int(max_points) // 2, 1)
+    return max(int(math.ceil(n_rows / n_buckets)), 1)
+
+
+def decimate_minmax(x, y, max_points):
+    """Decimación mín/máx de una serie ya cargada (o memmap). Devuelve copias si no hace falta reducir"""
+    n = len(y)
+    if n <= max_points:
+        return np.array(x, copy=True), np.array(y, copy=True)
+    dec = MinMaxDecimator(bucket_size_for(n, max_points))
+    dec.feed(x, y)
+    return dec.finish()
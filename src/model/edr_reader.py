@@ -0,0 +1,428 @@
+import os
+import struct
+import numpy as np
+
+
+ENX_NAMES_MAGIC = -55555
+ENX_FRAME_MAGIC = -7777777
+ENX_FIRST_REAL = -2e10
+
+# Tipos de sub-bloque (xdr_datatype de GROMACS)
+XDR_INT, XDR_FLOAT, XDR_DOUBLE, XDR_INT64, XDR_CHAR, XDR_STRING = range(6)
+
+
+class EdrReader:
+    """
+    Lector nativo de archivos de energía .edr (formato XDR de GROMACS).
+    Lee la lista de términos (nombre + unidad) y todos los frames en una pasada,
+    guardando solo el valor instantáneo de cada término en una matriz
+    (n_frames, n_terminos). Soporta archivos de precisión simple y doble
+    (versiones de formato >= 4, GROMACS 4.5 en adelante).
+    """
+
+    def __init__(self, filepath, use_cache=True):
+        """
+        Args:
+            filepath (str): Ruta al .edr.
+            use_cache (bool): Guardar/usar la caché columnar junto al .edr
+                (archivo oculto .<nombre>.cache.npz).
+        """
+        self.filepath = filepath
+        self.terms = []
+        self.units = []
+        self.times = np.empty(0)
+        self.steps = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, 0))
+        # Bytes ya leídos (permite continuar un .edr que sigue creciendo)
+        self.real_size = 4
+        self.names_end = 0
+        self.end_offset = 0
+
+        folder, name = os.path.split(os.path.abspath(filepath))
+        self.cache_path = os.path.join(folder, f".{name}.cache.npz")
+
+        if use_cache and self._load_cache():
+            return
+        self._read()
+        if use_cache:
+            self._save_cache()
+
+    # =========================================================================
+    # CONSULTA
+    # =========================================================================
+
+    def get_terms(self):
+        """Lista de términos disponibles (en el orden del archivo)"""
+        return list(self.terms)
+
+    def find_term(self, name):
+        """
+        Índice de un término por nombre, como lo resuelve 'gmx energy':
+        coincidencia exacta sin distinguir mayúsculas, o prefijo único.
+        Retorna None si no existe o es ambiguo.
+        """
+        lower = [t.lower() for t in self.terms]
+        key = name.strip().lower()
+        if key in lower:
+            return lower.index(key)
+        matches = [i for i, t in enumerate(lower) if t.startswith(key)]
+        return matches[0] if len(matches) == 1 else None
+
+    def get_series(self, terms, begin=None, end=None):
+        """
+        Extrae varios términos como columnas NumPy.
+
+        Args:
+            terms (list): Nombres de los términos (ej. ['Volume', 'Density']).
+            begin, end (float, opcional): Ventana de tiempo en ps (como -b / -e).
+
+        Returns:
+            tuple: (array_tiempos, dict {nombre_en_archivo: array_valores})
+        """
+        mask = np.ones(len(self.times), dtype=bool)
+        if begin is not None:
+            mask &= self.times >= begin
+        if end is not None:
+            mask &= self.times <= end
+
+        series = {}
+        for name in terms:
+            idx = self.find_term(name)
+            if idx is None:
+                raise KeyError(f"Término '{name}' no encontrado en {self.filepath}")
+            series[self.terms[idx]] = self.values[mask, idx]
+        return self.times[mask], series
+
+    def get_unit(self, term):
+        idx = self.find_term(term)
+        return self.units[idx] if idx is not None else ""
+
+    def refresh(self):
+        """
+        Lee solo los frames añadidos desde la última lectura (seguimiento de un
+        .edr mientras mdrun escribe). Si el archivo se acortó (reescrito desde
+        cero) se vuelve a leer entero.
+
+        Returns:
+            int: Número de frames nuevos.
+        """
+        n_before = len(self.times)
+        size = os.path.getsize(self.filepath)
+        if size < self.end_offset:
+            self._read()
+            return len(self.times)
+        if size == self.end_offset:
+            return 0
+        try:
+            self._read(start=self.end_offset)
+        except (struct.error, ValueError):
+            # Frame a medio escribir: se reintentará en la siguiente llamada
+            return 0
+        return len(self.times) - n_before
+
+    # =========================================================================
+    # CACHÉ COLUMNAR EN DISCO
+    # =========================================================================
+
+    def _load_cache(self):
+        """
+        Usa la caché si sigue siendo válida. Si el .edr solo ha crecido (simulación
+        en curso), lee únicamente los frames nuevos y actualiza la caché.
+        """
+        if not os.path.exists(self.cache_path):
+            return False
+        try:
+            st = os.stat(self.filepath)
+            with np.load(self.cache_path, allow_pickle=False) as c:
+                size, mtime_ns = int(c['size']), int(c['mtime_ns'])
+                end_offset = int(c['end_offset'])
+                tail = c['tail'].tobytes()
+                self.terms = c['terms'].tolist()
+                self.units = c['units'].tolist()
+                self.times = c['times']
+                self.steps = c['steps']
+                # Guardado por columnas (n_terminos, n_frames)
+                self.values = np.ascontiguousarray(c['columns'].T)
+                self.real_size = int(c['real_size'])
+                self.names_end = int(c['names_end'])
+                self.end_offset = end_offset
+        except Exception:
+            return False
+
+        if size == st.st_size and mtime_ns == st.st_mtime_ns:
+            return True
+
+        # ¿Creció por el final? Comprobar que lo ya leído no cambió
+        # (primer frame y últimos bytes leídos)
+        if st.st_size < end_offset or not tail:
+            return False
+        if self._fingerprint() != tail:
+            return False
+        try:
+            self._read(start=end_offset)
+        except (struct.error, ValueError):
+            return False
+        self._save_cache()
+        return True
+
+    def _fingerprint(self, n_bytes=256):
+        """Bytes del inicio del primer frame y del final de lo ya leído"""
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.names_end)
+            head = f.read(min(n_bytes, self.end_offset - self.names_end))
+            tail_start = max(self.end_offset - n_bytes, self.names_end)
+            f.seek(tail_start)
+            tail = f.read(self.end_offset - tail_start)
+        return head + tail
+
+    def _save_cache(self):
+        tmp = self.cache_path + ".tmp"
+        try:
+            st = os.stat(self.filepath)
+            tail = self._fingerprint()
+            with open(tmp, 'wb') as f:
+                np.savez(f, size=st.st_size, mtime_ns=st.st_mtime_ns,
+                         end_offset=self.end_offset, names_end=self.names_end,
+                         real_size=self.real_size,
+                         tail=np.frombuffer(tail, dtype=np.uint8),
+                         terms=np.array(self.terms, dtype=str), units=np.array(self.units, dtype=str),
+                         times=self.times, steps=self.steps, columns=self.values.T)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"No se pudo guardar la caché EDR: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # =========================================================================
+    # LECTURA XDR
+    # =========================================================================
+
+    def _read(self, start=None):
+        """
+        Lee el archivo completo o, si se indica 'start', solo los frames añadidos
+        a partir de ese byte (el .edr crece por el final durante mdrun).
+        """
+        with open(self.filepath, 'rb') as f:
+            if start is None:
+                raw = f.read()
+                self.terms, self.units = [], []
+                pos = self._read_names(raw)
+                self.names_end = pos
+                self.real_size = self._detect_precision(raw, pos)
+            else:
+                f.seek(start)
+                raw = f.read()
+                pos = 0
+
+        times, steps, values, pos = self._parse_frames(raw, pos)
+        base = start or 0
+        self.end_offset = base + pos
+
+        if start is None:
+            self.times, self.steps, self.values = times, steps, values
+        else:
+            self.times = np.concatenate([self.times, times])
+            self.steps = np.concatenate([self.steps, steps])
+            self.values = np.vstack([self.values, values])
+
+    def _parse_frames(self, raw, pos):
+        """
+        Recorre los frames desde 'pos'.
+
+        Returns:
+            tuple: (tiempos, pasos, valores (n_frames, n_terminos), pos_final)
+        """
+        real_size = self.real_size
+        n_terms = len(self.terms)
+        times, steps, rows = [], [], []
+        parts = []
+        n_tries = 0
+        while pos < len(raw):
+            # El primer frame suele diferir (nsum = 0); se intenta la ruta rápida
+            # al principio y de nuevo tras el primer frame
+            if n_tries < 2:
+                n_tries += 1
+                uniform = self._read_uniform(raw, pos, real_size, n_terms)
+                if uniform is not None:
+                    parts.append(uniform[:3])
+                    pos = uniform[3]
+                    break
+            try:
+                next_pos, t, step, energies, _ = self._read_frame(raw, pos, real_size, n_terms)
+            except struct.error:
+                # Frame incompleto al final (simulación en curso)
+                break
+            pos = next_pos
+            if energies is not None:
+                times.append(t)
+                steps.append(step)
+                rows.append(energies)
+
+        head = (np.array(times, dtype=np.float64), np.array(steps, dtype=np.int64),
+                np.array(rows, dtype=np.float64).reshape(-1, n_terms))
+        parts.insert(0, head)
+        return (np.concatenate([p[0] for p in parts]),
+                np.concatenate([p[1] for p in parts]),
+                np.vstack([p[2] for p in parts]),
+                pos)
+
+    def _read_uniform(self, raw, start, real_size, n_terms):
+        """
+        Ruta rápida: en un .edr de mdrun los frames suelen tener todos el mismo
+        tamaño y la misma estructura. Si es así, el resto del archivo se ve como una
+        matriz (n_frames, bytes_por_frame) y las columnas se extraen sin bucle.
+
+        Returns:
+            tuple | None: (tiempos, pasos, valores, pos_final) o None si la estructura varía.
+        """
+        try:
+            end, _, _, energies, e_offset = self._read_frame(raw, start, real_size, n_terms)
+        except (struct.error, ValueError):
+            return None
+        if energies is None:
+            return None
+
+        frame_len = end - start
+        n_frames = (len(raw) - start) // frame_len
+        frames = np.frombuffer(raw, dtype=np.uint8, count=n_frames * frame_len, offset=start)
+        frames = frames.reshape(n_frames, frame_len)
+
+        # Todo lo que no es tiempo, paso ni energías debe coincidir byte a byte
+        # (marca, versión, nsum, nre, descriptores de bloques...)
+        head = real_size + 8
+        layout = np.concatenate([frames[:, :head], frames[:, head + 16:e_offset]], axis=1)
+        if not np.all(layout == layout[0]):
+            return None
+
+        stride = self._energy_stride(frames[0], head)
+        real_dtype = '>f4' if real_size == 4 else '>f8'
+        times = np.ascontiguousarray(frames[:, head:head + 8]).view('>f8').ravel()
+        steps = np.ascontiguousarray(frames[:, head + 8:head + 16]).view('>i8').ravel()
+        block = np.ascontiguousarray(frames[:, e_offset:e_offset + n_terms * stride * real_size])
+        values = block.view(real_dtype)[:, ::stride]
+        return (times.astype(np.float64), steps.astype(np.int64), values.astype(np.float64),
+                start + n_frames * frame_len)
+
+    def _energy_stride(self, frame, head):
+        """3 valores por término (e, eav, esum) si nsum > 0, si no 1"""
+        nsum, = struct.unpack_from('>i', frame.tobytes(), head + 16)
+        return 3 if nsum > 0 else 1
+
+    def _read_names(self, raw):
+        magic, = struct.unpack_from('>i', raw, 0)
+        if magic > 0:
+            raise ValueError("Formato EDR antiguo (anterior a GROMACS 4.5) no soportado.")
+        if magic != ENX_NAMES_MAGIC:
+            raise ValueError("El archivo no parece un .edr de GROMACS.")
+
+        file_version, n_terms = struct.unpack_from('>ii', raw, 4)
+        pos = 12
+        for _ in range(n_terms):
+            name, pos = _read_string(raw, pos)
+            if file_version >= 2:
+                unit, pos = _read_string(raw, pos)
+            else:
+                unit = "kJ/mol"
+            self.terms.append(name)
+            self.units.append(unit)
+        return pos
+
+    def _detect_precision(self, raw, pos):
+        """Tamaño de 'real' (4 = simple, 8 = doble) a partir del primer frame"""
+        if pos + 12 > len(raw):
+            return 4
+        first, magic = struct.unpack_from('>fi', raw, pos)
+        if first < -1e10 and magic == ENX_FRAME_MAGIC:
+            return 4
+        first, magic = struct.unpack_from('>di', raw, pos)
+        if first < -1e10 and magic == ENX_FRAME_MAGIC:
+            return 8
+        raise ValueError("Cabecera de frame EDR no reconocida.")
+
+    def _read_frame(self, raw, pos, real_size, n_terms):
+        """
+        Lee un frame a partir de 'pos'.
+
+        Returns:
+            tuple: (pos_siguiente, tiempo, paso, energías | None, offset_energías)
+        """
+        start = pos
+        real_fmt = '>f' if real_size == 4 else '>d'
+        first, = struct.unpack_from(real_fmt, raw, pos)
+        pos += real_size
+        if first > -1e10:
+            raise ValueError("Frame EDR de formato antiguo no soportado.")
+
+        magic, file_version = struct.unpack_from('>ii', raw, pos)
+        pos += 8
+        if magic != ENX_FRAME_MAGIC:
+            raise ValueError(f"Frame EDR corrupto en byte {pos}.")
+        if file_version < 4:
+            raise ValueError("Frames EDR anteriores a la versión 4 no soportados.")
+
+        t, step, nsum = struct.unpack_from('>dqi', raw, pos)
+        pos += 20
+        if file_version >= 3:
+            pos += 8  # nsteps
+        if file_version >= 5:
+            pos += 8  # dt
+
+        nre, _reserved, nblock = struct.unpack_from('>iii', raw, pos)
+        pos += 12
+
+        # Descripción de bloques: id, n_sub y (tipo, n) por sub-bloque
+        blocks = []
+        for _ in range(nblock):
+            _block_id, nsub = struct.unpack_from('>ii', raw, pos)
+            pos += 8
+            subs = []
+            for _ in range(nsub):
+                subs.append(struct.unpack_from('>ii', raw, pos))
+                pos += 8
+            blocks.append(subs)
+
+        pos += 12  # e_size + 2 enteros reservados
+
+        e_offset = pos - start
+        energies = None
+        if nre:
+            # Por término: e (+ eav, esum si nsum > 0)
+            stride = 3 if nsum > 0 else 1
+            if pos + nre * stride * real_size > len(raw):
+                # Frame a medio escribir: frombuffer lanzaría ValueError
+                raise struct.error("frame incompleto")
+            data = np.frombuffer(raw, dtype=real_fmt, count=nre * stride, offset=pos)
+            pos += nre * stride * real_size
+            if nre == n_terms:
+                energies = data[::stride].astype(np.float64)
+
+        for subs in blocks:
+            for sub_type, nr in subs:
+                pos = _skip_subblock(raw, pos, sub_type, nr, real_size)
+
+        if pos > len(raw):
+            raise struct.error("frame incompleto")
+        return pos, t, step, energies, e_offset
+
+
+def _read_string(raw, pos):
+    """Cadena de gmx_fio_do_string: int (len+1) + cadena XDR (len + bytes con relleno a 4)"""
+    pos += 4
+    length, = struct.unpack_from('>I', raw, pos)
+    pos += 4
+    text = raw[pos:pos + length].decode('utf-8', errors='replace')
+    pos += (length + 3) // 4 * 4
+    return text, pos
+
+
+def _skip_subblock(raw, pos, sub_type, nr, real_size):
+    if sub_type in (XDR_INT, XDR_FLOAT, XDR_CHAR):
+        # Los 'char' XDR ocupan 4 bytes cada uno
+        return pos + 4 * nr
+    if sub_type in (XDR_DOUBLE, XDR_INT64):
+        return pos + 8 * nr
+    if sub_type == XDR_STRING:
+        for _ in range(nr):
+            _, pos = _read_string(raw, pos)
+        return pos
+    raise ValueError(f"Tipo de sub-bloque EDR desconocido: {sub_type}")
@@ -0,0 +1,256 @@
+import numpy as np
+
+
+# Registro por átomo del .gro (columnas de ancho fijo)
+GRO_DTYPE = np.dtype([
+    ('resid', np.int32),
+    ('resname', 'U5'),
+    ('atomname', 'U5'),
+    ('index', np.int32),
+    ('xyz', np.float32, (3,)),
+    ('vel', np.float32, (3,)),
+])
+
+
+class GroReader:
+    """
+    Lector vectorizado de archivos .gro (GROMACS).
+    Cuando todas las líneas de átomos tienen la misma longitud (lo normal), el
+    bloque se ve como una matriz de bytes (n_atomos, ancho_linea) y cada columna
+    de ancho fijo se convierte de una vez con NumPy. Si el archivo es irregular
+    se recurre a una lectura línea a línea.
+    """
+
+    def __init__(self):
+        pass
+
+    # =========================================================================
+    # LECTURA
+    # =========================================================================
+
+    def read(self, filepath):
+        """
+        Lee un .gro completo.
+
+        Returns:
+            dict: {
+                'title': str,
+                'atoms': array estructurado GRO_DTYPE (resid, resname, atomname,
+                         index, xyz [nm], vel [nm/ps]),
+                'box': np.ndarray (3,) o (9,) en nm,
+                'res_starts': np.ndarray con el primer átomo de cada residuo y
+                              un último elemento = n_atomos (bordes de residuo),
+                'has_velocities': bool
+            }
+        """
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+
+        # Cabecera: título + número de átomos
+        end_title = raw.find(b'\n')
+        end_count = raw.find(b'\n', end_title + 1)
+        if end_title < 0 or end_count < 0:
+            raise ValueError(f"Archivo GRO incompleto: {filepath}")
+        title = raw[:end_title].decode('utf-8', errors='replace').strip()
+        n_atoms = int(raw[end_title + 1:end_count].strip())
+
+        body = raw[end_count + 1:]
+        line_len = body.find(b'\n') + 1
+        block_bytes = line_len * n_atoms
+
+        if line_len > 0 and self._is_regular(body, line_len, n_atoms):
+            block = np.frombuffer(body, dtype=np.uint8, count=block_bytes).reshape(n_atoms, line_len)
+            atoms, has_vel = self._decode_block(block)
+            box_line = body[block_bytes:].split(b'\n', 1)[0]
+        else:
+            lines = body.split(b'\n')
+            atoms, has_vel = self._decode_lines(lines[:n_atoms])
+            box_line = lines[n_atoms] if len(lines) > n_atoms else b''
+
+        box = np.array(box_line.split(), dtype=np.float32) if box_line.strip() else np.zeros(3, dtype=np.float32)
+
+        return {
+            'title': title,
+            'atoms': atoms,
+            'box': box,
+            'res_starts': residue_starts(atoms),
+            'has_velocities': has_vel,
+        }
+
+    # =========================================================================
+    # DECODIFICACIÓN
+    # =========================================================================
+
+    def _is_regular(self, body, line_len, n_atoms):
+        """Comprueba (sin copiar) que cada línea de átomo termina donde se espera"""
+        block_bytes = line_len * n_atoms
+        if len(body) < block_bytes:
+            return False
+        ends = np.frombuffer(body, dtype=np.uint8, count=block_bytes)[line_len - 1::line_len]
+        return bool(np.all(ends == ord('\n')))
+
+    def _decode_block(self, block):
+        """Convierte la matriz de bytes (n_atomos, ancho_linea) en el array estructurado"""
+        n_atoms = len(block)
+        atoms = np.zeros(n_atoms, dtype=GRO_DTYPE)
+        if n_atoms == 0:
+            return atoms, False
+
+        # Quitar '\r' (archivos de Windows) del ancho útil
+        width = block.shape[1] - 1
+        if width > 0 and block[0, width - 1] == ord('\r'):
+            width -= 1
+
+        def field(start, stop):
+            return np.ascontiguousarray(block[:, start:stop]).view(f'S{stop - start}').ravel()
+
+        atoms['resname'] = np.char.strip(field(5, 10).astype('U5'))
+        atoms['atomname'] = np.char.strip(field(10, 15).astype('U5'))
+        atoms['resid'] = numeric_columns(block, 0, 1, 5, np.int64)[:, 0]
+        atoms['index'] = numeric_columns(block, 15, 1, 5, np.int64)[:, 0]
+
+        # Ancho de las coordenadas: distancia entre puntos decimales (formato %8.3f por defecto)
+        first_line = block[0, :width].tobytes()
+        w = coord_width(first_line)
+        dec = coord_decimals(first_line, w)
+        atoms['xyz'] = numeric_columns(block, 20, 3, w, np.float32, dec)
+
+        # Velocidades: mismo ancho con un decimal más (%8.4f por defecto)
+        v_start = 20 + 3 * w
+        has_vel = width >= v_start + 3 * w
+        if has_vel:
+            atoms['vel'] = numeric_columns(block, v_start, 3, w, np.float32, dec + 1)
+        return atoms, has_vel
+
+    def _decode_lines(self, lines):
+        """Lectura tolerante línea a línea (longitudes de línea distintas)"""
+        atoms = np.zeros(len(lines), dtype=GRO_DTYPE)
+        has_vel = True
+        for i, line in enumerate(lines):
+            line = line.rstrip(b'\r\n').decode('utf-8', errors='replace')
+            w = coord_width(line.encode())
+            atoms[i]['resid'] = int(line[0:5])
+            atoms[i]['resname'] = line[5:10].strip()
+            atoms[i]['atomname'] = line[10:15].strip()
+            atoms[i]['index'] = int(line[15:20])
+            atoms[i]['xyz'] = [float(line[20 + d * w:20 + (d + 1) * w]) for d in range(3)]
+
+            v_start = 20 + 3 * w
+            vel = line[v_start:v_start + 3 * w]
+            if len(vel.split()) == 3:
+                atoms[i]['vel'] = [float(v) for v in vel.split()]
+            else:
+                has_vel = False
+        return atoms, has_vel and len(lines) > 0
+
+
+def numeric_columns(block, start, n_fields, width, dtype, decimals=0):
+    """
+    Convierte n_fields columnas numéricas contiguas de ancho fijo a una matriz
+    (n, n_fields). Ruta rápida: aritmética sobre los dígitos, ya que en los .gro
+    el punto decimal está siempre en la misma columna. Si algún campo no respeta
+    el formato se recurre a np.fromstring sobre los campos separados.
+    """
+    n = len(block)
+    fields = block[:, start:start + n_fields * width].reshape(n, n_fields, width)
+    values = _fixed_point_fields(fields, decimals)
+    if values is None:
+        starts = [start + j * width for j in range(n_fields)]
+        return _parse_columns_text(block, starts, width, dtype)
+    return values.astype(dtype)
+
+
+# Tablas de consulta por byte: valor del dígito y caracteres válidos en un campo numérico
+_DIGIT_VALUE = np.zeros(256, dtype=np.float64)
+_DIGIT_VALUE[ord('0'):ord('9') + 1] = np.arange(10)
+_VALID_CHAR = np.zeros(256, dtype=bool)
+_VALID_CHAR[[ord(c) for c in '0123456789 -.']] = True
+
+
+def _fixed_point_fields(fields, decimals):
+    """Valor de campos '%w.df' (o enteros si decimals=0) sin pasar por texto"""
+    width = fields.shape[2]
+    # Peso decimal de cada columna; la del punto pesa 0
+    exponents = np.arange(width - 1, -1, -1) - decimals
+    if decimals:
+        dot = width - decimals - 1
+        if dot < 0 or not np.all(fields[:, :, dot] == ord('.')):
+            return None
+        exponents[:dot] -= 1
+    powers = 10.0 ** exponents
+    if decimals:
+        powers[dot] = 0.0
+
+    # Solo dígitos, espacios, punto y signo menos
+    if not np.all(_VALID_CHAR[fields]):
+        return None
+
+    value = _DIGIT_VALUE[fields] @ powers
+    value[(fields == ord('-')).any(axis=2)] *= -1.0
+    return value
+
+
+def _parse_columns_text(block, starts, width, dtype):
+    # Los campos pueden ir pegados ('-1234.567-234.567'): se separan con un espacio
+    n = len(block)
+    k = len(starts)
+    buf = np.full((n, k * (width + 1)), ord(' '), dtype=np.uint8)
+    for j, start in enumerate(starts):
+        buf[:, j * (width + 1):j * (width + 1) + width] = block[:, start:start + width]
+
+    flat = np.fromstring(buf.tobytes(), dtype=np.float64, sep=' ')
+    if flat.size != n * k:
+        # Campos vacíos o no numéricos: conversión campo a campo (lanza ValueError si no es válido)
+        cols = [np.ascontiguousarray(block[:, s:s + width]).view(f'S{width}').ravel().astype(dtype)
+                for s in starts]
+        return np.column_stack(cols)
+    return flat.reshape(n, k).astype(dtype)
+
+
+def coord_decimals(line, width):
+    """Número de decimales de las coordenadas (3 en el formato por defecto %8.3f)"""
+    first = line.find(b'.', 20)
+    if first < 0:
+        return 3
+    return max(20 + width - first - 1, 0)
+
+
+def coord_width(line):
+    """Ancho de campo de las coordenadas a partir de la posición de los decimales"""
+    first = line.find(b'.', 20)
+    second = line.find(b'.', first + 1) if first >= 0 else -1
+    if first < 0 or second < 0:
+        return 8
+    return second - first
+
+
+def residue_starts(atoms):
+    """
+    Índices donde empieza cada residuo (+ n_atomos al final).
+    Un residuo nuevo empieza cuando cambia el número o el nombre del residuo,
+    lo que también cubre el salto 99999 -> 0 de los sistemas grandes.
+    """
+    n = len(atoms)
+    if n == 0:
+        return np.zeros(1, dtype=np.int64)
+    change = np.empty(n, dtype=bool)
+    change[0] = True
+    change[1:] = (atoms['resid'][1:] != atoms['resid'][:-1]) | (atoms['resname'][1:] != atoms['resname'][:-1])
+    return np.append(np.flatnonzero(change), n).astype(np.int64)
+
+
+def residue_atom_pairs(atoms):
+    """
+    Parejas únicas (resname, atomname) del sistema.
+    Los campos 'resname' y 'atomname' son contiguos en GRO_DTYPE, así que se ven
+    como una sola cadena U10 y se ordena una vez (mucho más rápido que np.unique
+    sobre el array estructurado).
+    """
+    offset = GRO_DTYPE.fields['resname'][1]
+    keys = np.ndarray(len(atoms), dtype='U10', buffer=np.ascontiguousarray(atoms),
+                      offset=offset, strides=(GRO_DTYPE.itemsize,))
+    pairs = []
+    for key in np.unique(keys).tolist():
+        key = key.ljust(10, '\x00')
+        pairs.append((key[:5].rstrip('\x00'), key[5:].rstrip('\x00')))
+    return pairs
@@ -0,0 +1,134 @@
+import os
+import mmap
+import numpy as np
+
+
+class LogIndex:
+    """
+    Acceso por líneas a un archivo de texto grande sin cargarlo en memoria.
+    El archivo se mapea con mmap y se construye un índice con el offset de
+    inicio de cada línea (búsqueda vectorizada de '\\n' con NumPy). Si el archivo
+    crece (mdrun en marcha), refresh() indexa solo la parte nueva.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._file = None
+        self._map = None
+        self.size = 0
+        # Offset de inicio de cada línea; el último elemento es el fin del texto indexado
+        self.starts = np.zeros(1, dtype=np.int64)
+        self.refresh()
+
+    # =========================================================================
+    # ÍNDICE
+    # =========================================================================
+
+    def refresh(self):
+        """
+        Re-mapea el archivo si cambió de tamaño e indexa las líneas nuevas.
+
+        Returns:
+            bool: True si hay líneas nuevas.
+        """
+        if not os.path.exists(self.filepath):
+            return False
+        new_size = os.path.getsize(self.filepath)
+        if new_size == self.size:
+            return False
+        if new_size < self.size:
+            # Archivo truncado o reescrito: índice desde cero
+            self.close()
+            self.size = 0
+            self.starts = np.zeros(1, dtype=np.int64)
+        if new_size == 0:
+            return False
+
+        self.close()
+        self._file = open(self.filepath, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Solo se indexa desde el inicio de la última línea (posiblemente incompleta)
+        old_lines = self.line_count
+        scan_from = int(self.starts[old_lines - 1]) if old_lines else 0
+        chunk = np.frombuffer(self._map, dtype=np.uint8, count=new_size - scan_from, offset=scan_from)
+        newlines = np.flatnonzero(chunk == 10) + scan_from + 1
+
+        head = self.starts[:old_lines] if old_lines else np.zeros(1, dtype=np.int64)
+        starts = np.concatenate([head, newlines[newlines < new_size]])
+        self.starts = np.append(starts, new_size)
+        self.size = new_size
+        return True
+
+    @property
+    def line_count(self):
+        return len(self.starts) - 1
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # =========================================================================
+    # CONSULTA
+    # =========================================================================
+
+    def lines(self, first, count):
+        """Líneas [first, first+count) decodificadas (sin el salto de línea)"""
+        if self._map is None or count <= 0:
+            return []
+        first = max(min(first, self.line_count), 0)
+        last = min(first + count, self.line_count)
+        if last <= first:
+            return []
+        raw = self._map[int(self.starts[first]):int(self.starts[last])]
+        text = raw.decode('utf-8', errors='replace')
+        return text.replace('\r\n', '\n').replace('\r', '\n').split('\n')[:last - first]
+
+    def line_of_offset(self, offset):
+        """Número de línea que contiene el byte offset"""
+        return int(np.searchsorted(self.starts, offset, side='right') - 1)
+
+    def search(self, text, from_line=0, forward=True, case_sensitive=False):
+        """
+        Busca text a partir de from_line (sin incluirla si se busca hacia atrás).
+        La búsqueda sensible a mayúsculas usa mmap.find directamente; la otra
+        recorre el archivo en bloques.
+
+        Returns:
+            int | None: Línea de la siguiente coincidencia.
+        """
+        if self._map is None or not text:
+            return None
+        needle = text.encode('utf-8')
+        start = int(self.starts[max(min(from_line, self.line_count), 0)])
+
+        if case_sensitive:
+            pos = self._map.find(needle, start) if forward else self._map.rfind(needle, 0, start)
+        else:
+            pos = self._find_insensitive(needle.lower(), start, forward)
+        return self.line_of_offset(pos) if pos >= 0 else None
+
+    def _find_insensitive(self, needle, start, forward, block=8 * 1024 * 1024):
+        overlap = len(needle) - 1
+        if forward:
+            pos = start
+            while pos < self.size:
+                chunk = self._map[pos:pos + block + overlap].lower()
+                hit = chunk.find(needle)
+                if hit >= 0:
+                    return pos + hit
+                pos += block
+        else:
+            end = start
+            while end > 0:
+                begin = max(end - block, 0)
+                chunk = self._map[begin:min(end + overlap, start)].lower()
+                hit = chunk.rfind(needle)
+                if hit >= 0:
+                    return begin + hit
+                end = begin
+        return -1
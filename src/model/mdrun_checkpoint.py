@@ -0,0 +1,94 @@
+import os
+import re
+
+from src.model.mdrun_telemetry import read_mdp_timing
+
+
+class MdrunCheckpoint:
+    """
+    Reanudación de gmx mdrun desde su checkpoint (.cpt).
+    mdrun escribe el .cpt cada CHECKPOINT_MINUTES y al recibir SIGTERM/SIGINT,
+    así que "Detener" equivale a pausar: el siguiente lanzamiento continúa con
+    -cpi y añade (-append) a los .log/.edr/.xtc existentes.
+
+    Al detenerse con SIGTERM mdrun también escribe el .gro y sale con código 0,
+    así que la pausa se registra explícitamente con un marcador <paso>.paused
+    (el .gro no distingue un paso pausado de uno terminado).
+    """
+
+    CHECKPOINT_MINUTES = 5
+    MAX_RESTARTS = 3
+    # Sin .cpt, un fallo antes de este tiempo es un error de entrada (ej. TPR
+    # inválido): repetirlo desde el paso 0 volvería a fallar igual
+    FAST_FAIL_SECONDS = 60
+
+    def __init__(self, storage_dir, step_name):
+        self.storage_dir = storage_dir
+        self.step_name = step_name
+
+    def _path(self, ext):
+        return os.path.join(self.storage_dir, f"{self.step_name}.{ext}")
+
+    def has_checkpoint(self):
+        """Hay un .cpt y el paso no terminó (pausado, o caído antes de escribir el .gro)"""
+        if not os.path.exists(self._path("cpt")):
+            return False
+        return self.is_paused() or not os.path.exists(self._path("gro"))
+
+    def is_paused(self):
+        return os.path.exists(self._path("paused"))
+
+    def mark_paused(self):
+        """Registra que el usuario detuvo el paso (solo si hay un .cpt desde el que reanudar)"""
+        if os.path.exists(self._path("cpt")):
+            with open(self._path("paused"), 'w') as f:
+                f.write("paused\n")
+
+    def clear_paused(self):
+        """El paso terminó completo: el .gro ya es el final"""
+        if os.path.exists(self._path("paused")):
+            os.remove(self._path("paused"))
+
+    def should_restart(self, run_seconds):
+        """Tras un fallo no pedido: reintentar si hay .cpt o si mdrun llegó a avanzar"""
+        return self.has_checkpoint() or run_seconds >= self.FAST_FAIL_SECONDS
+
+    def mdrun_args(self):
+        """Argumentos de checkpoint para mdrun (-cpt siempre; -cpi/-append si hay que reanudar)"""
+        args = ["-cpt", str(self.CHECKPOINT_MINUTES)]
+        if self.has_checkpoint():
+            args += ["-cpi", f"{self.step_name}.cpt"]
+            # -append exige los archivos de salida previos; si faltan se empiezan partes nuevas
+            args.append("-append" if os.path.exists(self._path("log")) else "-noappend")
+        return args
+
+    def target_steps(self):
+        """nsteps del .mdp del paso (None si no se puede leer)"""
+        return read_mdp_timing(self._path("mdp"))[1]
+
+    def last_logged_step(self):
+        """
+        Último paso registrado en el .log de mdrun (bloques 'Step Time' de energías).
+        Solo se lee la cola del archivo.
+        """
+        log = self._path("log")
+        if not os.path.exists(log):
+            return None
+        with open(log, 'r', errors='replace') as f:
+            f.seek(max(os.path.getsize(log) - 65536, 0))
+            tail = f.read()
+        steps = re.findall(r"^\s+Step\s+Time\s*\n\s+(\d+)\s+[\d.eE+-]+", tail, flags=re.MULTILINE)
+        return int(steps[-1]) if steps else None
+
+    def progress(self):
+        """Fracción completada (0-1) según el .log y el nsteps del .mdp, o None"""
+        step = self.last_logged_step()
+        total = self.target_steps()
+        if step is None or not total or total < 0:
+            return None
+        return min(step / total, 1.0)
+
+    def status_text(self):
+        """Texto de estado para un paso pausado: 'Pausado (42%)'"""
+        frac = self.progress()
+        return f"Pausado ({frac * 100:.0f}%)" if frac is not None else "Pausado"
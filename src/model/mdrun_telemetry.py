@@ -0,0 +1,197 @@
+import os
+import re
+import time
+import datetime
+import numpy as np
+
+
+class MdrunTelemetry:
+    """
+    Convierte la salida de 'gmx mdrun -v' en registros de rendimiento.
+    Se llama línea a línea desde el hilo del worker (no desde la interfaz) y
+    devuelve un registro solo cuando avanza el paso y pasó min_interval desde
+    el anterior. Cada registro se añade al .csv de telemetría del paso, con una
+    columna 'run' para comparar ejecuciones (ej. un nodo un 30% más lento).
+    """
+
+    COLUMNS = ['run', 'wall_s', 'step', 'time_ps', 'ns_per_day', 'hours_per_ns', 'eta_s']
+
+    # 'step 12300, remaining wall clock time:   345 s' / 'step 12300, will finish Tue Oct 18 12:00:00 2026'
+    _STEP_RE = re.compile(r"\bstep\s+(\d+)")
+    _REMAINING_RE = re.compile(r"remaining wall clock time:\s*([\d.]+)\s*s")
+    _FINISH_RE = re.compile(r"will finish\s+(\w{3}\s+\w{3}\s+\d+\s+[\d:]+\s+\d{4})")
+
+    def __init__(self, csv_path=None, dt_ps=None, nsteps=None, run_id=None, min_interval=1.0):
+        """
+        Args:
+            csv_path (str, opcional): Archivo de telemetría (se añade al final).
+            dt_ps (float, opcional): Paso de integración, para tiempo simulado y ns/día.
+            nsteps (int, opcional): Pasos totales, para el ETA si mdrun no lo imprime.
+            run_id (str, opcional): Identificador de la ejecución (por defecto, fecha y hora).
+        """
+        self.csv_path = csv_path
+        self.dt_ps = dt_ps
+        self.nsteps = nsteps
+        self.run_id = run_id or datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.min_interval = min_interval
+
+        self._first = None      # (wall, step) del primer paso visto: excluye el arranque
+        self._last_emit = 0.0
+        self._last_step = None
+        self._file = None
+
+    @classmethod
+    def for_step(cls, storage_dir, step_name, **kwargs):
+        """Telemetría de un paso: dt y nsteps del .mdp, csv en <paso>_telemetry.csv"""
+        dt_ps, nsteps = read_mdp_timing(os.path.join(storage_dir, f"{step_name}.mdp"))
+        csv_path = os.path.join(storage_dir, f"{step_name}_telemetry.csv")
+        return cls(csv_path, dt_ps, nsteps, **kwargs)
+
+    # =========================================================================
+    # PARSEO
+    # =========================================================================
+
+    def __call__(self, line):
+        return self.feed(line)
+
+    def feed(self, line):
+        """
+        Procesa una línea de salida.
+
+        Returns:
+            dict | None: {'step', 'time_ps', 'ns_per_day', 'hours_per_ns', 'eta_s', 'wall_s'}
+        """
+        if 'step' not in line:
+            return None
+        match = self._STEP_RE.search(line)
+        if not match:
+            return None
+
+        step = int(match.group(1))
+        now = time.monotonic()
+        if self._first is None:
+            self._first = (now, step)
+        if step == self._last_step or now - self._last_emit < self.min_interval:
+            return None
+
+        record = self._record(line, step, now)
+        self._last_emit = now
+        self._last_step = step
+        self._store(record)
+        return record
+
+    def _record(self, line, step, now):
+        t0, step0 = self._first
+        elapsed = now - t0
+        steps_per_s = (step - step0) / elapsed if elapsed > 0 and step > step0 else None
+
+        ns_per_day = hours_per_ns = None
+        if steps_per_s and self.dt_ps:
+            ns_per_day = steps_per_s * self.dt_ps * 86400.0 / 1000.0
+            hours_per_ns = 24.0 / ns_per_day
+
+        eta = None
+        remaining = self._REMAINING_RE.search(line)
+        finish = self._FINISH_RE.search(line)
+        if remaining:
+            eta = float(remaining.group(1))
+        elif finish:
+            try:
+                end = datetime.datetime.strptime(finish.group(1), "%a %b %d %H:%M:%S %Y")
+                eta = max((end - datetime.datetime.now()).total_seconds(), 0.0)
+            except ValueError:
+                eta = None
+        elif steps_per_s and self.nsteps and self.nsteps > 0:
+            eta = max(self.nsteps - step, 0) / steps_per_s
+
+        return {
+            'wall_s': round(time.time(), 1),
+            'step': step,
+            'time_ps': step * self.dt_ps if self.dt_ps else None,
+            'ns_per_day': ns_per_day,
+            'hours_per_ns': hours_per_ns,
+            'eta_s': eta,
+        }
+
+    # =========================================================================
+    # ALMACENAMIENTO
+    # =========================================================================
+
+    def _store(self, record):
+        if not self.csv_path:
+            return
+        try:
+            if self._file is None:
+                new = not os.path.exists(self.csv_path)
+                self._file = open(self.csv_path, 'a')
+                if new:
+                    self._file.write(",".join(self.COLUMNS) + "\n")
+            values = [self.run_id] + ["" if record[c] is None else f"{record[c]:.6g}"
+                                      for c in self.COLUMNS[1:]]
+            self._file.write(",".join(values) + "\n")
+            self._file.flush()
+        except Exception as e:
+            print(f"Error guardando telemetría: {e}")
+            self.csv_path = None
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def read_mdp_timing(mdp_file):
+    """(dt [ps], nsteps) de un .mdp; None en lo que no se encuentre"""
+    if not os.path.exists(mdp_file):
+        return None, None
+    with open(mdp_file, 'r') as f:
+        content = f.read()
+    dt = re.search(r"^\s*dt\s*=\s*([\d.eE+-]+)", content, flags=re.MULTILINE)
+    nsteps = re.search(r"^\s*nsteps\s*=\s*(-?\d+)", content, flags=re.MULTILINE)
+    return (float(dt.group(1)) if dt else None,
+            int(nsteps.group(1)) if nsteps else None)
+
+
+def load_telemetry(csv_path):
+    """
+    Lee el .csv de telemetría de un paso.
+
+    Returns:
+        dict: {run_id: {columna: np.ndarray}} (NaN donde no hubo dato).
+    """
+    runs = {}
+    if not os.path.exists(csv_path):
+        return runs
+    with open(csv_path, 'r') as f:
+        header = f.readline().strip().split(",")
+        rows = [line.rstrip("\n").split(",") for line in f if line.strip()]
+    for row in rows:
+        runs.setdefault(row[0], []).append([float(v) if v else np.nan for v in row[1:]])
+    return {run: dict(zip(header[1:], np.array(values, dtype=np.float64).T))
+            for run, values in runs.items()}
+
+
+def run_performance(csv_path):
+    """Mediana de ns/día de cada ejecución registrada: {run_id: ns_dia}"""
+    result = {}
+    for run, cols in load_telemetry(csv_path).items():
+        perf = cols['ns_per_day'][np.isfinite(cols['ns_per_day'])]
+        if len(perf):
+            result[run] = float(np.median(perf))
+    return result
+
+
+def performance_regression(csv_path, run_id, threshold=0.3):
+    """
+    Compara la ejecución run_id con la mejor anterior.
+
+    Returns:
+        float | None: Pérdida relativa (ej. 0.35 = 35% más lenta) si supera el umbral.
+    """
+    perf = run_performance(csv_path)
+    current = perf.pop(run_id, None)
+    if current is None or not perf:
+        return None
+    best = max(perf.values())
+    loss = 1.0 - current / best
+    return loss if loss >= threshold else None
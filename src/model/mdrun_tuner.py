@@ -0,0 +1,91 @@
+import os
+import re
+
+
+class MdrunTuner:
+    """
+    Auto-ajuste de la distribución de hilos de gmx mdrun.
+    Genera las distribuciones candidatas (-ntmpi / -ntomp / -npme) para los
+    núcleos disponibles, arma los comandos de prueba cortos (-nsteps con
+    -resethway para descartar el arranque) y lee ns/día del .log de cada prueba.
+    """
+
+    TRIAL_DIR = "mdrun_tuning"
+    DEFAULT_TRIAL_STEPS = 4000
+    MAX_OMP_THREADS = 16
+
+    def candidate_layouts(self, n_cores):
+        """
+        Distribuciones a probar: ntmpi * ntomp = n_cores. Con 4 o más rangos
+        se prueba también dedicar rangos a PME.
+
+        Returns:
+            list: [{'ntmpi': int, 'ntomp': int, 'npme': int}] (npme -1 = automático).
+        """
+        n_cores = max(int(n_cores), 1)
+        layouts = []
+        for ntmpi in range(1, n_cores + 1):
+            if n_cores % ntmpi:
+                continue
+            ntomp = n_cores // ntmpi
+            # Muchos hilos OpenMP por rango escalan mal; pocos por rango no compensan la DD
+            if ntomp > self.MAX_OMP_THREADS or (ntmpi > 1 and ntomp == 1 and n_cores > 8):
+                continue
+            layouts.append({'ntmpi': ntmpi, 'ntomp': ntomp, 'npme': -1})
+            if ntmpi >= 4:
+                layouts.append({'ntmpi': ntmpi, 'ntomp': ntomp, 'npme': ntmpi // 4})
+        return layouts or [{'ntmpi': 1, 'ntomp': n_cores, 'npme': -1}]
+
+    def layout_args(self, layout):
+        """Argumentos de mdrun para una distribución"""
+        args = ["-ntmpi", str(layout['ntmpi']), "-ntomp", str(layout['ntomp'])]
+        if layout.get('npme', -1) >= 0 and layout['ntmpi'] > 1:
+            args += ["-npme", str(layout['npme'])]
+        return args
+
+    def trial_command(self, tpr_file, trial_name, layout, nsteps=DEFAULT_TRIAL_STEPS):
+        """
+        Comando de una prueba. Se ejecuta dentro de TRIAL_DIR para no pisar
+        los archivos del paso real; -noconfout evita escribir el .gro final.
+        """
+        return (["gmx", "mdrun", "-s", tpr_file, "-deffnm", trial_name,
+                 "-nsteps", str(int(nsteps)), "-resethway", "-noconfout", "-pin", "on"]
+                + self.layout_args(layout))
+
+    def trial_dir(self, storage_dir):
+        path = os.path.join(storage_dir, self.TRIAL_DIR)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def parse_performance(self, log_file):
+        """
+        Lee la línea final 'Performance:' del .log de mdrun.
+
+        Returns:
+            float | None: ns/día, o None si la prueba no terminó.
+        """
+        if not os.path.exists(log_file):
+            return None
+        try:
+            with open(log_file, 'r', errors='replace') as f:
+                # La línea está al final: basta con leer la cola del archivo
+                f.seek(max(os.path.getsize(log_file) - 8192, 0))
+                tail = f.read()
+        except Exception as e:
+            print(f"Error leyendo log de prueba: {e}")
+            return None
+        match = re.search(r"^Performance:\s+([\d.]+)", tail, flags=re.MULTILINE)
+        return float(match.group(1)) if match else None
+
+    def best_layout(self, results):
+        """
+        Args:
+            results (list): [(layout, ns_dia o None)].
+
+        Returns:
+            tuple: (layout, ns_dia) de la prueba más rápida, o (None, None).
+        """
+        valid = [(layout, perf) for layout, perf in results if perf]
+        if not valid:
+            return None, None
+        return max(valid, key=lambda item: item[1])
@@ -1,6 +1,9 @@
 import os
 import math
 import graphviz
+import numpy as np
+
+from src.model.gro_reader import GroReader
 
 class MoleculeGraphGenerator:
     def __init__(self):
@@ -15,6 +18,8 @@ class MoleculeGraphGenerator:
             'C': '#909090', 'O': 'red', 'N': 'blue', 'H': 'white', 
             'S': 'yellow', 'P': 'orange', 'F': 'green', 'CL': 'green'
         }
+        # Lector vectorizado de .gro
+        self.gro_reader = GroReader()
 
     def get_element_from_name(self, atom_name):
         """Intenta deducir el elemento (C, O, N...) del nombre (CA, OW, H1)"""
@@ -33,46 +38,23 @@ class MoleculeGraphGenerator:
         Lee el GRO y extrae átomos y coordenadas de la PRIMERA ocurrencia del residuo.
         Retorna: lista de dicts [{'name': 'C1', 'x': 1.0, 'y': 2.0, 'z': 3.0, 'elem': 'C'}, ...]
         """
-        atoms = []
-        found_residue = False
-        target_res_id = None
+        gro = self.gro_reader.read(gro_file)
+        atoms = gro['atoms']
+        starts = gro['res_starts']
 
-        with open(gro_file, 'r') as f:
-            lines = f.readlines()
+        # Primer residuo con ese nombre (usando los bordes de residuo precalculados)
+        matches = np.flatnonzero(atoms['resname'][starts[:-1]] == target_res_name)
+        if len(matches) == 0:
+            return []
+        first = matches[0]
+        residue = atoms[starts[first]:starts[first + 1]]
 
-        # Omitir cabecera (2 líneas) y caja (última)
-        for line in lines[2:-1]:
-            try:
-                # GRO Fixed format
-                # Residue Number (0-5)
-                res_num = line[0:5].strip()
-                res_name = line[5:10].strip()
-                atom_name = line[10:15].strip()
-                # Coordenadas (nm)
-                x = float(line[20:28]) * 10.0 # Convertir a Angstroms
-                y = float(line[28:36]) * 10.0
-                z = float(line[36:44]) * 10.0
-                
-                if res_name == target_res_name:
-                    if target_res_id is None:
-                        target_res_id = res_num # Fijar el ID de la primera molécula encontrada
-                    
-                    if res_num == target_res_id:
-                        atoms.append({
-                            'name': atom_name,
-                            'x': x, 'y': y, 'z': z,
-                            'elem': self.get_element_from_name(atom_name)
-                        })
-                        found_residue = True
-                    else:
-                        # Si ya cambiamos de número de residuo, terminamos (solo queremos 1 molécula)
-                        break
-                elif found_residue:
-                    break # Ya pasamos el bloque
-            except ValueError:
-                continue
-                
-        return atoms
+        # Coordenadas en Angstroms
+        coords = residue['xyz'].astype(np.float64) * 10.0
+        return [
+            {'name': name, 'x': x, 'y': y, 'z': z, 'elem': self.get_element_from_name(name)}
+            for name, (x, y, z) in zip(residue['atomname'].tolist(), coords.tolist())
+        ]
 
     def generate_image(self, gro_file, res_name, output_path):
         """
@@ -0,0 +1,373 @@
+import re
+import numpy as np
+
+
+# Residuos considerados agua por GROMACS (grupo 'Water' / 'SOL')
+WATER_RESNAMES = {'SOL', 'WAT', 'HOH', 'TIP3', 'TIP4', 'TIP5', 'SPC', 'SPCE', 'T3P', 'T4P'}
+ION_RESNAMES = {'NA', 'CL', 'K', 'MG', 'CA', 'ZN', 'NA+', 'CL-', 'SOD', 'CLA', 'POT'}
+
+
+# =============================================================================
+# LECTURA / ESCRITURA DE ARCHIVOS .NDX
+# =============================================================================
+
+def read_ndx(ndx_file):
+    """
+    Lee un index.ndx.
+
+    Returns:
+        list: Pares (nombre_grupo, np.ndarray de índices de átomo base 0) en el orden
+              del archivo, conservando nombres repetidos: la posición es el ID numérico
+              que usan gmx rdf / trjconv.
+    """
+    with open(ndx_file, 'r') as f:
+        text = f.read()
+
+    # Cada sección: [ nombre ] seguida de números hasta la siguiente cabecera
+    groups = []
+    parts = re.split(r'^\s*\[\s*(.*?)\s*\]\s*$', text, flags=re.MULTILINE)
+    for name, body in zip(parts[1::2], parts[2::2]):
+        numbers = np.array(body.split(), dtype=np.int64) if body.strip() else np.empty(0, dtype=np.int64)
+        groups.append((name, numbers - 1))
+    return groups
+
+
+def ndx_group_names(ndx_file):
+    """Nombres de los grupos en el orden del archivo (incluye repetidos)"""
+    with open(ndx_file, 'r') as f:
+        return re.findall(r'^\s*\[\s*(.*?)\s*\]\s*$', f.read(), flags=re.MULTILINE)
+
+
+def write_ndx(ndx_file, groups):
+    """
+    Escribe los grupos (índices base 0) con el formato de GROMACS: 15 números por línea.
+
+    Args:
+        groups (list | dict): Pares (nombre, índices) en orden, o un dict.
+    """
+    items = groups.items() if isinstance(groups, dict) else groups
+    with open(ndx_file, 'w') as f:
+        for name, atoms in items:
+            f.write(f"[ {name} ]\n")
+            numbers = (np.asarray(atoms, dtype=np.int64) + 1).tolist()
+            full = len(numbers) - len(numbers) % 15
+            row_fmt = "%4d " * 15 + "\n"
+            f.write("".join(row_fmt % tuple(numbers[i:i + 15]) for i in range(0, full, 15)))
+            if full < len(numbers):
+                tail = numbers[full:]
+                f.write("%4d " * len(tail) % tuple(tail) + "\n")
+            f.write("\n")
+
+
+def find_group(groups, name):
+    """Posición (ID) del primer grupo con ese nombre, como al escribirlo en gmx; None si no existe"""
+    for i, (group_name, _) in enumerate(groups):
+        if group_name == name:
+            return i
+    return None
+
+
+def set_group(groups, name, atoms):
+    """Reemplaza en su sitio el primer grupo con ese nombre (sin desplazar IDs) o lo añade al final"""
+    i = find_group(groups, name)
+    if i is None:
+        groups.append((name, atoms))
+    else:
+        groups[i] = (name, atoms)
+
+
+def default_groups(atoms):
+    """
+    Grupos por defecto en el mismo orden y con los mismos nombres que make_ndx
+    (sistemas no proteicos), para que los IDs coincidan con los de GROMACS.
+    Los tipos de residuo se recorren en orden de aparición:
+        Other -> 'Other' + un grupo por nombre de residuo no acuoso (incluye iones)
+        Water -> 'Water', 'SOL' (mismos átomos) y 'non-Water'
+        Ion   -> 'Ion' + de nuevo un grupo por residuo no acuoso, y
+                 'Water_and_ions' si ya existe el grupo Water
+    Los nombres repetidos (ej. 'CL' en Other e Ion) se conservan, igual que en make_ndx.
+
+    Args:
+        atoms: Array estructurado de GroReader (campos 'resname', 'atomname').
+
+    Returns:
+        list: Pares (nombre, índices base 0).
+    """
+    n = len(atoms)
+    resnames = atoms['resname']
+    groups = [('System', np.arange(n, dtype=np.int64))]
+
+    is_water = np.isin(resnames, list(WATER_RESNAMES))
+    is_ion = np.isin(np.char.upper(resnames), list(ION_RESNAMES)) & ~is_water
+    restype = np.where(is_water, 'Water', np.where(is_ion, 'Ion', 'Other'))
+
+    # Tipos y nombres de residuo (no acuosos) en orden de aparición
+    _, first = np.unique(restype, return_index=True)
+    ordered_types = [restype[i] for i in np.sort(first)]
+    non_water = np.flatnonzero(~is_water)
+    _, first = np.unique(resnames[non_water], return_index=True)
+    other_resnames = [str(resnames[non_water[i]]) for i in np.sort(first)]
+
+    def add_per_residue():
+        for res in other_resnames:
+            groups.append((res, np.flatnonzero((resnames == res) & ~is_water)))
+
+    for rtype in ordered_types:
+        if rtype == 'Water':
+            water = np.flatnonzero(is_water)
+            groups.append(('Water', water))
+            groups.append(('SOL', water))
+            if len(water) < n:
+                groups.append(('non-Water', non_water))
+        elif rtype == 'Ion':
+            groups.append(('Ion', np.flatnonzero(is_ion)))
+            add_per_residue()
+            if find_group(groups, 'Water') is not None:
+                groups.append(('Water_and_ions', np.flatnonzero(is_water | is_ion)))
+        else:
+            groups.append(('Other', np.flatnonzero(restype == 'Other')))
+            add_per_residue()
+    return groups
+
+
+# =============================================================================
+# MOTOR DE SELECCIÓN
+# =============================================================================
+
+class SelectionEngine:
+    """
+    Evaluador de selecciones sobre el array de estructura (GroReader).
+    Cada término produce una máscara booleana sobre todos los átomos y los
+    operadores combinan máscaras, así que crear un grupo no lanza procesos.
+
+    Sintaxis (mayúsculas/minúsculas indiferentes en las palabras clave):
+        resname CBD PEN        nombres de residuo, admite '*' final
+        name OW HW*            nombres de átomo, admite '*' final
+        index 1-100 205        (alias: atomnr) números de átomo (base 1, como en .gro/.ndx)
+        resid 1-50             (alias: resnr)  números de residuo
+        r CBD / r 1-50         como make_ndx: nombres de residuo, o números si son numéricos
+        a OW / a 1-100         como make_ndx: nombres de átomo, o números si son numéricos
+        group NOMBRE           grupo existente del .ndx
+        3 / SOL / "SOL"        como make_ndx: grupo por número o por nombre
+        all
+        and / &   or / |   not / !   ( )
+    """
+
+    KEYWORDS = {
+        'resname': 'resname', 'r': 'residue',
+        'name': 'name', 'a': 'atom', 'atomname': 'name',
+        'index': 'index', 'atomnr': 'index',
+        'resid': 'resid', 'resnr': 'resid',
+        'group': 'group',
+    }
+    # Argumento numérico de 'r' / 'a' en make_ndx: número o rango ('1-4')
+    NUMERIC = re.compile(r'^\d+(-\d+)?$')
+    OPERATORS = {'and', '&', 'or', '|', 'not', '!', '(', ')'}
+
+    def __init__(self, atoms, groups=None):
+        """
+        Args:
+            atoms: Array estructurado de GroReader.
+            groups (list | dict, opcional): Grupos existentes, pares (nombre, índices
+                base 0) en orden del .ndx (o un dict).
+        """
+        self.atoms = atoms
+        self.groups = list(groups.items()) if isinstance(groups, dict) else list(groups or [])
+        self.n_atoms = len(atoms)
+
+    def select(self, expression):
+        """
+        Evalúa una selección.
+
+        Returns:
+            np.ndarray: Índices de átomo base 0 (ordenados).
+        """
+        tokens = self._tokenize(expression)
+        if not tokens:
+            raise ValueError("Selección vacía.")
+        if len(tokens) == 3 and tokens[0].lower() == 'name' and tokens[1].isdigit():
+            # 'name 3 Foo' en make_ndx renombra el grupo 3, no selecciona átomos
+            raise ValueError("'name N nombre' es una orden de make_ndx, no una selección.")
+        self._tokens = tokens
+        self._pos = 0
+        mask = self._parse_or()
+        if self._pos != len(tokens):
+            raise ValueError(f"Token inesperado: '{tokens[self._pos]}'")
+        return np.flatnonzero(mask)
+
+    # --- Análisis sintáctico (descenso recursivo) ---
+
+    def _tokenize(self, expression):
+        spaced = re.sub(r'([()&|!])', r' \1 ', expression)
+        return spaced.split()
+
+    def _peek(self):
+        return self._tokens[self._pos].lower() if self._pos < len(self._tokens) else None
+
+    def _next(self):
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def _parse_or(self):
+        mask = self._parse_and()
+        while self._peek() in ('or', '|'):
+            self._next()
+            mask = mask | self._parse_and()
+        return mask
+
+    def _parse_and(self):
+        mask = self._parse_not()
+        while self._peek() in ('and', '&'):
+            self._next()
+            mask = mask & self._parse_not()
+        return mask
+
+    def _parse_not(self):
+        if self._peek() in ('not', '!'):
+            self._next()
+            return ~self._parse_not()
+        return self._parse_primary()
+
+    def _parse_primary(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError("Selección incompleta.")
+        if token == '(':
+            self._next()
+            mask = self._parse_or()
+            if self._peek() != ')':
+                raise ValueError("Falta ')' en la selección.")
+            self._next()
+            return mask
+        if token == 'all':
+            self._next()
+            return np.ones(self.n_atoms, dtype=bool)
+
+        keyword = self.KEYWORDS.get(token)
+        if keyword is None:
+            # make_ndx: un grupo existente se escribe con su número o su nombre
+            group = self.resolve_group(self._tokens[self._pos])
+            if group is None:
+                raise ValueError(f"Palabra clave desconocida: '{self._tokens[self._pos]}'")
+            self._next()
+            mask = np.zeros(self.n_atoms, dtype=bool)
+            mask[self.groups[group][1]] = True
+            return mask
+        self._next()
+
+        values = []
+        while self._peek() is not None and self._peek() not in self.OPERATORS:
+            values.append(self._next())
+        if not values:
+            raise ValueError(f"'{token}' necesita al menos un valor.")
+
+        if keyword == 'resname':
+            return self._match_names(self.atoms['resname'], values)
+        if keyword == 'name':
+            return self._match_names(self.atoms['atomname'], values)
+        if keyword == 'index':
+            return self._match_ranges(np.arange(1, self.n_atoms + 1), values)
+        if keyword == 'resid':
+            return self._match_ranges(self.atoms['resid'], values)
+        if keyword == 'residue':
+            return self._match_names_or_numbers(self.atoms['resname'], self.atoms['resid'], values)
+        if keyword == 'atom':
+            return self._match_names_or_numbers(self.atoms['atomname'], np.arange(1, self.n_atoms + 1), values)
+        return self._match_groups(values)
+
+    def resolve_group(self, token):
+        """Posición del grupo escrito como número ('2') o nombre ('SOL', '"SOL"'), o None"""
+        name = token.strip('"')
+        i = find_group(self.groups, name)
+        if i is None and name.isdigit() and int(name) < len(self.groups):
+            i = int(name)
+        return i
+
+    # --- Términos ---
+
+    def _match_names(self, column, patterns):
+        mask = np.zeros(self.n_atoms, dtype=bool)
+        for pattern in patterns:
+            if pattern.endswith('*'):
+                mask |= np.char.startswith(column, pattern[:-1])
+            else:
+                mask |= column == pattern
+        return mask
+
+    def _match_names_or_numbers(self, names, numbers, values):
+        """Argumentos de 'r' / 'a': los numéricos son números o rangos, el resto nombres"""
+        text = " ".join(values).replace(' to ', '-')
+        items = re.sub(r'(\d)\s*-\s*(\d)', r'\1-\2', text).split()
+        numeric = [item for item in items if self.NUMERIC.match(item)]
+        mask = self._match_names(names, [item for item in items if not self.NUMERIC.match(item)])
+        if numeric:
+            mask |= self._match_ranges(numbers, numeric)
+        return mask
+
+    def _match_ranges(self, column, values):
+        mask = np.zeros(self.n_atoms, dtype=bool)
+        # Admite '1-100', '1 - 100' y '1 to 100'
+        text = " ".join(values).replace(' to ', '-')
+        text = re.sub(r'\s*-\s*', '-', text)
+        for item in text.split():
+            if '-' in item[1:]:
+                lo, hi = item.split('-', 1)
+                mask |= (column >= int(lo)) & (column <= int(hi))
+            else:
+                mask |= column == int(item)
+        return mask
+
+    def _match_groups(self, names):
+        mask = np.zeros(self.n_atoms, dtype=bool)
+        for name in names:
+            i = self.resolve_group(name)
+            if i is not None:
+                mask[self.groups[i][1]] = True
+            else:
+                raise ValueError(f"Grupo '{name}' no existe.")
+        return mask
+
+
+def selection_group_name(expression, groups=None):
+    """
+    Nombre del grupo creado, como lo haría make_ndx:
+    'r CBD' -> 'CBD', 'a OW' -> 'OW', 'r 1-2' -> 'r_1-2', '1 | 12' -> 'Protein_NA+',
+    '2 & a O*' -> 'Protein_&_O*', '! a H*' -> '!H*'.
+
+    Args:
+        groups (list, opcional): Grupos del .ndx para nombrar los grupos escritos por número.
+    """
+    tokens = re.sub(r'([()&|!])', r' \1 ', expression).split()
+    engine = SelectionEngine(np.zeros(0), groups)
+    words = []
+    negate = ""
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        low = token.lower()
+        i += 1
+        if low in ('(', ')', 'or', '|'):
+            continue
+        if low in ('not', '!'):
+            negate += "!"
+            continue
+        if low in ('and', '&'):
+            words.append("&")
+            continue
+        if low in SelectionEngine.KEYWORDS:
+            values = []
+            while i < len(tokens) and tokens[i].lower() not in SelectionEngine.OPERATORS:
+                values.append(tokens[i])
+                i += 1
+            values = re.sub(r'(\d)\s*-\s*(\d)', r'\1-\2', " ".join(values)).split()
+            text = "_".join(values)
+            if low in ('r', 'a') and values and all(SelectionEngine.NUMERIC.match(v) for v in values):
+                text = f"{low}_{text}"
+            word = text
+        else:
+            group = engine.resolve_group(token)
+            word = engine.groups[group][0] if group is not None else token.strip('"')
+        words.append(negate + word)
+        negate = ""
+    return "_".join(words)
\ No newline at end of file
@@ -0,0 +1,77 @@
+import os
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from src.model.xtc_reader import XtcReader
+
+
+class FrameBlockRunner:
+    """
+    Reparte el análisis por frames de una trayectoria .xtc en bloques contiguos
+    y los ejecuta en un ProcessPoolExecutor. Cada bloque devuelve un resultado
+    parcial (ej. histogramas) que el llamador reduce sumando.
+
+    La función de bloque debe ser de nivel de módulo (picklable) con la firma:
+        block_fn(traj_file, frame_indices, index_dir, *args) -> parcial
+    """
+
+    def __init__(self, n_workers=None, index_dir=None):
+        """
+        Args:
+            n_workers (int, opcional): Procesos a usar. None = todos los núcleos.
+            index_dir (str, opcional): Carpeta del índice de offsets del .xtc.
+        """
+        self.n_workers = max(int(n_workers or default_workers()), 1)
+        self.index_dir = index_dir
+
+    def frame_indices(self, traj_file, begin=None, end=None, stride=1):
+        """
+        Índices de frames a analizar. Abrir el lector aquí construye y guarda el
+        índice de offsets una sola vez, antes de lanzar los procesos hijos.
+        """
+        reader = XtcReader(traj_file, index_dir=self.index_dir)
+        return reader.frame_indices(begin, end, stride)
+
+    def run(self, block_fn, traj_file, indices, *args):
+        """
+        Ejecuta block_fn sobre cada bloque de frames.
+
+        Returns:
+            list: Resultados parciales en el orden de los bloques.
+        """
+        blocks = split_frame_blocks(indices, self.n_workers)
+        if self.n_workers == 1 or len(blocks) <= 1:
+            return [block_fn(traj_file, block, self.index_dir, *args) for block in blocks]
+
+        with ProcessPoolExecutor(max_workers=min(self.n_workers, len(blocks)), mp_context=pool_context()) as pool:
+            futures = [pool.submit(block_fn, traj_file, block, self.index_dir, *args) for block in blocks]
+            return [fut.result() for fut in futures]
+
+
+def pool_context():
+    """
+    Contexto de multiprocessing para los procesos hijos. Los bloques se lanzan
+    desde hilos de trabajo de la aplicación (FunctionJob, lote de solubilidad);
+    hacer fork de un proceso con varios hilos puede dejar a los hijos bloqueados
+    en un candado copiado, así que se usa 'forkserver' (o 'spawn' si no existe).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def default_workers():
+    """Número de procesos por defecto (todos los núcleos disponibles)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def split_frame_blocks(indices, n_blocks):
+    """Divide los índices de frames en n_blocks bloques contiguos (sin bloques vacíos)"""
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(indices) == 0:
+        return []
+    n_blocks = max(min(int(n_blocks), len(indices)), 1)
+    return [block for block in np.array_split(indices, n_blocks) if len(block)]
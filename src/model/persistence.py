@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import threading
+
+
+def atomic_write_json(path, data, indent=4):
+    """
+    Escribe JSON de forma atómica: archivo temporal en la misma carpeta y
+    os.replace, así un cierre inesperado nunca deja un project_db.json a medias.
+    Mismo formato que el resto del proyecto (indent=4).
+    """
+    tmp = f"{path}.tmp"
+    text = json.dumps(data, indent=indent)
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class DebouncedJsonWriter:
+    """
+    Escritura diferida (write-behind) de un documento JSON.
+    schedule() solo marca el estado como pendiente; un hilo de fondo escribe
+    cuando pasan 'delay' segundos sin nuevos cambios, de modo que una ráfaga
+    de guardados (ej. cambiar de pestaña) cuesta una sola escritura.
+
+    schedule() toma la instantánea en el hilo que llama (json.dumps compacto,
+    codificador en C): el hilo de fondo nunca toca el diccionario vivo que la
+    interfaz sigue modificando. El formateo con indent=4 y la escritura sí
+    ocurren en el hilo de fondo, una vez por ráfaga.
+    """
+
+    DEFAULT_DELAY = 0.5
+
+    def __init__(self, delay=DEFAULT_DELAY):
+        self.delay = delay
+        self._cond = threading.Condition()
+        # Orden de escritura: nadie toma el pendiente sin tener este candado
+        self._io_lock = threading.Lock()
+        self._pending = None        # (ruta, JSON compacto)
+        self._deadline = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="json-writer", daemon=True)
+        self._thread.start()
+
+    def schedule(self, path, data):
+        """Marca 'data' para escribirse en 'path' (reemplaza cualquier pendiente)"""
+        try:
+            snapshot = json.dumps(data)
+        except (TypeError, ValueError) as e:
+            print(f"Error guardando {os.path.basename(path)}: {e}")
+            return
+        with self._cond:
+            self._pending = (path, snapshot)
+            self._deadline = time.monotonic() + self.delay
+            self._cond.notify()
+
+    def has_pending(self):
+        with self._cond:
+            return self._pending is not None
+
+    def flush(self):
+        """Escribe ya lo pendiente, en el hilo que llama (ej. al cerrar la aplicación)"""
+        with self._io_lock:
+            with self._cond:
+                item, self._pending = self._pending, None
+            if item:
+                self._write(item)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    # =========================================================================
+    # HILO DE FONDO
+    # =========================================================================
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Esperar a que pase 'delay' sin cambios nuevos (el plazo se alarga con cada schedule)
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+            with self._io_lock:
+                with self._cond:
+                    item, self._pending = self._pending, None
+                if item:
+                    self._write(item)
+
+    def _write(self, item):
+        path, snapshot = item
+        try:
+            atomic_write_json(path, json.loads(snapshot))
+        except Exception as e:
+            print(f"Error guardando {os.path.basename(path)}: {e}")
@@ -4,11 +4,23 @@ import json
 import copy
 from datetime import datetime
 
+from src.model.persistence import DebouncedJsonWriter
+from src.model.project_store import SqliteProjectStore, migrate_json_project
+
 class ProjectManager:
     def __init__(self):
         self.current_project_path = None
         self.active_system_name = None 
         self.project_data = {}
+        # Guardado diferido de project_db.json (varios save_db seguidos = una escritura)
+        self.writer = DebouncedJsonWriter()
+        # Backend SQLite opcional (project_db.sqlite). Con él, project_data["systems"]
+        # se llena de forma perezosa: None = estado aún no leído de la base de datos.
+        self.store = None
+        self._dirty_states = set()      # (sistema, clave) pendientes de escribir
+        self._dirty_globals = set()
+        self._new_systems = []
+        self._deleted_systems = []
         
         # Gestión de Configuración Global (Recientes)
         # Se guardará en la carpeta config/ o en la raíz
@@ -72,6 +84,8 @@ class ProjectManager:
     # =========================================================================
 
     def create_project(self, name, root_path):
+        self.flush()
+        self._close_store()
         self.current_project_path = os.path.join(root_path, name)
         try:
             os.makedirs(os.path.join(self.current_project_path, "storage"), exist_ok=True)
@@ -97,6 +111,12 @@ class ProjectManager:
             return False, str(e)
 
     def load_project_from_path(self, full_path):
+        # Lo pendiente del proyecto anterior se escribe antes de cambiar
+        self.flush()
+        self._close_store()
+        if SqliteProjectStore.exists_in(full_path):
+            return self._load_sqlite_project(full_path)
+
         db_path = os.path.join(full_path, "project_db.json")
         if not os.path.exists(db_path):
             return False, "No es un proyecto válido (falta project_db.json)."
@@ -105,7 +125,26 @@ class ProjectManager:
             self.current_project_path = full_path
             with open(db_path, 'r') as f:
                 self.project_data = json.load(f)
-            
+            return self._activate_loaded_project()
+        except Exception as e:
+            return False, f"Error JSON: {e}"
+
+    def _load_sqlite_project(self, full_path):
+        """Abre un proyecto SQLite leyendo solo metadatos y nombres de sistemas"""
+        try:
+            self.store = SqliteProjectStore.open_project(full_path)
+            self.current_project_path = full_path
+            meta = self.store.load_meta()
+            self.project_data = dict(meta)
+            self.project_data["systems"] = dict.fromkeys(self.store.list_systems())
+            self.project_data["global_states"] = self.store.load_global_states()
+            return self._activate_loaded_project()
+        except Exception as e:
+            self._close_store()
+            return False, f"Error SQLite: {e}"
+
+    def _activate_loaded_project(self):
+        try:
             active = self.project_data.get("active_system")
             systems = list(self.project_data.get("systems", {}).keys())
             
@@ -121,13 +160,78 @@ class ProjectManager:
                 
             return True, "Proyecto cargado."
         except Exception as e:
-            return False, f"Error JSON: {e}"
+            return False, f"Error cargando proyecto: {e}"
 
     def save_db(self):
-        if self.current_project_path:
-            self.project_data["active_system"] = self.active_system_name
-            with open(os.path.join(self.current_project_path, "project_db.json"), 'w') as f:
-                json.dump(self.project_data, f, indent=4)
+        """
+        JSON: marca el proyecto como modificado; la escritura real ocurre en segundo plano.
+        SQLite: escribe en una transacción solo las filas modificadas desde el último guardado.
+        """
+        if not self.current_project_path:
+            return
+        self.project_data["active_system"] = self.active_system_name
+        if self.store is None:
+            self.writer.schedule(os.path.join(self.current_project_path, "project_db.json"), self.project_data)
+            return
+
+        systems = self.project_data["systems"]
+        states = {(name, key): systems[name][key] for name, key in self._dirty_states
+                  if systems.get(name) is not None and key in systems[name]}
+        meta = {k: v for k, v in self.project_data.items() if k not in ("systems", "global_states")}
+        global_states = {k: self.project_data["global_states"][k] for k in self._dirty_globals}
+        try:
+            self.store.commit(meta=meta, new_systems=self._new_systems, deleted_systems=self._deleted_systems,
+                              states=states, global_states=global_states)
+        except Exception as e:
+            print(f"Error guardando proyecto SQLite: {e}")
+            return
+        self._dirty_states.clear()
+        self._dirty_globals.clear()
+        self._new_systems = []
+        self._deleted_systems = []
+
+    def flush(self):
+        """Escribe inmediatamente los cambios pendientes (llamar al cerrar)"""
+        self.writer.flush()
+
+    def is_sqlite(self):
+        return self.store is not None
+
+    def migrate_to_sqlite(self):
+        """Convierte el proyecto actual (JSON) al backend SQLite y lo reabre"""
+        if not self.current_project_path:
+            return False, "No hay proyecto activo."
+        if self.store is not None:
+            return False, "El proyecto ya usa SQLite."
+        self.save_db()
+        self.flush()
+        success, msg = migrate_json_project(self.current_project_path)
+        if not success:
+            return False, msg
+        loaded, load_msg = self.load_project_from_path(self.current_project_path)
+        return (True, msg) if loaded else (False, load_msg)
+
+    def _close_store(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self._dirty_states.clear()
+        self._dirty_globals.clear()
+        self._new_systems = []
+        self._deleted_systems = []
+
+    def _system(self, sys_name):
+        """Datos de un sistema; en SQLite se leen la primera vez que se piden"""
+        systems = self.project_data.get("systems", {})
+        if sys_name not in systems:
+            return None
+        if systems[sys_name] is None:
+            systems[sys_name] = self.store.load_system(sys_name)
+        return systems[sys_name]
+
+    def _mark_dirty(self, sys_name, *keys):
+        if self.store is not None:
+            self._dirty_states.update((sys_name, key) for key in keys)
 
     # --- GESTIÓN DE SISTEMAS ---
 
@@ -147,6 +251,9 @@ class ProjectManager:
             "simulation_state": {},
             "analysis_state": {}
         }
+        if self.store is not None:
+            self._new_systems.append(sys_name)
+            self._mark_dirty(sys_name, *self.project_data["systems"][sys_name].keys())
         
         self.active_system_name = sys_name
         self.save_db()
@@ -158,7 +265,7 @@ class ProjectManager:
         if source_name not in self.project_data["systems"]:
             return False, "Origen no existe."
 
-        source_data = self.project_data["systems"][source_name]
+        source_data = self._system(source_name)
         new_data = copy.deepcopy(source_data)
         new_data["created"] = str(datetime.now())
         
@@ -166,8 +273,13 @@ class ProjectManager:
         sim_state = new_data.get("simulation_state", {})
         if "tree_data" in sim_state:
             self._reset_tree_status(sim_state["tree_data"])
+        # La distribución de hilos medida depende del tamaño del sistema
+        new_data.get("settings", {}).pop("mdrun_layout", None)
             
         self.project_data["systems"][new_name] = new_data
+        if self.store is not None:
+            self._new_systems.append(new_name)
+            self._mark_dirty(new_name, *new_data.keys())
         
         src_path = os.path.join(self.current_project_path, "storage", source_name)
         dst_path = os.path.join(self.current_project_path, "storage", new_name)
@@ -207,6 +319,9 @@ class ProjectManager:
             return False, str(e)
             
         del self.project_data["systems"][sys_name]
+        if self.store is not None:
+            self._deleted_systems.append(sys_name)
+            self._dirty_states = {item for item in self._dirty_states if item[0] != sys_name}
         
         if self.active_system_name == sys_name:
             keys = list(self.project_data["systems"].keys())
@@ -219,24 +334,59 @@ class ProjectManager:
         self.save_db()
         return True, "Eliminado."
 
+    # --- CACHÉ DE DATOS PARSEADOS ---
+
+    def get_cache_dir(self):
+        """Directorio de la caché binaria de series (.npy) del proyecto actual"""
+        if not self.current_project_path: return None
+        return os.path.join(self.current_project_path, "cache", "series")
+
+    def purge_cache(self):
+        """Elimina la caché binaria del proyecto. Se regenera bajo demanda."""
+        cache_dir = self.get_cache_dir()
+        if not cache_dir:
+            return False, "No hay proyecto activo."
+        try:
+            if os.path.exists(cache_dir):
+                shutil.rmtree(cache_dir)
+            return True, "Caché eliminada."
+        except Exception as e:
+            return False, str(e)
+
     def get_active_system_path(self):
         if not self.current_project_path or not self.active_system_name: return None
         return os.path.join(self.current_project_path, "storage", self.active_system_name)
 
     def update_tab_state(self, tab, data):
         if self.active_system_name:
-            self.project_data["systems"][self.active_system_name][f"{tab}_state"] = data
+            self._system(self.active_system_name)[f"{tab}_state"] = data
+            self._mark_dirty(self.active_system_name, f"{tab}_state")
             self.save_db()
 
     def get_tab_state(self, tab):
         if self.active_system_name:
-            return self.project_data["systems"][self.active_system_name].get(f"{tab}_state", {})
+            return self._system(self.active_system_name).get(f"{tab}_state", {})
         return {}
 
+    def update_system_setting(self, key, value, sys_name=None):
+        """Guarda un ajuste propio del sistema (ej. la distribución de hilos de mdrun)"""
+        sys_name = sys_name or self.active_system_name
+        if sys_name in self.project_data.get("systems", {}):
+            self._system(sys_name).setdefault("settings", {})[key] = value
+            self._mark_dirty(sys_name, "settings")
+            self.save_db()
+
+    def get_system_setting(self, key, default=None, sys_name=None):
+        sys_name = sys_name or self.active_system_name
+        system = self._system(sys_name) or {}
+        return system.get("settings", {}).get(key, default)
+
     def update_global_state(self, key, data):
         if "global_states" not in self.project_data:
             self.project_data["global_states"] = {}
         self.project_data["global_states"][key] = data
+        if self.store is not None:
+            self._dirty_globals.add(key)
         self.save_db()
 
     def get_global_state(self, key):
@@ -0,0 +1,144 @@
+import os
+import json
+import sqlite3
+
+
+class SqliteProjectStore:
+    """
+    Backend SQLite (biblioteca estándar) para los datos del proyecto.
+    A diferencia de project_db.json, cada estado de cada sistema es una fila
+    propia: abrir el proyecto solo lee la lista de sistemas y los metadatos, el
+    estado de un sistema se carga cuando se activa, y guardar escribe solo las
+    filas modificadas dentro de una transacción.
+
+    Tablas:
+        meta(key, value)                 -> nombre, fecha de creación, sistema activo
+        systems(name, position)          -> orden de los sistemas
+        system_states(system, key, value) -> 'setup_state', 'simulation_state', 'settings', ...
+        global_states(key, value)        -> estados globales (ej. pestaña comparativa)
+    Los valores se guardan como texto JSON.
+    """
+
+    FILENAME = "project_db.sqlite"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS systems (name TEXT PRIMARY KEY, position INTEGER);
+                CREATE TABLE IF NOT EXISTS system_states (
+                    system TEXT REFERENCES systems(name) ON DELETE CASCADE,
+                    key TEXT,
+                    value TEXT,
+                    PRIMARY KEY (system, key)
+                );
+                CREATE TABLE IF NOT EXISTS global_states (key TEXT PRIMARY KEY, value TEXT);
+            """)
+
+    @classmethod
+    def exists_in(cls, project_path):
+        return os.path.exists(os.path.join(project_path, cls.FILENAME))
+
+    @classmethod
+    def open_project(cls, project_path):
+        return cls(os.path.join(project_path, cls.FILENAME))
+
+    def close(self):
+        self.conn.close()
+
+    # =========================================================================
+    # LECTURA
+    # =========================================================================
+
+    def load_meta(self):
+        return {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM meta")}
+
+    def list_systems(self):
+        return [row[0] for row in self.conn.execute("SELECT name FROM systems ORDER BY position, rowid")]
+
+    def load_system(self, name):
+        """Todos los estados de un sistema: {clave: valor}"""
+        rows = self.conn.execute("SELECT key, value FROM system_states WHERE system = ?", (name,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def load_global_states(self):
+        return {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM global_states")}
+
+    # =========================================================================
+    # ESCRITURA (UNA TRANSACCIÓN POR GUARDADO)
+    # =========================================================================
+
+    def commit(self, meta=None, new_systems=(), deleted_systems=(), states=None, global_states=None):
+        """
+        Aplica un lote de cambios de forma atómica.
+
+        Args:
+            meta (dict): Claves de meta a escribir.
+            new_systems (list): Nombres de sistemas nuevos (al final del orden).
+            deleted_systems (list): Sistemas a borrar (sus estados se borran en cascada).
+            states (dict): {(sistema, clave): valor} filas de estado modificadas.
+            global_states (dict): {clave: valor}.
+        """
+        with self.conn:
+            for name in deleted_systems:
+                self.conn.execute("DELETE FROM systems WHERE name = ?", (name,))
+            if new_systems:
+                (last,) = self.conn.execute("SELECT COALESCE(MAX(position), -1) FROM systems").fetchone()
+                # Upsert, no REPLACE: REPLACE borra la fila y el ON DELETE CASCADE
+                # se llevaría los estados de un sistema que ya existía
+                self.conn.executemany(
+                    "INSERT INTO systems (name, position) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET position = excluded.position",
+                    [(name, last + 1 + i) for i, name in enumerate(new_systems)])
+            if meta:
+                self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                      [(k, json.dumps(v)) for k, v in meta.items()])
+            if states:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO system_states (system, key, value) VALUES (?, ?, ?)",
+                    [(system, key, json.dumps(value)) for (system, key), value in states.items()])
+            if global_states:
+                self.conn.executemany("INSERT OR REPLACE INTO global_states (key, value) VALUES (?, ?)",
+                                      [(k, json.dumps(v)) for k, v in global_states.items()])
+
+
+def migrate_json_project(project_path):
+    """
+    Convierte un proyecto project_db.json al backend SQLite.
+    El JSON original se conserva renombrado como project_db.json.bak.
+
+    Returns:
+        tuple: (bool, mensaje)
+    """
+    json_path = os.path.join(project_path, "project_db.json")
+    if not os.path.exists(json_path):
+        return False, "No hay project_db.json que migrar."
+    if SqliteProjectStore.exists_in(project_path):
+        return False, "El proyecto ya usa SQLite."
+
+    try:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+    except Exception as e:
+        return False, f"Error JSON: {e}"
+
+    store = SqliteProjectStore.open_project(project_path)
+    try:
+        systems = data.get("systems", {})
+        states = {(name, key): value for name, sysdata in systems.items() for key, value in sysdata.items()}
+        meta = {k: v for k, v in data.items() if k not in ("systems", "global_states")}
+        store.commit(meta=meta, new_systems=list(systems.keys()), states=states,
+                     global_states=data.get("global_states", {}))
+    except Exception as e:
+        store.close()
+        os.remove(store.db_path)
+        return False, f"Error migrando: {e}"
+    store.close()
+
+    os.replace(json_path, json_path + ".bak")
+    return True, f"Proyecto migrado a SQLite ({len(systems)} sistemas)."
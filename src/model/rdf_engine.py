@@ -0,0 +1,416 @@
+import numpy as np
+
+from src.model.xtc_reader import XtcReader
+from src.model.parallel_frames import FrameBlockRunner
+
+
+class MultiRdfEngine:
+    """
+    Motor RDF nativo (NumPy) que sustituye a 'gmx rdf'.
+    Calcula g(r) para cualquier número de parejas (referencia, selección) en una
+    sola pasada por la trayectoria: en cada frame las posiciones (o centros de
+    masa) de cada grupo se calculan una vez y la estructura de celdas (linked-cell)
+    de cada grupo de selección se comparte entre todas las parejas que lo usan.
+    El histograma se acumula con np.bincount usando imagen mínima.
+
+    Soporta el modo 'mol_com' (centros de masa moleculares), necesario para
+    el método de Yousefi en la pestaña de Solubilidad.
+    """
+
+    def __init__(self, pairs, bin_width=0.002, cutoff=1.5, use_com=False):
+        """
+        Args:
+            pairs (list): Lista de tuplas (ref_group, sel_group) creados con make_group().
+            bin_width (float): Ancho del bin en nm.
+            cutoff (float): Distancia máxima en nm (-rmax).
+            use_com (bool): Si True, usa centros de masa moleculares (mol_com).
+        """
+        self.bin_width = float(bin_width)
+        self.cutoff = float(cutoff)
+        self.use_com = use_com
+        self.n_bins = int(np.ceil(self.cutoff / self.bin_width))
+
+        # Grupos únicos (un mismo grupo puede aparecer en varias parejas)
+        self.group_pairs = list(pairs)
+        self.groups = []
+        self.pairs = []
+        for ref_group, sel_group in pairs:
+            i_ref = self._register_group(ref_group)
+            i_sel = self._register_group(sel_group)
+            # Mismo grupo (g11, g22): se excluyen los pares i == i
+            self.pairs.append((i_ref, i_sel, i_ref == i_sel))
+
+        self.reset()
+
+    def _register_group(self, group):
+        for i, known in enumerate(self.groups):
+            if known is group or np.array_equal(known['atoms'], group['atoms']):
+                return i
+        self.groups.append(group)
+        return len(self.groups) - 1
+
+    def reset(self):
+        """Reinicia los acumuladores"""
+        n_pairs = len(self.pairs)
+        self.counts = np.zeros((n_pairs, self.n_bins), dtype=np.float64)
+        self.n_frames = 0
+        self.volume_sum = 0.0
+        self.group_sizes = [0] * len(self.groups)
+
+    # =========================================================================
+    # ACUMULACIÓN POR FRAME
+    # =========================================================================
+
+    def add_frame(self, coords, box):
+        """
+        Acumula los histogramas de todas las parejas para un frame.
+
+        Args:
+            coords (np.ndarray): Coordenadas (n_atomos, 3) en nm.
+            box (np.ndarray): Caja (3,) o matriz (3, 3) en nm. Se usa la diagonal
+                              (cajas rectangulares, como las de packmol/editconf).
+        """
+        box_len = box_lengths(box)
+
+        # 1. Posiciones / centros de masa: una vez por grupo
+        positions = [group_positions(coords, g, box_len, self.use_com) for g in self.groups]
+        for i, pos in enumerate(positions):
+            self.group_sizes[i] = len(pos)
+
+        # 2. Estructura de vecinos: una vez por grupo de selección
+        neighbours = {}
+        for k, (i_ref, i_sel, same) in enumerate(self.pairs):
+            if i_sel not in neighbours:
+                neighbours[i_sel] = NeighbourGrid(positions[i_sel], box_len, self.cutoff)
+
+            dist = neighbours[i_sel].distances_from(positions[i_ref], exclude_self=same)
+            if len(dist):
+                bins = (dist / self.bin_width).astype(np.int64)
+                bins = bins[bins < self.n_bins]
+                self.counts[k] += np.bincount(bins, minlength=self.n_bins)
+
+        self.n_frames += 1
+        self.volume_sum += float(np.prod(box_len))
+
+    def compute(self, frames):
+        """
+        Recorre un iterable de frames (coords, box) y retorna los RDFs.
+
+        Returns:
+            tuple: (array_r, lista_de_arrays_g) en el orden de las parejas.
+        """
+        for coords, box in frames:
+            self.add_frame(coords, box)
+        return self.get_rdfs()
+
+    def compute_trajectory(self, traj_file, n_workers=1, begin=None, end=None, stride=1, index_dir=None):
+        """
+        Calcula los RDFs directamente desde un .xtc repartiendo los frames en
+        bloques entre n_workers procesos. Los histogramas parciales se suman, por
+        lo que el resultado coincide con el cálculo en serie.
+
+        Returns:
+            tuple: (array_r, lista_de_arrays_g)
+        """
+        runner = FrameBlockRunner(n_workers, index_dir=index_dir)
+        indices = runner.frame_indices(traj_file, begin, end, stride)
+        partials = runner.run(rdf_frame_block, traj_file, indices, self.group_pairs,
+                              self.bin_width, self.cutoff, self.use_com)
+        for partial in partials:
+            self.merge(partial)
+        return self.get_rdfs()
+
+    def get_partial(self):
+        """Estado acumulado (para enviarlo entre procesos)"""
+        return {'counts': self.counts, 'n_frames': self.n_frames,
+                'volume_sum': self.volume_sum, 'group_sizes': list(self.group_sizes)}
+
+    def merge(self, partial):
+        """Suma el estado parcial de otro motor con las mismas parejas"""
+        if partial['n_frames'] == 0:
+            return
+        self.counts += partial['counts']
+        self.n_frames += partial['n_frames']
+        self.volume_sum += partial['volume_sum']
+        self.group_sizes = list(partial['group_sizes'])
+
+    # =========================================================================
+    # RESULTADO
+    # =========================================================================
+
+    def get_rdfs(self):
+        """
+        Normaliza los histogramas acumulados a g(r) (misma convención que gmx rdf:
+        densidad media de la selección N_sel / <V>).
+
+        Returns:
+            tuple: (array_r, lista_de_arrays_g) con r en el centro de cada bin (nm).
+        """
+        r = None
+        g_list = []
+        for k, (i_ref, i_sel, _) in enumerate(self.pairs):
+            r, g = normalize_rdf(self.counts[k], self.n_frames, self.volume_sum,
+                                 self.group_sizes[i_ref], self.group_sizes[i_sel], self.bin_width)
+            g_list.append(g)
+        if r is None:
+            r = (np.arange(self.n_bins) + 0.5) * self.bin_width
+        return r, g_list
+
+    def write_xvgs(self, output_files, legends=None):
+        """Escribe un .xvg por pareja, compatible con AnalysisParser.get_data_from_file"""
+        r, g_list = self.get_rdfs()
+        for k, (path, g) in enumerate(zip(output_files, g_list)):
+            legend = legends[k] if legends else "g(r)"
+            write_rdf_xvg(path, r, [g], [legend])
+
+
+def rdf_frame_block(traj_file, frame_indices, index_dir, pairs, bin_width, cutoff, use_com):
+    """Trabajo de un proceso hijo: histogramas de un bloque contiguo de frames"""
+    engine = MultiRdfEngine(pairs, bin_width=bin_width, cutoff=cutoff, use_com=use_com)
+    reader = XtcReader(traj_file, index_dir=index_dir)
+    with open(traj_file, 'rb') as f:
+        for i in frame_indices:
+            frame = reader.read_frame_from(f, i)
+            engine.add_frame(frame['coords'], frame['box'])
+    return engine.get_partial()
+
+
+class RdfEngine(MultiRdfEngine):
+    """Atajo del motor nativo para una única pareja (referencia, selección)"""
+
+    def __init__(self, ref_group, sel_group, bin_width=0.002, cutoff=1.5, use_com=False):
+        super().__init__([(ref_group, sel_group)], bin_width=bin_width, cutoff=cutoff, use_com=use_com)
+
+    def get_rdf(self):
+        """
+        Returns:
+            tuple: (array_r, array_g)
+        """
+        r, g_list = self.get_rdfs()
+        return r, g_list[0]
+
+    def write_xvg(self, output_xvg, legend="g(r)"):
+        """Escribe el RDF en formato .xvg compatible con AnalysisParser.get_data_from_file"""
+        self.write_xvgs([output_xvg], [legend])
+
+
+class NeighbourGrid:
+    """
+    Rejilla de celdas enlazadas (linked-cell) sobre un conjunto de posiciones.
+    Se construye una vez por frame y se consulta desde varios grupos de referencia.
+    En cajas con menos de 3 celdas por eje recurre a fuerza bruta por bloques.
+    """
+
+    def __init__(self, positions, box_len, cutoff):
+        self.positions = positions
+        self.box_len = box_len
+        self.cutoff = cutoff
+        self.n_cells = np.floor(box_len / cutoff).astype(np.int64)
+        self.use_cells = bool(np.all(self.n_cells >= 3)) and len(positions) > 0
+
+        if self.use_cells:
+            self.cell_len = box_len / self.n_cells
+            # Ordenar por celda: cell_start[k]..cell_start[k+1] son sus partículas
+            cells = self._flat(self._cell_coords(positions))
+            self.order = np.argsort(cells, kind='stable')
+            self.sorted_pos = positions[self.order]
+            total_cells = int(np.prod(self.n_cells))
+            self.cell_start = np.zeros(total_cells + 1, dtype=np.int64)
+            np.cumsum(np.bincount(cells, minlength=total_cells), out=self.cell_start[1:])
+
+    def distances_from(self, ref_pos, exclude_self=False):
+        """
+        Distancias (imagen mínima) menores que cutoff desde ref_pos.
+        exclude_self descarta los pares i == i (ref_pos es el mismo conjunto).
+        """
+        if len(ref_pos) == 0 or len(self.positions) == 0:
+            return np.empty(0)
+        if not self.use_cells:
+            return _pair_distances_brute(ref_pos, self.positions, self.box_len, self.cutoff, exclude_self)
+
+        cut2 = self.cutoff * self.cutoff
+        ref_c = self._cell_coords(ref_pos)
+        ref_idx = np.arange(len(ref_pos))
+        out = []
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    neigh = (ref_c + np.array([dx, dy, dz])) % self.n_cells
+                    k = self._flat(neigh)
+                    starts = self.cell_start[k]
+                    counts = self.cell_start[k + 1] - starts
+                    total = int(counts.sum())
+                    if total == 0:
+                        continue
+
+                    # Expandir rangos variables a pares (ref, sel) sin bucles Python
+                    pair_ref = np.repeat(ref_idx, counts)
+                    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+                    pair_sel = np.repeat(starts, counts) + (np.arange(total) - offsets)
+
+                    delta = ref_pos[pair_ref] - self.sorted_pos[pair_sel]
+                    delta -= self.box_len * np.round(delta / self.box_len)
+                    d2 = np.einsum('ij,ij->i', delta, delta)
+                    mask = d2 < cut2
+                    if exclude_self:
+                        mask &= self.order[pair_sel] != pair_ref
+                    out.append(np.sqrt(d2[mask]))
+
+        return np.concatenate(out) if out else np.empty(0)
+
+    def _cell_coords(self, pos):
+        wrapped = pos - self.box_len * np.floor(pos / self.box_len)
+        c = (wrapped / self.cell_len).astype(np.int64)
+        return np.minimum(c, self.n_cells - 1)
+
+    def _flat(self, c):
+        return (c[:, 0] * self.n_cells[1] + c[:, 1]) * self.n_cells[2] + c[:, 2]
+
+
+# =============================================================================
+# FUNCIONES AUXILIARES (GRUPOS, DISTANCIAS, NORMALIZACIÓN)
+# =============================================================================
+
+def make_group(atom_indices, mol_ids=None, masses=None):
+    """
+    Define un grupo de átomos para el motor RDF.
+
+    Args:
+        atom_indices (array): Índices (base 0) de los átomos del grupo.
+        mol_ids (array, opcional): Identificador de molécula de cada átomo del
+                                   grupo (ej. resid). Necesario para mol_com.
+        masses (array, opcional): Masa de cada átomo del grupo. Si falta, se
+                                  usan pesos iguales (centro geométrico).
+    Returns:
+        dict
+    """
+    atoms = np.asarray(atom_indices, dtype=np.int64)
+    group = {'atoms': atoms, 'mol_index': None, 'first_atom': None, 'masses': None}
+
+    if mol_ids is not None:
+        mol_ids = np.asarray(mol_ids)
+        # Etiquetas consecutivas 0..n_mol-1 respetando el orden de aparición
+        _, first, inverse = np.unique(mol_ids, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        relabel = np.empty_like(order)
+        relabel[order] = np.arange(len(order))
+        group['mol_index'] = relabel[inverse]
+        group['first_atom'] = np.sort(first)
+
+    if masses is not None:
+        group['masses'] = np.asarray(masses, dtype=np.float64)
+
+    return group
+
+
+# Masas atómicas (u) por elemento, para centros de masa sin leer el .tpr
+ELEMENT_MASSES = {
+    'H': 1.008, 'C': 12.011, 'N': 14.007, 'O': 15.999, 'F': 18.998, 'P': 30.974,
+    'S': 32.06, 'CL': 35.45, 'BR': 79.904, 'I': 126.904, 'NA': 22.990, 'K': 39.098,
+    'MG': 24.305, 'ZN': 65.38, 'LI': 6.94, 'CA': 40.078,
+}
+
+
+def guess_masses(atomnames, resnames=None):
+    """
+    Masa aproximada de cada átomo a partir de su nombre (como hace gmx sin .tpr).
+    CL y BR se leen siempre como halógenos; NA, MG, ZN y LI solo en iones de un
+    átomo (nombre = residuo), ya que 'NA' también es un nitrógeno habitual.
+    Los sitios virtuales de agua (MW, M*) pesan 0.
+    """
+    masses = np.empty(len(atomnames), dtype=np.float64)
+    for i, name in enumerate(atomnames):
+        name = str(name).strip().upper().lstrip('0123456789')
+        resname = str(resnames[i]).strip().upper() if resnames is not None else ""
+        if name[:2] in ('CL', 'BR') or (name == resname and name[:2] in ELEMENT_MASSES):
+            masses[i] = ELEMENT_MASSES[name[:2]]
+        elif name.startswith('M'):
+            masses[i] = 0.0
+        else:
+            masses[i] = ELEMENT_MASSES.get(name[:1], 1.0)
+    return masses
+
+
+def box_lengths(box):
+    """Longitudes de caja (3,) a partir de un vector o una matriz 3x3"""
+    box = np.asarray(box, dtype=np.float64)
+    if box.ndim == 2:
+        return np.diag(box).copy()
+    return box[:3].copy()
+
+
+def group_positions(coords, group, box_len, use_com):
+    """Posiciones de los átomos del grupo o de los centros de masa de sus moléculas"""
+    pos = np.asarray(coords, dtype=np.float64)[group['atoms']]
+    if not use_com or group['mol_index'] is None:
+        return pos
+
+    mol_index = group['mol_index']
+    n_mol = len(group['first_atom'])
+
+    # Reconstruir moléculas cruzando PBC: cada átomo relativo al primero de su molécula
+    anchor = pos[group['first_atom']]
+    delta = pos - anchor[mol_index]
+    delta -= box_len * np.round(delta / box_len)
+
+    weights = group['masses'] if group['masses'] is not None else np.ones(len(pos))
+    total_w = np.bincount(mol_index, weights=weights, minlength=n_mol)
+    com = np.empty((n_mol, 3), dtype=np.float64)
+    for d in range(3):
+        com[:, d] = np.bincount(mol_index, weights=weights * delta[:, d], minlength=n_mol)
+    com /= total_w[:, None]
+    com += anchor
+
+    # Devolver dentro de la caja primaria
+    return com - box_len * np.floor(com / box_len)
+
+
+def pair_distances(ref_pos, sel_pos, box_len, cutoff, exclude_self=False):
+    """Distancias (imagen mínima) menores que cutoff entre ref_pos y sel_pos"""
+    return NeighbourGrid(sel_pos, box_len, cutoff).distances_from(ref_pos, exclude_self)
+
+
+def _pair_distances_brute(ref_pos, sel_pos, box_len, cutoff, exclude_self, block=2048):
+    out = []
+    cut2 = cutoff * cutoff
+    sel_idx = np.arange(len(sel_pos))
+    for start in range(0, len(ref_pos), block):
+        chunk = ref_pos[start:start + block]
+        delta = chunk[:, None, :] - sel_pos[None, :, :]
+        delta -= box_len * np.round(delta / box_len)
+        d2 = np.einsum('ijk,ijk->ij', delta, delta)
+        mask = d2 < cut2
+        if exclude_self:
+            ref_idx = np.arange(start, start + len(chunk))
+            mask &= ref_idx[:, None] != sel_idx[None, :]
+        out.append(np.sqrt(d2[mask]))
+    return np.concatenate(out) if out else np.empty(0)
+
+
+def normalize_rdf(counts, n_frames, volume_sum, n_ref, n_sel, bin_width):
+    """Convierte un histograma acumulado en g(r) normalizado por capas esféricas"""
+    n_bins = len(counts)
+    edges = np.arange(n_bins + 1) * bin_width
+    r = (edges[:-1] + edges[1:]) / 2.0
+    if n_frames == 0 or n_ref == 0 or n_sel == 0 or volume_sum <= 0:
+        return r, np.zeros(n_bins)
+
+    shell_vol = (4.0 / 3.0) * np.pi * (edges[1:] ** 3 - edges[:-1] ** 3)
+    density = n_sel / (volume_sum / n_frames)
+    g = counts / (n_frames * n_ref * density * shell_vol)
+    return r, g
+
+
+def write_rdf_xvg(output_xvg, r, g_list, legends):
+    """Escribe una o varias curvas g(r) en un .xvg estilo GROMACS"""
+    with open(output_xvg, 'w') as f:
+        f.write("# Generado por ChemSimGUI (motor RDF nativo)\n")
+        f.write('@    title "Radial distribution"\n')
+        f.write('@    xaxis  label "r (nm)"\n')
+        f.write('@    yaxis  label "g(r)"\n')
+        f.write("@TYPE xy\n")
+        for i, legend in enumerate(legends):
+            f.write(f'@ s{i} legend "{legend}"\n')
+        data = np.column_stack([r] + list(g_list))
+        np.savetxt(f, data, fmt="%12.6f")
@@ -0,0 +1,428 @@
+import os
+import struct
+import hashlib
+import numpy as np
+
+
+# Tabla de tamaños de la compresión XTC (libxdrf de GROMACS)
+MAGICINTS = (
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 8, 10, 12, 16, 20, 25, 32, 40, 50, 64,
+    80, 101, 128, 161, 203, 256, 322, 406, 512, 645, 812, 1024, 1290,
+    1625, 2048, 2580, 3250, 4096, 5060, 6501, 8192, 10321, 13003,
+    16384, 20642, 26007, 32768, 41285, 52015, 65536, 82570, 104031,
+    131072, 165140, 208063, 262144, 330280, 416127, 524287, 660561,
+    832255, 1048576, 1321122, 1664510, 2097152, 2642245, 3329021,
+    4194304, 5284491, 6658042, 8388607, 10568983, 13316085, 16777216
+)
+FIRSTIDX = 9
+
+XTC_MAGIC = 1995
+XTC_MAGIC_LARGE = 2023  # GROMACS >= 2023: contador de bytes de 64 bits
+
+
+class XtcReader:
+    """
+    Lector de trayectorias .xtc en Python/NumPy (sin GROMACS).
+    Decodifica el formato de coordenadas comprimidas de libxdrf frame a frame.
+
+    Al abrir el archivo por primera vez construye un índice de offsets (byte de
+    inicio de cada frame, paso y tiempo) recorriendo solo las cabeceras, y lo
+    guarda en disco. Con el índice, el acceso aleatorio, el recorte por tiempo
+    (equivalente a -b/-e) y el salto de frames (-dt / stride) cuestan O(1) por frame.
+    """
+
+    def __init__(self, filepath, index_dir=None):
+        """
+        Args:
+            filepath (str): Ruta al .xtc.
+            index_dir (str, opcional): Carpeta donde guardar el índice. Por defecto,
+                junto a la trayectoria (archivo oculto .<nombre>.idx.npz).
+        """
+        self.filepath = filepath
+        self.index_path = self._index_path(filepath, index_dir)
+        self.offsets = None
+        self.steps = None
+        self.times = None
+        self.natoms = 0
+        self._load_or_build_index()
+
+    # =========================================================================
+    # ÍNDICE DE FRAMES
+    # =========================================================================
+
+    def _index_path(self, filepath, index_dir):
+        if index_dir:
+            key = hashlib.sha1(os.path.abspath(filepath).encode('utf-8')).hexdigest()
+            return os.path.join(index_dir, f"{key}.xtcidx.npz")
+        folder, name = os.path.split(os.path.abspath(filepath))
+        return os.path.join(folder, f".{name}.idx.npz")
+
+    def _load_or_build_index(self):
+        st = os.stat(self.filepath)
+        if os.path.exists(self.index_path):
+            try:
+                idx = np.load(self.index_path)
+                if int(idx['size']) == st.st_size and int(idx['mtime_ns']) == st.st_mtime_ns:
+                    self.offsets = idx['offsets']
+                    self.steps = idx['steps']
+                    self.times = idx['times']
+                    self.natoms = int(idx['natoms'])
+                    return
+            except Exception:
+                pass
+
+        self.build_index()
+        self._save_index(st)
+
+    def build_index(self):
+        """Recorre solo las cabeceras de los frames y registra su posición"""
+        offsets, steps, times = [], [], []
+        natoms = 0
+        size = os.path.getsize(self.filepath)
+
+        with open(self.filepath, 'rb') as f:
+            pos = 0
+            while pos < size:
+                f.seek(pos)
+                head = f.read(96)
+                if len(head) < 56:
+                    break
+                magic, n, step, time = struct.unpack('>iiif', head[:16])
+                if magic not in (XTC_MAGIC, XTC_MAGIC_LARGE):
+                    print(f"XTC: número mágico inválido en byte {pos}, índice truncado.")
+                    break
+
+                frame_len = self._frame_length(head, magic, n)
+                if frame_len is None or pos + frame_len > size:
+                    # Frame incompleto (simulación en curso o archivo truncado)
+                    break
+
+                offsets.append(pos)
+                steps.append(step)
+                times.append(time)
+                natoms = n
+                pos += frame_len
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.steps = np.array(steps, dtype=np.int64)
+        self.times = np.array(times, dtype=np.float64)
+        self.natoms = natoms
+
+    def _frame_length(self, head, magic, natoms):
+        """Tamaño total en bytes de un frame a partir de su cabecera"""
+        # magic, natoms, step, time, caja 3x3, natoms
+        base = 16 + 36 + 4
+        if natoms <= 9:
+            return base + natoms * 12
+        # precision, minint[3], maxint[3], smallidx
+        base += 4 + 12 + 12 + 4
+        if magic == XTC_MAGIC_LARGE:
+            if len(head) < base + 8:
+                return None
+            byte_cnt = struct.unpack('>q', head[base:base + 8])[0]
+            base += 8
+        else:
+            if len(head) < base + 4:
+                return None
+            byte_cnt = struct.unpack('>i', head[base:base + 4])[0]
+            base += 4
+        return base + ((byte_cnt + 3) // 4) * 4
+
+    def _save_index(self, st):
+        tmp = self.index_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                np.savez(f, offsets=self.offsets, steps=self.steps, times=self.times,
+                         natoms=self.natoms, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            # Carpeta de solo lectura: el índice queda solo en memoria
+            print(f"No se pudo guardar el índice XTC: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # =========================================================================
+    # ACCESO A FRAMES
+    # =========================================================================
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def read_frame(self, i):
+        """
+        Lee el frame i (admite índices negativos).
+
+        Returns:
+            dict: {'step': int, 'time': float (ps), 'box': (3, 3) nm,
+                   'coords': (natoms, 3) float32 nm, 'precision': float}
+        """
+        with open(self.filepath, 'rb') as f:
+            return self.read_frame_from(f, i)
+
+    def read_frame_from(self, f, i):
+        """Igual que read_frame, pero sobre un archivo ya abierto (modo 'rb')"""
+        i = int(i) % len(self.offsets)
+        offset = int(self.offsets[i])
+        f.seek(offset)
+        if i + 1 < len(self.offsets):
+            raw = f.read(int(self.offsets[i + 1]) - offset)
+        else:
+            raw = f.read()
+        return decode_frame(raw)
+
+    def frame_indices(self, begin=None, end=None, stride=1):
+        """
+        Índices de los frames dentro de [begin, end] (ps), tomando uno de cada
+        'stride'. Equivalente a las opciones -b / -e / -skip de GROMACS.
+        """
+        mask = np.ones(len(self.times), dtype=bool)
+        if begin is not None:
+            mask &= self.times >= begin
+        if end is not None:
+            mask &= self.times <= end
+        return np.flatnonzero(mask)[::max(int(stride), 1)]
+
+    def iter_frames(self, begin=None, end=None, stride=1):
+        """
+        Generador de frames (coords, box) listo para los motores de análisis
+        (ej. RdfEngine.compute). Mantiene el archivo abierto durante el recorrido.
+        """
+        indices = self.frame_indices(begin, end, stride)
+        with open(self.filepath, 'rb') as f:
+            for i in indices:
+                frame = self.read_frame_from(f, i)
+                yield frame['coords'], frame['box']
+
+
+# =============================================================================
+# DECODIFICACIÓN (xdr3dfcoord)
+# =============================================================================
+
+def decode_frame(raw):
+    """Decodifica un frame XTC completo a partir de sus bytes"""
+    magic, natoms, step, time = struct.unpack('>iiif', raw[:16])
+    box = np.frombuffer(raw, dtype='>f4', count=9, offset=16).reshape(3, 3).astype(np.float32)
+    pos = 52
+    lsize = struct.unpack('>i', raw[pos:pos + 4])[0]
+    pos += 4
+
+    if lsize <= 9:
+        coords = np.frombuffer(raw, dtype='>f4', count=3 * lsize, offset=pos)
+        return {'step': step, 'time': time, 'box': box,
+                'coords': coords.reshape(-1, 3).astype(np.float32), 'precision': 0.0}
+
+    precision = struct.unpack('>f', raw[pos:pos + 4])[0]
+    minint = struct.unpack('>3i', raw[pos + 4:pos + 16])
+    maxint = struct.unpack('>3i', raw[pos + 16:pos + 28])
+    smallidx = struct.unpack('>i', raw[pos + 28:pos + 32])[0]
+    pos += 32
+    if magic == XTC_MAGIC_LARGE:
+        byte_cnt = struct.unpack('>q', raw[pos:pos + 8])[0]
+        pos += 8
+    else:
+        byte_cnt = struct.unpack('>i', raw[pos:pos + 4])[0]
+        pos += 4
+
+    ints = decompress_coords(raw[pos:pos + byte_cnt], lsize, minint, maxint, smallidx)
+    coords = (ints.astype(np.float32) * np.float32(1.0 / precision)).reshape(-1, 3)
+    return {'step': step, 'time': time, 'box': box, 'coords': coords, 'precision': precision}
+
+
+def decompress_coords(buf, natoms, minint, maxint, smallidx):
+    """
+    Descompresión entera de libxdrf. Retorna un array (natoms * 3,) de enteros
+    (coordenadas * precisión).
+    """
+    reader = _BitReader(buf)
+    sizeint = [maxint[k] - minint[k] + 1 for k in range(3)]
+
+    if (sizeint[0] | sizeint[1] | sizeint[2]) > 0xffffff:
+        bitsizeint = [s.bit_length() for s in sizeint]
+        bitsize = 0
+    else:
+        bitsizeint = None
+        bitsize = (sizeint[0] * sizeint[1] * sizeint[2]).bit_length()
+
+    smaller = MAGICINTS[max(FIRSTIDX, smallidx - 1)] // 2
+    smallnum = MAGICINTS[smallidx] // 2
+    sizesmall = MAGICINTS[smallidx]
+
+    out = np.empty(natoms * 3, dtype=np.int64)
+    n_out = 0
+    i = 0
+    run = 0
+    read_bits = reader.read_bits
+    read_ints = reader.read_ints
+
+    while i < natoms:
+        if bitsize == 0:
+            x = read_bits(bitsizeint[0])
+            y = read_bits(bitsizeint[1])
+            z = read_bits(bitsizeint[2])
+        else:
+            x, y, z = read_ints(bitsize, sizeint[0], sizeint[1], sizeint[2])
+        i += 1
+        px = x + minint[0]
+        py = y + minint[1]
+        pz = z + minint[2]
+
+        is_smaller = 0
+        if read_bits(1):
+            run = read_bits(5)
+            is_smaller = run % 3
+            run -= is_smaller
+            is_smaller -= 1
+
+        if run > 0:
+            for k in range(0, run, 3):
+                dx, dy, dz = read_ints(smallidx, sizesmall, sizesmall, sizesmall)
+                i += 1
+                tx = dx + px - smallnum
+                ty = dy + py - smallnum
+                tz = dz + pz - smallnum
+                if k == 0:
+                    # El primer par está intercambiado (mejor compresión del agua)
+                    tx, px = px, tx
+                    ty, py = py, ty
+                    tz, pz = pz, tz
+                    out[n_out:n_out + 3] = (px, py, pz)
+                    n_out += 3
+                else:
+                    px, py, pz = tx, ty, tz
+                out[n_out:n_out + 3] = (tx, ty, tz)
+                n_out += 3
+        else:
+            out[n_out:n_out + 3] = (px, py, pz)
+            n_out += 3
+
+        smallidx += is_smaller
+        if is_smaller < 0:
+            smallnum = smaller
+            smaller = MAGICINTS[smallidx - 1] // 2 if smallidx > FIRSTIDX else 0
+        elif is_smaller > 0:
+            smaller = smallnum
+            smallnum = MAGICINTS[smallidx] // 2
+        sizesmall = MAGICINTS[smallidx]
+
+    return out[:n_out]
+
+
+class _BitReader:
+    """Lectura de bits MSB-first sobre el bloque comprimido"""
+
+    def __init__(self, buf):
+        # Relleno para poder leer siempre bytes completos al final
+        self.buf = bytes(buf) + b'\x00' * 16
+        self.bit_pos = 0
+
+    def read_bits(self, n):
+        start = self.bit_pos >> 3
+        shift = self.bit_pos & 7
+        n_bytes = (shift + n + 7) >> 3
+        chunk = int.from_bytes(self.buf[start:start + n_bytes], 'big')
+        self.bit_pos += n
+        return (chunk >> (n_bytes * 8 - shift - n)) & ((1 << n) - 1)
+
+    def read_ints(self, n_bits, size0, size1, size2):
+        """Lee tres enteros empaquetados en un único número de n_bits (receiveints)"""
+        # Los bytes llegan del menos al más significativo (8 bits cada uno + resto)
+        value = 0
+        byte_shift = 0
+        while n_bits > 8:
+            value |= self.read_bits(8) << byte_shift
+            byte_shift += 8
+            n_bits -= 8
+        if n_bits > 0:
+            value |= self.read_bits(n_bits) << byte_shift
+
+        value, z = divmod(value, size2)
+        x, y = divmod(value, size1)
+        return x, y, z
+
+
+# =============================================================================
+# ESCRITURA (CODIFICACIÓN MÍNIMA)
+# =============================================================================
+
+def write_xtc_frame(f, coords, box, step, time, precision=1000.0):
+    """
+    Escribe un frame XTC válido (legible por GROMACS y por XtcReader).
+    Codificación mínima: cada átomo se guarda como entero completo, sin las
+    secuencias de diferencias pequeñas, por lo que el archivo es más grande que
+    el de mdrun. Pensado para trayectorias derivadas y benchmarks.
+    """
+    coords = np.asarray(coords, dtype=np.float32).reshape(-1, 3)
+    natoms = len(coords)
+    box = np.asarray(box, dtype=np.float32)
+    if box.ndim == 1:
+        box = np.diag(box[:3])
+
+    f.write(struct.pack('>iiif', XTC_MAGIC, natoms, int(step), float(time)))
+    f.write(box.astype('>f4').tobytes())
+    f.write(struct.pack('>i', natoms))
+    if natoms <= 9:
+        f.write(coords.astype('>f4').tobytes())
+        return
+
+    ints = np.round(coords * np.float32(precision)).astype(np.int64)
+    minint = ints.min(axis=0)
+    maxint = ints.max(axis=0)
+    sizeint = [int(maxint[k] - minint[k] + 1) for k in range(3)]
+    smallidx = FIRSTIDX
+
+    large = (sizeint[0] | sizeint[1] | sizeint[2]) > 0xffffff
+    bitsize = (sizeint[0] * sizeint[1] * sizeint[2]).bit_length()
+
+    writer = _BitWriter()
+    for x, y, z in (ints - minint).tolist():
+        if large:
+            writer.write_bits(sizeint[0].bit_length(), x)
+            writer.write_bits(sizeint[1].bit_length(), y)
+            writer.write_bits(sizeint[2].bit_length(), z)
+        else:
+            writer.write_ints(bitsize, sizeint, x, y, z)
+        # flag = 0: sin secuencia de átomos pequeños (run = 0)
+        writer.write_bits(1, 0)
+
+    payload = writer.getvalue()
+    f.write(struct.pack('>f', precision))
+    f.write(struct.pack('>3i', *minint.tolist()))
+    f.write(struct.pack('>3i', *maxint.tolist()))
+    f.write(struct.pack('>i', smallidx))
+    f.write(struct.pack('>i', len(payload)))
+    f.write(payload + b'\x00' * ((-len(payload)) % 4))
+
+
+class _BitWriter:
+    """Escritura de bits MSB-first (inversa de _BitReader)"""
+
+    def __init__(self):
+        self.parts = []
+        self.value = 0
+        self.n_bits = 0
+
+    def write_bits(self, n, v):
+        self.value = (self.value << n) | (v & ((1 << n) - 1))
+        self.n_bits += n
+        if self.n_bits >= 64:
+            # Volcar los bytes completos para no arrastrar un entero enorme
+            rest = self.n_bits & 7
+            n_bytes = self.n_bits >> 3
+            self.parts.append((self.value >> rest).to_bytes(n_bytes, 'big'))
+            self.value &= (1 << rest) - 1
+            self.n_bits = rest
+
+    def write_ints(self, n_bits, sizes, x, y, z):
+        value = (x * sizes[1] + y) * sizes[2] + z
+        while n_bits > 8:
+            self.write_bits(8, value & 0xff)
+            value >>= 8
+            n_bits -= 8
+        if n_bits > 0:
+            self.write_bits(n_bits, value)
+
+    def getvalue(self):
+        pad = (-self.n_bits) % 8
+        tail = (self.value << pad).to_bytes((self.n_bits + pad) // 8, 'big')
+        return b''.join(self.parts) + tail
@@ -0,0 +1,269 @@
+import os
+import re
+import warnings
+import numpy as np
+
+
+class XvgReader:
+    """
+    Lector masivo de archivos .xvg (GROMACS).
+    Separa la cabecera (@ / #) del cuerpo numérico en una sola pasada y convierte
+    el cuerpo completo a una matriz NumPy sin pasar por float() línea a línea.
+    """
+
+    # Ej: @ s0 legend "Temperature"
+    LEGEND_PATTERN = re.compile(r'^@\s*s(\d+)\s+legend\s+"(.*)"')
+
+    def __init__(self):
+        pass
+
+    # =========================================================================
+    # LECTURA COMPLETA
+    # =========================================================================
+
+    def read(self, filepath, dtype=np.float64):
+        """
+        Lee un .xvg completo.
+
+        Args:
+            filepath (str): Ruta al archivo.
+            dtype: Tipo de la matriz resultante (np.float64 o np.float32).
+
+        Returns:
+            tuple: (cabecera_dict, matriz_numpy)
+                cabecera_dict = {'title': str, 'labels': [x, y], 'legends': [str, ...]}
+                matriz_numpy tiene forma (n_filas, n_columnas). Vacía si no hay datos.
+        """
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+
+        header = self.new_header()
+        body_start = self.parse_header_block(raw, header)
+        body = raw[body_start:]
+
+        # Algunos .xvg traen separadores '&' o metadatos intercalados (multi-set).
+        # Solo en ese caso filtramos línea a línea.
+        if b'\n@' in body or b'\n#' in body or b'&' in body:
+            body = self._filter_body_lines(body, header)
+
+        data = self.parse_numeric_block(body, dtype)
+        self._fill_missing_legends(header, data)
+        return header, data
+
+    # =========================================================================
+    # LECTURA EN STREAMING (POR BLOQUES)
+    # =========================================================================
+
+    def iter_chunks(self, filepath, chunk_rows=200000, dtype=np.float64, header=None, block_bytes=8 * 1024 * 1024):
+        """
+        Generador que recorre el .xvg en bloques de tamaño fijo sin cargarlo entero.
+
+        Args:
+            filepath (str): Ruta al archivo.
+            chunk_rows (int): Filas por bloque entregado (el último puede ser menor).
+            header (dict, opcional): Si se pasa, se rellena con la cabecera del archivo.
+            block_bytes (int): Tamaño de lectura de disco por iteración.
+
+        Yields:
+            np.ndarray: matriz (n_filas, n_columnas) de cada bloque.
+        """
+        if header is None:
+            header = self.new_header()
+
+        pending = []
+        pending_rows = 0
+        n_cols = None
+
+        with open(filepath, 'rb') as f:
+            carry = b''
+            in_header = True
+            while True:
+                block = f.read(block_bytes)
+                if not block and not carry:
+                    break
+
+                text = carry + block
+                if block:
+                    # Cortar en la última línea completa
+                    cut = text.rfind(b'\n')
+                    if cut < 0:
+                        carry = text
+                        continue
+                    carry = text[cut + 1:]
+                    text = text[:cut + 1]
+                else:
+                    carry = b''
+
+                if in_header:
+                    start = self.parse_header_block(text, header)
+                    if start >= len(text) and block:
+                        # Todo el bloque era cabecera
+                        continue
+                    text = text[start:]
+                    in_header = False
+
+                if b'\n@' in text or b'\n#' in text or b'&' in text or text[:1] in (b'@', b'#'):
+                    text = self._filter_body_lines(text, header)
+
+                data = self.parse_numeric_block(text, dtype)
+                if data.size:
+                    if n_cols is None:
+                        n_cols = data.shape[1]
+                    if data.shape[1] == n_cols:
+                        pending.append(data)
+                        pending_rows += len(data)
+
+                while pending_rows >= chunk_rows:
+                    merged = pending[0] if len(pending) == 1 else np.concatenate(pending)
+                    yield merged[:chunk_rows]
+                    rest = merged[chunk_rows:]
+                    pending = [rest] if len(rest) else []
+                    pending_rows = len(rest)
+
+                if not block:
+                    break
+
+        if pending_rows:
+            yield pending[0] if len(pending) == 1 else np.concatenate(pending)
+
+        self._fill_missing_legends(header, np.empty((0, n_cols or 0)))
+
+    def estimate_rows(self, filepath, sample_bytes=256 * 1024):
+        """Estimación rápida del número de filas a partir del tamaño del archivo"""
+        size = os.path.getsize(filepath)
+        with open(filepath, 'rb') as f:
+            sample = f.read(sample_bytes)
+        start = self.parse_header_block(sample, self.new_header())
+        body = sample[start:]
+        n_lines = body.count(b'\n')
+        if n_lines == 0:
+            return 1
+        bytes_per_row = len(body) / n_lines
+        return max(int((size - start) / bytes_per_row), 1)
+
+    def new_header(self):
+        """Cabecera por defecto (mismas etiquetas que usaba el parser clásico)"""
+        return {'title': "", 'labels': ["Eje X", "Eje Y"], 'legends': []}
+
+    def parse_header_block(self, raw, header):
+        """
+        Recorre solo las líneas iniciales de metadatos.
+        Retorna el offset (bytes) donde empieza el bloque numérico.
+        """
+        pos = 0
+        size = len(raw)
+        while pos < size:
+            end = raw.find(b'\n', pos)
+            if end < 0:
+                end = size
+            line = raw[pos:end].strip()
+            if line and line[:1] not in (b'@', b'#'):
+                break
+            if line.startswith(b'@'):
+                self.parse_header_line(line.decode('utf-8', errors='replace'), header)
+            pos = end + 1
+        return min(pos, size)
+
+    def parse_header_line(self, line, header):
+        """Extrae etiquetas de ejes, título y leyendas de una línea '@'"""
+        if "legend" in line:
+            match = self.LEGEND_PATTERN.match(line)
+            if match:
+                idx = int(match.group(1))
+                legends = header['legends']
+                while len(legends) <= idx:
+                    legends.append("")
+                legends[idx] = match.group(2)
+                return
+
+        if '"' not in line:
+            return
+        parts = line.split('"')
+        if len(parts) < 2:
+            return
+
+        if "xaxis" in line and "label" in line:
+            header['labels'][0] = parts[1]
+        elif "yaxis" in line and "label" in line:
+            header['labels'][1] = parts[1]
+        elif "title" in line and "subtitle" not in line:
+            header['title'] = parts[1]
+
+    def parse_numeric_block(self, body, dtype=np.float64):
+        """
+        Convierte un bloque de texto numérico a matriz (n_filas, n_columnas).
+        El número de columnas se toma de la primera fila con datos.
+        """
+        first = self._first_data_line(body)
+        if first is None:
+            return np.empty((0, 0), dtype=dtype)
+
+        n_cols = len(first.split())
+
+        try:
+            with warnings.catch_warnings():
+                # fromstring avisa (DeprecationWarning) cuando encuentra texto no numérico
+                warnings.simplefilter("error", DeprecationWarning)
+                flat = np.fromstring(body, dtype=dtype, sep=' ')
+        except (ValueError, DeprecationWarning):
+            flat = None
+
+        if flat is None or n_cols == 0 or flat.size % n_cols != 0:
+            # Filas irregulares o basura: conversión tolerante fila a fila
+            return self._parse_rows_tolerant(body, n_cols, dtype)
+
+        return flat.reshape(-1, n_cols)
+
+    # =========================================================================
+    # HELPERS INTERNOS
+    # =========================================================================
+
+    def _first_data_line(self, body):
+        pos = 0
+        size = len(body)
+        while pos < size:
+            end = body.find(b'\n', pos)
+            if end < 0:
+                end = size
+            line = body[pos:end].strip()
+            if line:
+                return line
+            pos = end + 1
+        return None
+
+    def _filter_body_lines(self, body, header):
+        """Descarta líneas no numéricas del cuerpo (y lee las '@' que aparezcan)"""
+        keep = []
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            first = line[:1]
+            if first == b'@':
+                self.parse_header_line(line.decode('utf-8', errors='replace'), header)
+                continue
+            if first in (b'#', b'&'):
+                continue
+            keep.append(line)
+        return b'\n'.join(keep)
+
+    def _parse_rows_tolerant(self, body, n_cols, dtype):
+        rows = []
+        for line in body.splitlines():
+            parts = line.split()
+            if len(parts) != n_cols:
+                continue
+            try:
+                rows.append([float(p) for p in parts])
+            except ValueError:
+                continue
+        if not rows:
+            return np.empty((0, 0), dtype=dtype)
+        return np.array(rows, dtype=dtype)
+
+    def _fill_missing_legends(self, header, data):
+        """Garantiza una leyenda por cada columna Y (vacía si el archivo no la define)"""
+        n_y = max(data.shape[1] - 1, 0) if data.ndim == 2 else 0
+        legends = header['legends']
+        while len(legends) < n_y:
+            legends.append("")
@@ -34,46 +34,21 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QFileDialog
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QPixmap, QColor
 
 # Importaciones del Modelo de Negocio
 from src.model.analysis_parser import AnalysisParser
 from src.model.molecule_graph import MoleculeGraphGenerator
+from src.controller.job_scheduler import FunctionJob, JobScheduler
+from src.view.plot_controller import SeriesPlotController
 
 # Importaciones de Matplotlib (Graficación)
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 
 
-# =============================================================================
-# CLASE WORKER: EJECUCIÓN EN SEGUNDO PLANO
-# =============================================================================
-class AnalysisWorker(QThread):
-    """
-    Hilo independiente para ejecutar tareas pesadas (GROMACS, TRAVIS)
-    sin congelar la interfaz gráfica mientras se procesan los datos.
-    """
-    finished_signal = pyqtSignal(bool, str) # Señal que emite (Exito, Mensaje)
-
-    def __init__(self, func, *args, **kwargs):
-        super().__init__()
-        self.func = func
-        self.args = args
-        self.kwargs = kwargs
-
-    def run(self):
-        """Ejecuta la función pasada como argumento en el hilo"""
-        try:
-            # Se asume que la función retorna una tupla (bool, str)
-            success, msg = self.func(*self.args, **self.kwargs)
-            self.finished_signal.emit(success, msg)
-        except Exception as e:
-            self.finished_signal.emit(False, f"Error inesperado en Worker: {str(e)}")
-
-
 # =============================================================================
 # CLASE DIÁLOGO: SELECCIÓN DE ÁTOMOS CON VISUALIZACIÓN
 # =============================================================================
@@ -256,7 +231,24 @@ class AnalysisTab(QWidget):
         
         # Almacén de datos para la graficación avanzada
         # Diccionario { 'id_unico': {'label': str, 'filepath': str, 'x': np.array, 'y': np.array} }
+        # 'x'/'y' guardan la serie decimada a resolución de pantalla (vista completa)
         self.data_store = {} 
+        # Contador para IDs únicos (len(data_store) se repite tras eliminar series)
+        self.series_counter = 0
+        
+        # Ejes activos y temporizador para recargar a resolución completa al hacer zoom
+        self.plot_axes = []
+        self.zoomed_lines = set()
+        self.zoom_timer = QTimer()
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(150)
+        self.zoom_timer.timeout.connect(self.refine_zoomed_series)
+        
+        # Auto-guardado de la imagen agrupado: savefig renderiza la figura completa
+        self.autosave_timer = QTimer()
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(1000)
+        self.autosave_timer.timeout.connect(self.auto_save_plot)
         
         # Inicializar la interfaz gráfica
         self.init_ui()
@@ -537,6 +529,11 @@ class AnalysisTab(QWidget):
         self.figure = Figure(figsize=(10, 6))
         self.canvas = FigureCanvas(self.figure)
         self.toolbar = NavigationToolbar(self.canvas, self)
+        # Líneas persistentes por (serie, subplot): los cambios en la tabla no recrean la figura
+        self.plot_ctrl = SeriesPlotController(self.figure, self.canvas,
+                                              decorate=self._decorate_axes,
+                                              on_xlim_changed=self.on_axes_xlim_changed,
+                                              on_zoomed_line_added=self.zoom_timer.start)
         
         layout.addWidget(self.toolbar)
         layout.addWidget(self.canvas)
@@ -549,8 +546,36 @@ class AnalysisTab(QWidget):
     
     def add_data_to_store(self, label, x, y, filepath):
         """Guarda un set de datos calculado y lo añade a la tabla de visualización"""
+        # Añadir fila a la tabla (bloqueando señales para evitar redraw prematuro)
+        self.table_map.blockSignals(True)
+        self._append_series_row(label, x, y, filepath)
+        self.table_map.blockSignals(False)
+        
+        # Cambiar automáticamente a la pestaña de visualización y dibujar
+        self.tabs.setCurrentIndex(2)
+        self.update_plot_layout()
+
+    def add_data_batch(self, entries):
+        """
+        Añade varias series de una vez: la tabla se llena con las señales
+        bloqueadas y la figura se dibuja (y auto-guarda) una sola vez al final.
+        
+        Args:
+            entries (list): Tuplas (label, x, y, filepath, checks).
+        """
+        self.table_map.blockSignals(True)
+        self.table_map.setUpdatesEnabled(False)
+        for label, x, y, filepath, checks in entries:
+            self._append_series_row(label, x, y, filepath, checks)
+        self.table_map.setUpdatesEnabled(True)
+        self.table_map.blockSignals(False)
+        self.update_plot_layout()
+
+    def _append_series_row(self, label, x, y, filepath, checks=None):
+        """Registra la serie en data_store y crea su fila (sin redibujar)"""
         # Crear ID único
-        data_id = f"{len(self.data_store)}_{label}"
+        data_id = f"{self.series_counter}_{label}"
+        self.series_counter += 1
         
         # Guardar en memoria (IMPORTANTE: Guardar filepath para persistencia)
         self.data_store[data_id] = {
@@ -560,8 +585,6 @@ class AnalysisTab(QWidget):
             'filepath': filepath 
         }
         
-        # Añadir fila a la tabla (bloqueando señales para evitar redraw prematuro)
-        self.table_map.blockSignals(True)
         row = self.table_map.rowCount()
         self.table_map.insertRow(row)
         
@@ -573,29 +596,24 @@ class AnalysisTab(QWidget):
         item_name.setFlags(item_name.flags() | Qt.ItemFlag.ItemIsEditable)
         self.table_map.setItem(row, 0, item_name)
         
-        # Checkboxes (Columnas 1-4)
+        # Checkboxes (Columnas 1-4). Por defecto, marcar en Plot 1
+        if checks is None:
+            checks = [True]
         for col in range(1, 5):
             chk = QTableWidgetItem()
             chk.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-            chk.setCheckState(Qt.CheckState.Unchecked)
-            
-            # Por defecto, marcar en Plot 1
-            if col == 1:
-                chk.setCheckState(Qt.CheckState.Checked)
-                
+            is_checked = col - 1 < len(checks) and checks[col - 1]
+            chk.setCheckState(Qt.CheckState.Checked if is_checked else Qt.CheckState.Unchecked)
             self.table_map.setItem(row, col, chk)
-            
-        self.table_map.blockSignals(False)
-        
-        # Cambiar automáticamente a la pestaña de visualización y dibujar
-        self.tabs.setCurrentIndex(2)
-        self.update_plot_layout()
 
     def update_project_data(self, mgr):
         """Actualiza la referencia al proyecto y recarga lista de simulaciones"""
         self.project_mgr = mgr
         if not mgr or not mgr.current_project_path:
             return
+        
+        # Caché binaria de series del proyecto
+        self.parser.set_cache_dir(mgr.get_cache_dir())
             
         # Recargar lista
         self.refresh_simulation_list()
@@ -706,8 +724,8 @@ class AnalysisTab(QWidget):
         self.set_busy(True)
         self.lbl_thermo_status.setText(f"Calculando {prop}...")
         
-        # Worker
-        self.worker = AnalysisWorker(self.parser.run_gmx_energy, edr, out, [prop])
+        # Worker ligero (cores=0): no espera a que termine un mdrun
+        self.worker = FunctionJob(self.parser.extract_energy, edr, out, [prop], cores=0)
         self.worker.finished_signal.connect(lambda s, m: self.finish_calc(s, m, out, f"{prop} ({sim})"))
         self.worker.start()
 
@@ -736,9 +754,9 @@ class AnalysisTab(QWidget):
             return
         
         self.set_busy(True)
-        self.worker = AnalysisWorker(
+        self.worker = FunctionJob(
             self.parser.run_trjconv, tpr, xtc, out, 
-            center_id, out_id
+            center_id, out_id, cores=0
         )
         self.worker.finished_signal.connect(lambda s, m: (self.set_busy(False), QMessageBox.information(self, "OK", "Trayectoria corregida.") if s else QMessageBox.critical(self, "Error", m)))
         self.worker.start()
@@ -770,10 +788,13 @@ class AnalysisTab(QWidget):
                 self.set_busy(False)
                 return
             
-            # Pasar parámetros extendidos (Bin, Cutoff)
-            self.worker = AnalysisWorker(
-                self.parser.run_gmx_rdf, tpr, xtc, out, ref, sel, d, 
-                self.chk_com.isChecked(), self.sb_bin.value(), self.sb_rmax.value()
+            # Motor nativo (gmx rdf solo si los grupos no se resuelven desde el .gro/.ndx).
+            # Trabajo elástico: los frames se reparten entre los núcleos libres cuando
+            # el planificador lo admite (n_workers se fija entonces, no al encolar).
+            self.worker = FunctionJob(
+                self.parser.run_rdf, tpr, xtc, out, ref, sel, d, 
+                self.chk_com.isChecked(), self.sb_bin.value(), self.sb_rmax.value(),
+                cores=1, max_cores=JobScheduler.instance().total_cores, cores_kwarg='n_workers'
             )
             
             label_base = f"RDF {self.cb_ref.currentText().split('(')[0]}-{self.cb_sel.currentText().split('(')[0]}"
@@ -783,7 +804,7 @@ class AnalysisTab(QWidget):
             out = os.path.join(d, f"{sim}_rdf_travis.csv")
             st = os.path.join(d, "system.gro")
             
-            self.worker = AnalysisWorker(
+            self.worker = FunctionJob(
                 self.parser.run_travis_rdf, st, xtc, out, 
                 self.tx_m1.text(), self.tx_m2.text()
             )
@@ -802,11 +823,11 @@ class AnalysisTab(QWidget):
             QMessageBox.critical(self, "Error", msg)
             return
         
-        # Leer datos y añadir a Store (guardando el filepath para persistencia)
-        lbl, x, y_list = self.parser.get_data_from_file(out_file)
+        # Leer datos (decimados a resolución de pantalla) y añadir a Store
+        lbl, x, y, n_total = self.parser.get_plot_series(out_file, self.get_plot_max_points())
         
-        if y_list:
-            self.add_data_to_store(label, x, y_list[0], out_file)
+        if len(y):
+            self.add_data_to_store(label, x, y, out_file)
         else:
             QMessageBox.warning(self, "Aviso", "El archivo de salida está vacío o tiene formato incorrecto.")
 
@@ -829,8 +850,8 @@ class AnalysisTab(QWidget):
             tpr = os.path.join(d, f"{sim}.tpr")
             
             self.set_busy(True)
-            self.worker = AnalysisWorker(
-                self.parser.add_custom_group, tpr, d, dlg.selected_command
+            self.worker = FunctionJob(
+                self.parser.add_custom_group, tpr, d, dlg.selected_command, cores=0
             )
             
             # Al terminar, recargar los grupos del combobox
@@ -867,34 +888,18 @@ class AnalysisTab(QWidget):
             self.update_plot_layout()
 
     def update_plot_layout(self):
-        """Redibuja los gráficos según la configuración de la tabla"""
-        self.figure.clear()
-        
-        # Configurar estilo global
+        """Sincroniza los gráficos con la tabla reutilizando las líneas ya dibujadas"""
         font_size = self.sb_fontsize.value()
-        line_width = self.sb_linewidth.value()
-        plt.rcParams.update({'font.size': font_size, 'lines.linewidth': line_width})
-        
         layout_mode = self.combo_layout.currentIndex() # 0=1x1, 1=1x2, 2=2x2
-        axes = []
-        
-        # Crear subplots según layout
-        if layout_mode == 0:
-            axes.append(self.figure.add_subplot(111))
-        elif layout_mode == 1:
-            axes.append(self.figure.add_subplot(121))
-            axes.append(self.figure.add_subplot(122))
-        elif layout_mode == 2:
-            axes.append(self.figure.add_subplot(221))
-            axes.append(self.figure.add_subplot(222))
-            axes.append(self.figure.add_subplot(223))
-            axes.append(self.figure.add_subplot(224))
-            
-        # Recorrer la tabla para ver qué dato va en qué plot
-        row_count = self.table_map.rowCount()
         
-        for r in range(row_count):
-            # Recuperar ID del dato
+        # Los ejes solo se recrean si cambia la disposición o el estilo
+        if self.plot_ctrl.set_layout(layout_mode, font_size, self.sb_linewidth.value()):
+            self.zoomed_lines = set()
+        self.plot_axes = self.plot_ctrl.axes
+            
+        # Recorrer la tabla para ver qué dato va en qué plot (Col 1 a 4 -> Plot 1 a 4)
+        entries = []
+        for r in range(self.table_map.rowCount()):
             item_name = self.table_map.item(r, 0)
             data_id = item_name.data(Qt.ItemDataRole.UserRole)
             
@@ -902,34 +907,67 @@ class AnalysisTab(QWidget):
             if not data:
                 continue
             
-            # Revisar columnas de checkboxes (Col 1 a 4)
-            for c in range(1, 5):
-                # Si el gráfico no existe en este layout, saltar
-                plot_idx = c - 1
-                if plot_idx >= len(axes):
-                    break
-                
-                item_chk = self.table_map.item(r, c)
-                if item_chk.checkState() == Qt.CheckState.Checked:
-                    ax = axes[plot_idx]
-                    ax.plot(data['x'], data['y'], label=data['label'])
-                    
-        # Decorar ejes
-        for i, ax in enumerate(axes):
-            ax.grid(True, linestyle='--', alpha=0.5)
-            ax.legend(fontsize=font_size-2)
-            ax.set_title(f"Gráfico {i+1}", fontweight='bold')
-            
-            # Etiquetas genéricas (mejorable si guardamos metadatos de unidades)
-            if i >= len(axes)-2:
-                ax.set_xlabel("Eje X")
-            ax.set_ylabel("Eje Y")
-
-        self.figure.tight_layout()
-        self.canvas.draw()
+            checks = [self.table_map.item(r, c).checkState() == Qt.CheckState.Checked for c in range(1, 5)]
+            entries.append((data_id, data, checks))
+        
+        self.plot_ctrl.sync(entries, legend_size=font_size - 2)
         
-        # Auto-guardado
-        self.auto_save_plot()
+        # Auto-guardado (una imagen tras una ráfaga de cambios)
+        self.autosave_timer.start()
+
+    def _decorate_axes(self, i, ax):
+        """Títulos y etiquetas fijas de cada subplot (al crear los ejes)"""
+        ax.set_title(f"Gráfico {i+1}", fontweight='bold')
+        
+        # Etiquetas genéricas (mejorable si guardamos metadatos de unidades)
+        if i >= len(self.plot_ctrl.axes)-2:
+            ax.set_xlabel("Eje X")
+        ax.set_ylabel("Eje Y")
+
+    def get_plot_max_points(self):
+        """Puntos por serie acordes al ancho del canvas (2 por píxel: mín y máx)"""
+        return max(self.canvas.width(), 800) * 2
+
+    def on_axes_xlim_changed(self, ax):
+        """Callback de Matplotlib: agrupa los cambios de zoom/pan antes de recargar"""
+        self.zoom_timer.start()
+
+    def refine_zoomed_series(self):
+        """
+        Ajusta cada línea a la ventana visible: con zoom se relee el rango a
+        resolución completa (o decimado si aún son demasiados puntos); en vista
+        completa se vuelve a la serie decimada en memoria.
+        """
+        max_points = self.get_plot_max_points()
+        changed = False
+        
+        for ax in self.plot_axes:
+            x_lo, x_hi = ax.get_xlim()
+            for line in ax.get_lines():
+                if not line.get_visible():
+                    continue
+                data = self.data_store.get(line.get_gid())
+                if not data or not len(data['x']):
+                    continue
+                
+                full_lo = float(np.min(data['x']))
+                full_hi = float(np.max(data['x']))
+                if x_lo <= full_lo and x_hi >= full_hi:
+                    # Vista completa: usar la serie decimada ya cargada
+                    if line in self.zoomed_lines:
+                        line.set_data(data['x'], data['y'])
+                        self.zoomed_lines.discard(line)
+                        changed = True
+                    continue
+                
+                _, x, y, _ = self.parser.get_plot_series(data['filepath'], max_points, x_range=(x_lo, x_hi))
+                if len(x):
+                    line.set_data(x, y)
+                    self.zoomed_lines.add(line)
+                    changed = True
+        
+        if changed:
+            self.canvas.draw_idle()
 
     def auto_save_plot(self):
         """Guarda imagen temporal"""
@@ -991,37 +1029,26 @@ class AnalysisTab(QWidget):
         
         # 1. Limpiar todo primero
         self.data_store = {}
+        self.series_counter = 0
         self.table_map.setRowCount(0)
-        self.figure.clear()
+        self.plot_ctrl.reset()
         
-        # 2. Restaurar Layout
+        # 2. Restaurar Layout (sin disparar un redibujado intermedio)
+        self.combo_layout.blockSignals(True)
         self.combo_layout.setCurrentIndex(state.get("layout_mode", 0))
+        self.combo_layout.blockSignals(False)
         
-        # 3. Recargar archivos y configuraciones
-        files = state.get("loaded_files", [])
+        # 3. Re-leer todos los archivos existentes de una vez (decimados a resolución de pantalla)
+        files = [f for f in state.get("loaded_files", [])
+                 if f.get('filepath') and os.path.exists(f['filepath'])]
+        series = self.parser.get_plot_series_batch([f['filepath'] for f in files], self.get_plot_max_points())
         
+        entries = []
         for f_info in files:
-            path = f_info.get('filepath')
-            label = f_info.get('label')
-            checks = f_info.get('checks', [])
-            
-            # Solo cargar si el archivo existe
-            if path and os.path.exists(path):
-                # Re-leer datos del disco
-                lbl, x, y_list = self.parser.get_data_from_file(path)
-                
-                if y_list:
-                    # Añadir a la store y tabla
-                    self.add_data_to_store(label, x, y_list[0], path)
-                    
-                    # Restaurar checkboxes de esa fila (la última agregada)
-                    row = self.table_map.rowCount() - 1
-                    for i, is_checked in enumerate(checks):
-                        col = i + 1
-                        if col < 5:
-                            self.table_map.item(row, col).setCheckState(
-                                Qt.CheckState.Checked if is_checked else Qt.CheckState.Unchecked
-                            )
-        
-        # Actualizar gráfica final
-        self.update_plot_layout()
\ No newline at end of file
+            path = f_info['filepath']
+            lbl, x, y, n_total = series[path]
+            if len(y):
+                entries.append((f_info.get('label'), x, y, path, f_info.get('checks') or None))
+        
+        # 4. Tabla y gráfica en un solo paso
+        self.add_data_batch(entries)
@@ -21,14 +21,14 @@ from PyQt6.QtWidgets import (
     QColorDialog, 
     QAbstractItemView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor
 
 # Modelo
 from src.model.analysis_parser import AnalysisParser
+from src.view.plot_controller import SeriesPlotController
 
 # Matplotlib integration
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
@@ -46,6 +46,14 @@ class ComparativeTab(QWidget):
         # Almacén de datos en memoria para graficación rápida
         # Estructura: { 'id_unico': {'label': str, 'x': np.array, 'y': np.array, 'color': hex, 'filepath': str} }
         self.data_store = {}
+        # Contador para IDs únicos (len(data_store) se repite tras eliminar series)
+        self.series_counter = 0
+        
+        # Auto-guardado de la imagen agrupado: savefig renderiza la figura completa
+        self.autosave_timer = QTimer()
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(1000)
+        self.autosave_timer.timeout.connect(self.auto_save_plot)
         
         # Paleta de colores para asignar automáticamente a nuevas series
         self.colors = [
@@ -191,6 +199,8 @@ class ComparativeTab(QWidget):
         self.figure = Figure(figsize=(10, 8))
         self.canvas = FigureCanvas(self.figure)
         self.toolbar = NavigationToolbar(self.canvas, self)
+        # Líneas persistentes por (serie, subplot): los cambios en la tabla no recrean la figura
+        self.plot_ctrl = SeriesPlotController(self.figure, self.canvas, decorate=self._decorate_axes)
         
         # Botón de Exportación
         btn_export = QPushButton("💾 Guardar Imagen (PNG/PDF)")
@@ -226,6 +236,9 @@ class ComparativeTab(QWidget):
         if not mgr or not mgr.current_project_path:
             return
         
+        # Caché binaria de series del proyecto
+        self.parser.set_cache_dir(mgr.get_cache_dir())
+        
         # Llenar Combo 1: Sistemas
         self.combo_systems.blockSignals(True)
         self.combo_systems.clear()
@@ -323,7 +336,8 @@ class ComparativeTab(QWidget):
             return
 
         # Crear ID único para almacenamiento interno
-        data_id = f"{sys_name}_{filename}_{len(self.data_store)}"
+        data_id = f"{sys_name}_{filename}_{self.series_counter}"
+        self.series_counter += 1
         
         # Etiqueta automática para la leyenda: "Sistema - Etapa - Propiedad"
         prop_name = self.combo_props.currentText()
@@ -436,7 +450,9 @@ class ComparativeTab(QWidget):
     def clear_all(self):
         """Limpia todo"""
         self.data_store = {}
+        self.series_counter = 0
         self.table_series.setRowCount(0)
+        self.plot_ctrl.reset()
         self.update_plot()
 
     # ==========================================================
@@ -444,33 +460,17 @@ class ComparativeTab(QWidget):
     # ==========================================================
     
     def update_plot(self):
-        """Redibuja los gráficos según la configuración de la tabla"""
-        self.figure.clear()
-        
-        # Configurar estilos globales
+        """Sincroniza los gráficos con la tabla reutilizando las líneas ya dibujadas"""
         fs = self.sb_fontsize.value()
-        lw = self.sb_linewidth.value()
-        plt.rcParams.update({'font.size': fs, 'lines.linewidth': lw})
-        
-        # Configurar Layout (Subplots)
         layout_mode = self.combo_layout.currentIndex() # 0=1x1, 1=1x2, 2=2x2
-        axes = []
-        
-        if layout_mode == 0:
-            axes.append(self.figure.add_subplot(111))
-        elif layout_mode == 1:
-            axes.append(self.figure.add_subplot(121))
-            axes.append(self.figure.add_subplot(122))
-        elif layout_mode == 2:
-            axes.append(self.figure.add_subplot(221))
-            axes.append(self.figure.add_subplot(222))
-            axes.append(self.figure.add_subplot(223))
-            axes.append(self.figure.add_subplot(224))
+        
+        # Los ejes solo se recrean si cambia la disposición o el estilo
+        self.plot_ctrl.set_layout(layout_mode, fs, self.sb_linewidth.value())
+        n_axes = len(self.plot_ctrl.axes)
             
         # Recorrer la tabla para ver qué dato va en qué plot
-        row_count = self.table_series.rowCount()
-        
-        for r in range(row_count):
+        entries = []
+        for r in range(self.table_series.rowCount()):
             # Recuperar ID del dato
             key_item = self.table_series.item(r, 0)
             data_id = key_item.data(Qt.ItemDataRole.UserRole)
@@ -479,44 +479,25 @@ class ComparativeTab(QWidget):
             if not data:
                 continue
             
-            # Revisar columnas de checkboxes (Col 2, 3, 4 mapean a plots 0, 1, 2, 3)
-            # Nota: Col 2 = Plot 0. Col 3 = Plot 1. Col 4 = Plot 2 y 3 (simplificación)
-            
-            for i, ax in enumerate(axes):
-                # Lógica de mapeo de columnas:
-                # Si hay 1 gráfico: Col 2 lo controla.
-                # Si hay 2 gráficos: Col 2->Plot1, Col 3->Plot2.
-                # Si hay 4 gráficos: Col 4 lo manda a Plot 3 y 4 (para no saturar tabla).
-                
-                col_idx = i + 2
-                
-                # Ajuste para matrices de 4x4 (usamos la col 4 para los extra)
-                if col_idx > 4: 
-                    col_idx = 4
-                
-                if col_idx < self.table_series.columnCount():
-                    chk = self.table_series.item(r, col_idx)
-                    if chk.checkState() == Qt.CheckState.Checked:
-                        ax.plot(
-                            data['x'], 
-                            data['y'], 
-                            label=data['label'], 
-                            color=data['color']
-                        )
-                        # Poner etiquetas si es el primero
-                        if not ax.get_xlabel(): ax.set_xlabel(data['xlabel'])
-                        if not ax.get_ylabel(): ax.set_ylabel(data['ylabel'])
+            # Lógica de mapeo de columnas:
+            # Si hay 1 gráfico: Col 2 lo controla.
+            # Si hay 2 gráficos: Col 2->Plot1, Col 3->Plot2.
+            # Si hay 4 gráficos: Col 4 lo manda a Plot 3 y 4 (para no saturar tabla).
+            checks = []
+            for i in range(n_axes):
+                chk = self.table_series.item(r, min(i + 2, 4))
+                checks.append(chk is not None and chk.checkState() == Qt.CheckState.Checked)
+            entries.append((data_id, data, checks))
 
-        # Finalizar ejes
-        for i, ax in enumerate(axes):
-            ax.grid(True, linestyle='--', alpha=0.5)
-            ax.legend(fontsize=fs-2)
-            ax.set_title(f"Gráfico Comparativo {i+1}", fontweight='bold')
-
-        self.figure.tight_layout()
-        self.canvas.draw()
+        self.plot_ctrl.sync(entries, legend_size=fs - 2)
         
-        # Auto-guardado temporal
+        # Auto-guardado temporal (una imagen tras una ráfaga de cambios)
+        self.autosave_timer.start()
+
+    def _decorate_axes(self, i, ax):
+        ax.set_title(f"Gráfico Comparativo {i+1}", fontweight='bold')
+
+    def auto_save_plot(self):
         if self.project_mgr and self.project_mgr.current_project_path:
             p = os.path.join(self.project_mgr.current_project_path, "analysis", "last_comparison.png")
             try:
@@ -607,7 +588,8 @@ class ComparativeTab(QWidget):
 
     def _restore_single_series(self, label, x, y, filepath, color, checks, labels):
         """Helper interno para restaurar una serie con propiedades específicas"""
-        data_id = f"restored_{len(self.data_store)}"
+        data_id = f"restored_{self.series_counter}"
+        self.series_counter += 1
         
         self.data_store[data_id] = {
             'label': label,
@@ -0,0 +1,131 @@
+import os
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt6.QtCore import QTimer
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from src.model.edr_reader import EdrReader
+from src.model.decimation import decimate_minmax
+
+
+class LiveEnergyPlot(QWidget):
+    """
+    Gráfica en vivo de las energías del paso en ejecución.
+    Sigue el .edr que escribe mdrun: en cada refresco solo se decodifican los
+    frames añadidos (EdrReader.refresh) y las líneas existentes se actualizan
+    con set_data, sin volver a leer el archivo ni recrear la figura.
+    """
+
+    TERMS = ["Temperature", "Pressure", "Density", "Potential"]
+    REFRESH_MS = 2000
+    MAX_POINTS = 2000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.edr_file = None
+        self.reader = None
+        self.columns = {}   # término -> índice de columna en el .edr
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        hbox = QHBoxLayout()
+        self.lbl_status = QLabel("Energías en vivo: sin ejecución")
+        self.lbl_status.setStyleSheet("color: gray;")
+        hbox.addWidget(self.lbl_status)
+        hbox.addStretch()
+        layout.addLayout(hbox)
+
+        self.figure = Figure(figsize=(8, 3))
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMinimumHeight(220)
+        self.axes = {}
+        self.lines = {}
+        for i, term in enumerate(self.TERMS):
+            ax = self.figure.add_subplot(1, len(self.TERMS), i + 1)
+            ax.set_title(term, fontsize=8)
+            ax.tick_params(labelsize=7)
+            self.axes[term] = ax
+            self.lines[term], = ax.plot([], [], lw=0.8)
+        self.figure.tight_layout()
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    # =========================================================================
+    # CONTROL
+    # =========================================================================
+
+    def start(self, edr_file):
+        """Empieza a seguir un .edr (puede no existir aún: mdrun lo crea al arrancar)"""
+        self.stop()
+        self.edr_file = edr_file
+        self.reader = None
+        self.columns = {}
+        for term in self.TERMS:
+            self.lines[term].set_data([], [])
+            self.axes[term].set_ylabel("")
+        self.lbl_status.setText(f"Energías en vivo: esperando {os.path.basename(edr_file)}...")
+        self.timer.start(self.REFRESH_MS)
+
+    def stop(self):
+        if self.timer.isActive():
+            # Último refresco para mostrar los frames finales
+            self.refresh()
+        self.timer.stop()
+
+    # =========================================================================
+    # REFRESCO INCREMENTAL
+    # =========================================================================
+
+    def refresh(self):
+        if not self.edr_file or not os.path.exists(self.edr_file):
+            return
+        if self.reader is None:
+            try:
+                # La caché en disco no sirve para un archivo que crece cada segundo
+                self.reader = EdrReader(self.edr_file, use_cache=False)
+            except Exception as e:
+                # Cabecera aún incompleta: se reintenta en el siguiente ciclo
+                self.lbl_status.setText(f"Energías en vivo: esperando datos ({e})")
+                return
+            self._bind_terms()
+            new = len(self.reader.times)
+        else:
+            try:
+                # Un frame a medio escribir se ignora (refresh se detiene en el
+                # último frame completo); el lector y sus frames se conservan
+                new = self.reader.refresh()
+            except Exception as e:
+                print(f"Error refrescando energías en vivo: {e}")
+                new = 0
+
+        if new:
+            self._update_lines()
+        times = self.reader.times
+        if len(times):
+            self.lbl_status.setText(f"Energías en vivo: {len(times)} frames, t = {times[-1]:.1f} ps")
+
+    def _bind_terms(self):
+        self.columns = {}
+        for term in self.TERMS:
+            idx = self.reader.find_term(term)
+            if idx is None:
+                self.axes[term].set_title(f"{term} (n/d)", fontsize=8)
+                continue
+            self.columns[term] = idx
+            self.axes[term].set_title(term, fontsize=8)
+            self.axes[term].set_ylabel(self.reader.units[idx], fontsize=7)
+
+    def _update_lines(self):
+        times = self.reader.times
+        for term, idx in self.columns.items():
+            x, y = decimate_minmax(times, self.reader.values[:, idx], self.MAX_POINTS)
+            self.lines[term].set_data(x, y)
+            ax = self.axes[term]
+            ax.relim()
+            ax.autoscale_view()
+        self.canvas.draw_idle()
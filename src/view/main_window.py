@@ -21,6 +21,8 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 850)
         
         self.project_mgr = ProjectManager()
+        # Pestañas cuyo estado aún no se ha cargado para el sistema activo
+        self.stale_tabs = set()
 
         main_widget = QWidget()
         self.main_layout = QVBoxLayout()
@@ -75,6 +77,16 @@ class MainWindow(QMainWindow):
         btn_del.clicked.connect(self.delete_system_dialog)
         h.addWidget(btn_del)
         
+        btn_cache = QPushButton("🧹 Limpiar Caché")
+        btn_cache.setToolTip("Borra la caché binaria de series (.xvg/.csv) del proyecto")
+        btn_cache.clicked.connect(self.purge_cache_dialog)
+        h.addWidget(btn_cache)
+        
+        self.btn_sqlite = QPushButton("🗄️ Migrar a SQLite")
+        self.btn_sqlite.setToolTip("Convierte project_db.json a project_db.sqlite (un registro por sistema, carga bajo demanda)")
+        self.btn_sqlite.clicked.connect(self.migrate_sqlite_dialog)
+        h.addWidget(self.btn_sqlite)
+        
         h.addStretch()
         self.lbl_path_info = QLabel("Ruta: -")
         h.addWidget(self.lbl_path_info)
@@ -186,6 +198,7 @@ class MainWindow(QMainWindow):
         self.enable_tabs(True)
         self.system_bar.setVisible(True)
         self.lbl_status.setText(f"Activo: {self.project_mgr.project_data['name']}")
+        self.btn_sqlite.setVisible(not self.project_mgr.is_sqlite())
         
         self.refresh_systems_combo()
         self.refresh_recent_list() # Actualizar la lista al cargar uno
@@ -238,6 +251,26 @@ class MainWindow(QMainWindow):
                 self.refresh_systems_combo()
                 self.load_active_system_to_tabs()
 
+    def purge_cache_dialog(self):
+        r = QMessageBox.question(self, "Caché", "¿Borrar la caché de datos parseados del proyecto?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if r == QMessageBox.StandardButton.Yes:
+            success, msg = self.project_mgr.purge_cache()
+            if success:
+                QMessageBox.information(self, "Caché", msg)
+            else:
+                QMessageBox.critical(self, "Error", msg)
+
+    def migrate_sqlite_dialog(self):
+        r = QMessageBox.question(self, "SQLite", "¿Convertir el proyecto a SQLite? (project_db.json se conserva como .bak)", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if r == QMessageBox.StandardButton.Yes:
+            self.save_all_states()
+            success, msg = self.project_mgr.migrate_to_sqlite()
+            if success:
+                self.project_loaded()
+                QMessageBox.information(self, "SQLite", msg)
+            else:
+                QMessageBox.critical(self, "Error", msg)
+
     def load_active_system_to_tabs(self):
         path = self.project_mgr.get_active_system_path()
         if not path:
@@ -246,24 +279,45 @@ class MainWindow(QMainWindow):
         
         self.lbl_path_info.setText(f"Ruta: {path}")
         
-        self.setup_tab.update_project_data(self.project_mgr)
-        self.setup_tab.set_state(self.project_mgr.get_tab_state("setup"))
-        
-        self.topo_tab.set_state(self.project_mgr.get_tab_state("topology"))
-        self.topo_tab.update_project_data(self.project_mgr, self.setup_tab.get_molecules_data(), self.setup_tab.get_box_size_value())
-        
-        self.sim_tab.update_project_data(self.project_mgr)
-        self.sim_tab.set_state(self.project_mgr.get_tab_state("simulation"))
-        
-        self.analysis_tab.update_project_data(self.project_mgr)
-        self.analysis_tab.set_state(self.project_mgr.get_tab_state("analysis"))
+        # Hidratación bajo demanda: las pestañas del sistema se cargan la primera vez
+        # que se muestran (Análisis re-lee y re-grafica sus archivos, Simulación revisa
+        # cada nodo). Hasta entonces conservan su contenido anterior sin coste.
+        self.stale_tabs = {self.setup_tab, self.topo_tab, self.sim_tab, self.analysis_tab}
+        self.hydrate_tab(self.tabs.currentWidget())
         
+        # Comparativa y Solubilidad son de nivel proyecto (baratas)
         self.comp_tab.update_project_data(self.project_mgr)
         self.sol_tab.update_project_data(self.project_mgr)
 
+    def hydrate_tab(self, tab):
+        """Carga el estado del sistema activo en la pestaña si aún no se ha hecho"""
+        if tab not in self.stale_tabs:
+            return False
+        self.stale_tabs.discard(tab)
+        
+        if tab is self.setup_tab:
+            self.setup_tab.update_project_data(self.project_mgr)
+            self.setup_tab.set_state(self.project_mgr.get_tab_state("setup"))
+        elif tab is self.topo_tab:
+            # Topología necesita las moléculas y la caja definidas en Setup
+            self.hydrate_tab(self.setup_tab)
+            self.topo_tab.set_state(self.project_mgr.get_tab_state("topology"))
+            self.topo_tab.update_project_data(self.project_mgr, self.setup_tab.get_molecules_data(), self.setup_tab.get_box_size_value())
+        elif tab is self.sim_tab:
+            self.sim_tab.update_project_data(self.project_mgr)
+            self.sim_tab.set_state(self.project_mgr.get_tab_state("simulation"))
+        elif tab is self.analysis_tab:
+            self.analysis_tab.update_project_data(self.project_mgr)
+            self.analysis_tab.set_state(self.project_mgr.get_tab_state("analysis"))
+        return True
+
     def on_tab_changed(self, index):
         self.save_all_states()
         
+        # Primera visita tras cambiar de sistema: la hidratación ya incluye el refresco
+        if self.hydrate_tab(self.tabs.widget(index)):
+            return
+        
         if index == 2:
             self.topo_tab.update_project_data(self.project_mgr, self.setup_tab.get_molecules_data(), self.setup_tab.get_box_size_value())
         elif index == 3: self.sim_tab.update_project_data(self.project_mgr)
@@ -273,10 +327,12 @@ class MainWindow(QMainWindow):
 
     def save_all_states(self):
         if not self.project_mgr.active_system_name: return
-        self.project_mgr.update_tab_state("setup", self.setup_tab.get_state())
-        self.project_mgr.update_tab_state("topology", self.topo_tab.get_state())
-        self.project_mgr.update_tab_state("simulation", self.sim_tab.get_state())
-        self.project_mgr.update_tab_state("analysis", self.analysis_tab.get_state())
+        # Las pestañas sin hidratar aún muestran otro sistema: no se guardan
+        tabs = [("setup", self.setup_tab), ("topology", self.topo_tab),
+                ("simulation", self.sim_tab), ("analysis", self.analysis_tab)]
+        for name, tab in tabs:
+            if tab not in self.stale_tabs:
+                self.project_mgr.update_tab_state(name, tab.get_state())
         self.project_mgr.update_global_state("comparative", self.comp_tab.get_state())
         self.project_mgr.save_db()
 
@@ -285,4 +341,5 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         self.save_all_states()
+        self.project_mgr.flush()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,164 @@
+class SeriesPlotController:
+    """
+    Dibuja las series de las pestañas Análisis y Comparativa sin reconstruir la
+    figura en cada cambio. Cada serie tiene un Line2D persistente por subplot,
+    indexado por (data_id, índice_subplot): marcar/desmarcar o renombrar solo
+    cambia la visibilidad, la etiqueta o el color de ese artista. Los ejes se
+    recrean únicamente si cambia la distribución o el estilo global, y el
+    redibujado se pide con draw_idle (varios cambios seguidos = un solo render).
+    El tamaño de letra y el grosor de línea se aplican por eje y por línea, sin
+    tocar rcParams (global y compartido por ambas pestañas).
+    """
+
+    # Título respecto al tamaño base, como el 'large' por defecto de Matplotlib
+    TITLE_SCALE = 1.2
+
+    # Distribución de subplots por modo de layout (0=1x1, 1=1x2, 2=2x2)
+    LAYOUTS = {0: (111,), 1: (121, 122), 2: (221, 222, 223, 224)}
+
+    def __init__(self, figure, canvas, decorate=None, on_xlim_changed=None, on_zoomed_line_added=None):
+        """
+        Args:
+            figure (Figure): Figura de Matplotlib.
+            canvas (FigureCanvas): Canvas Qt asociado.
+            decorate (callable, opcional): decorate(i, ax) para títulos/etiquetas fijas.
+            on_xlim_changed (callable, opcional): Callback de zoom por eje.
+            on_zoomed_line_added (callable, opcional): Se llama (sin argumentos) cuando
+                aparece una línea nueva en un eje con zoom, para refinarla como las demás.
+        """
+        self.figure = figure
+        self.canvas = canvas
+        self.decorate = decorate
+        self.on_xlim_changed = on_xlim_changed
+        self.on_zoomed_line_added = on_zoomed_line_added
+        self.axes = []
+        self.lines = {}     # (data_id, índice_subplot) -> Line2D
+        self.line_width = None
+        self.font_size = None
+        self._layout_key = None
+
+    def reset(self):
+        """Olvida ejes y líneas (la próxima llamada a set_layout reconstruye)"""
+        self.figure.clear()
+        self.axes = []
+        self.lines = {}
+        self._layout_key = None
+
+    def set_layout(self, layout_mode, font_size, line_width):
+        """
+        Crea los subplots si cambió el layout o el estilo.
+
+        Returns:
+            bool: True si la figura se reconstruyó (las líneas anteriores ya no existen).
+        """
+        key = (layout_mode, font_size, line_width)
+        if key == self._layout_key:
+            return False
+
+        self.reset()
+        self._layout_key = key
+        # Grosor y letra se pasan a cada eje/línea: rcParams es global y lo
+        # comparten las pestañas Análisis y Comparativa
+        self.line_width = line_width
+        self.font_size = font_size
+
+        self.axes = [self.figure.add_subplot(code) for code in self.LAYOUTS.get(layout_mode, (111,))]
+        for i, ax in enumerate(self.axes):
+            ax.grid(True, linestyle='--', alpha=0.5)
+            if self.decorate:
+                self.decorate(i, ax)
+            self._apply_font(ax)
+            if self.on_xlim_changed:
+                ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        self.figure.tight_layout()
+        return True
+
+    def sync(self, entries, legend_size=None):
+        """
+        Ajusta los artistas a la tabla. Las líneas nuevas se crean solo al
+        hacerse visibles; las existentes se reutilizan y las de series que ya no
+        están en la tabla se eliminan.
+
+        Args:
+            entries (list): Tuplas (data_id, data, checks) en el orden de la tabla.
+                data es el dict del data_store ('x', 'y', 'label' y opcionalmente
+                'color', 'xlabel', 'ylabel'); checks[i] indica si va en el subplot i.
+            legend_size (float, opcional): Tamaño de letra de la leyenda. Por
+                defecto, el de set_layout.
+
+        Returns:
+            bool: True si cambió el conjunto de líneas visibles (se re-escalaron los ejes).
+        """
+        if legend_size is None:
+            legend_size = self.font_size
+        wanted = set()
+        handles = [[] for _ in self.axes]
+        first = [None] * len(self.axes)
+        rescale = False
+        zoomed_added = False
+
+        for data_id, data, checks in entries:
+            for i, ax in enumerate(self.axes):
+                visible = i < len(checks) and bool(checks[i])
+                key = (data_id, i)
+                line = self.lines.get(key)
+                if line is None:
+                    if not visible:
+                        continue
+                    style = {'color': data['color']} if data.get('color') else {}
+                    if self.line_width is not None:
+                        style['linewidth'] = self.line_width
+                    # gid = data_id para poder recargar la línea al hacer zoom
+                    line, = ax.plot(data['x'], data['y'], label=data['label'], gid=data_id, **style)
+                    self.lines[key] = line
+                    rescale = True
+                    # Con zoom manual el eje x no se autoescala: la línea llega decimada
+                    zoomed_added |= not ax.get_autoscalex_on()
+                wanted.add(key)
+                rescale |= self._apply(line, visible, data)
+                if visible:
+                    handles[i].append(line)
+                    if first[i] is None:
+                        first[i] = data
+
+        for key in [k for k in self.lines if k not in wanted]:
+            line = self.lines.pop(key)
+            rescale |= line.get_visible()
+            line.remove()
+
+        for i, ax in enumerate(self.axes):
+            if handles[i]:
+                ax.legend(handles=handles[i], fontsize=legend_size)
+            elif ax.get_legend() is not None:
+                ax.get_legend().remove()
+            if first[i] is not None and first[i].get('xlabel'):
+                ax.set_xlabel(first[i]['xlabel'], fontsize=self.font_size)
+                ax.set_ylabel(first[i].get('ylabel', ""), fontsize=self.font_size)
+            if rescale:
+                ax.relim(visible_only=True)
+                ax.autoscale_view()
+
+        self.canvas.draw_idle()
+        if zoomed_added and self.on_zoomed_line_added:
+            self.on_zoomed_line_added()
+        return rescale
+
+    def _apply_font(self, ax):
+        """Tamaño de letra de ticks, etiquetas y título del eje (lo que puso decorate incluido)"""
+        if self.font_size is None:
+            return
+        ax.tick_params(labelsize=self.font_size)
+        ax.xaxis.label.set_fontsize(self.font_size)
+        ax.yaxis.label.set_fontsize(self.font_size)
+        ax.title.set_fontsize(self.font_size * self.TITLE_SCALE)
+
+    def _apply(self, line, visible, data):
+        """Actualiza solo las propiedades que cambiaron. True si cambió la visibilidad."""
+        if line.get_label() != data['label']:
+            line.set_label(data['label'])
+        if data.get('color') and line.get_color() != data['color']:
+            line.set_color(data['color'])
+        if line.get_visible() != visible:
+            line.set_visible(visible)
+            return True
+        return False
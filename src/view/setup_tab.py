@@ -8,7 +8,7 @@ from PyQt6.QtWidgets import (
     QAbstractItemView, QDoubleSpinBox, QCheckBox, QFormLayout
 )
 from src.model.chemistry_tools import ChemistryTools
-from src.controller.workers import CommandWorker
+from src.controller.job_scheduler import CommandJob
 
 class SetupTab(QWidget):
     def __init__(self):
@@ -295,7 +295,7 @@ class SetupTab(QWidget):
         
         if not os.path.exists(inp_file): return
         
-        self.worker = CommandWorker(["packmol"], storage_dir, input_file_path=inp_file)
+        self.worker = CommandJob(["packmol"], storage_dir, input_file_path=inp_file)
         self.worker.log_signal.connect(lambda s: print(f"PKM: {s}"))
         self.worker.finished_signal.connect(self.on_packmol_finished)
         
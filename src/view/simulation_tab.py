@@ -7,35 +7,149 @@ from PyQt6.QtWidgets import (
     QLineEdit, QSpinBox, QDoubleSpinBox, QMessageBox, 
     QTreeWidget, QTreeWidgetItem, QHeaderView, QAbstractItemView,
     QTabWidget, QFormLayout, QLCDNumber, QProgressBar, QFrame, 
-    QCheckBox, QDialog, QPlainTextEdit, QSizePolicy
+    QCheckBox, QDialog, QPlainTextEdit, QSizePolicy, QScrollBar
 )
 from PyQt6.QtCore import Qt, QTimer, QTime
 from src.model.mdp_manager import MdpManager
-from src.controller.workers import CommandWorker
+from src.controller.job_scheduler import CommandJob, JobScheduler, host_cores
+from src.controller.branch_runner import BranchRunner
+from src.controller.mdrun_tuning import MdrunTuningSession
+from src.model.mdrun_tuner import MdrunTuner
+from src.model.mdrun_checkpoint import MdrunCheckpoint
+from src.model.mdrun_telemetry import MdrunTelemetry, performance_regression
+from src.model.log_index import LogIndex
+from src.view.live_energy_plot import LiveEnergyPlot
 
 # ==========================================================
 # CLASE AUXILIAR: VISOR DE LOGS
 # ==========================================================
+class PagedTextView(QPlainTextEdit):
+    """Texto de solo lectura que muestra una ventana de líneas; la rueda mueve la barra externa"""
+    def __init__(self, scrollbar, on_resize):
+        super().__init__()
+        self.scrollbar = scrollbar
+        self.on_resize = on_resize
+        self.setReadOnly(True)
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+
+    def wheelEvent(self, event):
+        steps = -event.angleDelta().y() // 40
+        self.scrollbar.setValue(self.scrollbar.value() + steps)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.on_resize()
+
+    def visible_lines(self):
+        return max(self.viewport().height() // max(self.fontMetrics().lineSpacing(), 1), 1)
+
+
 class LogViewerDialog(QDialog):
-    def __init__(self, log_content, title="Log de Simulación"):
+    """
+    Visor de logs grandes: el archivo se indexa por líneas (mmap, LogIndex) y
+    solo se dibujan las líneas visibles. Permite buscar y seguir el final del
+    archivo mientras el trabajo sigue escribiendo.
+    """
+    def __init__(self, log_path, title="Log de Simulación", follow=False):
         super().__init__()
         self.setWindowTitle(title)
-        self.resize(700, 500)
+        self.resize(900, 600)
+        
+        self.index = LogIndex(log_path)
+        self.first_line = 0
         
         layout = QVBoxLayout()
         
-        self.text_display = QPlainTextEdit()
-        self.text_display.setPlainText(log_content)
-        self.text_display.setReadOnly(True)
+        # --- Búsqueda y seguimiento ---
+        hbox_tools = QHBoxLayout()
+        self.input_search = QLineEdit()
+        self.input_search.setPlaceholderText("Buscar en el log...")
+        self.input_search.returnPressed.connect(lambda: self.find(forward=True))
+        btn_prev = QPushButton("▲")
+        btn_prev.clicked.connect(lambda: self.find(forward=False))
+        btn_next = QPushButton("▼")
+        btn_next.clicked.connect(lambda: self.find(forward=True))
+        self.chk_follow = QCheckBox("Seguir final")
+        self.chk_follow.setChecked(follow)
+        self.chk_follow.toggled.connect(self.on_follow_toggled)
+        self.lbl_position = QLabel()
+        
+        hbox_tools.addWidget(self.input_search)
+        hbox_tools.addWidget(btn_prev)
+        hbox_tools.addWidget(btn_next)
+        hbox_tools.addWidget(self.chk_follow)
+        hbox_tools.addWidget(self.lbl_position)
+        layout.addLayout(hbox_tools)
+        
+        # --- Texto paginado + barra de desplazamiento por líneas ---
+        hbox_text = QHBoxLayout()
+        self.scrollbar = QScrollBar(Qt.Orientation.Vertical)
+        self.scrollbar.valueChanged.connect(self.render_window)
+        self.text_display = PagedTextView(self.scrollbar, self.update_scroll_range)
         self.text_display.setStyleSheet("font-family: monospace; font-size: 10pt; background-color: #f0f0f0;")
-        
-        layout.addWidget(self.text_display)
+        hbox_text.addWidget(self.text_display)
+        hbox_text.addWidget(self.scrollbar)
+        layout.addLayout(hbox_text)
         
         btn_close = QPushButton("Cerrar")
         btn_close.clicked.connect(self.accept)
         layout.addWidget(btn_close)
         
         self.setLayout(layout)
+        
+        # Refresco del índice para el modo seguimiento
+        self.follow_timer = QTimer(self)
+        self.follow_timer.timeout.connect(self.refresh_tail)
+        self.update_scroll_range()
+        self.on_follow_toggled(follow)
+
+    def update_scroll_range(self):
+        page = self.text_display.visible_lines()
+        self.scrollbar.setPageStep(page)
+        self.scrollbar.setMaximum(max(self.index.line_count - page, 0))
+        self.render_window(self.scrollbar.value())
+
+    def render_window(self, first_line):
+        """Dibuja solo las líneas visibles a partir de first_line"""
+        self.first_line = first_line
+        page = self.text_display.visible_lines()
+        self.text_display.setPlainText("\n".join(self.index.lines(first_line, page)))
+        last = min(first_line + page, self.index.line_count)
+        self.lbl_position.setText(f"Líneas {first_line + 1}-{last} de {self.index.line_count}")
+
+    def find(self, forward=True):
+        text = self.input_search.text()
+        if not text: return
+        start = self.first_line + 1 if forward else self.first_line
+        line = self.index.search(text, start, forward=forward)
+        if line is None:
+            self.lbl_position.setText("Sin más coincidencias")
+            return
+        self.chk_follow.setChecked(False)
+        self.scrollbar.setValue(line)
+        
+        # Resaltar la coincidencia en la primera línea visible
+        cursor = self.text_display.document().find(text)
+        if not cursor.isNull():
+            self.text_display.setTextCursor(cursor)
+
+    def on_follow_toggled(self, checked):
+        if checked:
+            self.refresh_tail()
+            self.follow_timer.start(1000)
+        else:
+            self.follow_timer.stop()
+
+    def refresh_tail(self):
+        self.index.refresh()
+        self.update_scroll_range()
+        self.scrollbar.setValue(self.scrollbar.maximum())
+
+    def done(self, result):
+        self.follow_timer.stop()
+        self.index.close()
+        super().done(result)
 
 
 # ==========================================================
@@ -61,6 +175,16 @@ class SimulationTab(QWidget):
         
         # Worker para ejecución en segundo plano
         self.worker = None 
+        # Ejecución concurrente de ramas (modo 'parallel')
+        self.branch_runner = None
+        # Auto-ajuste de hilos de mdrun
+        self.tuning_session = None
+        # Paso en ejecución y reinicios automáticos tras un fallo
+        self.running_item = None
+        self.restart_count = 0
+        self.mdrun_threads = ([], 1)    # (argumentos de hilos, núcleos) del último mdrun
+        # Telemetría de la ejecución de mdrun en curso
+        self.telemetry = None
         
         # Estado del protocolo (Árbol)
         self.protocol_steps = []
@@ -198,10 +322,16 @@ class SimulationTab(QWidget):
         self.btn_log.clicked.connect(self.show_log)
         self.btn_log.setMinimumHeight(40)
         
+        self.btn_tune = QPushButton("⚙ Auto-ajustar Hilos")
+        self.btn_tune.setToolTip("Prueba distribuciones -ntmpi/-ntomp/-npme cortas sobre el TPR actual y guarda la más rápida para este sistema")
+        self.btn_tune.clicked.connect(self.run_mdrun_tuning)
+        self.btn_tune.setMinimumHeight(40)
+        
         hbox_run.addWidget(self.btn_grompp)
         hbox_run.addWidget(self.btn_mdrun)
         hbox_run.addWidget(self.btn_stop)
         hbox_run.addWidget(self.btn_log)
+        hbox_run.addWidget(self.btn_tune)
         
         # Botones de Automatización
         hbox_auto = QHBoxLayout()
@@ -216,8 +346,14 @@ class SimulationTab(QWidget):
         self.btn_run_all.clicked.connect(lambda: self.run_sequence(mode='all'))
         self.btn_run_all.setStyleSheet("background-color: #fff3cd; font-weight: bold;")
         
+        self.btn_run_parallel = QPushButton("⇉ Ejecutar Ramas en Paralelo")
+        self.btn_run_parallel.setToolTip("Lanza a la vez todos los pasos cuyo padre ya terminó, repartiendo los núcleos")
+        self.btn_run_parallel.clicked.connect(lambda: self.run_sequence(mode='parallel'))
+        self.btn_run_parallel.setStyleSheet("background-color: #e3f2fd; font-weight: bold;")
+        
         hbox_auto.addWidget(self.btn_run_branch)
         hbox_auto.addWidget(self.btn_run_all)
+        hbox_auto.addWidget(self.btn_run_parallel)
         
         # --- INFO DE GROMACS ---
         self.lbl_gmx_info = QLabel("Estado: Esperando orden...")
@@ -242,6 +378,10 @@ class SimulationTab(QWidget):
         layout_run.addWidget(self.lbl_gmx_info)
         layout_run.addLayout(hbox_timer)
         
+        # --- ENERGÍAS EN VIVO (sigue el .edr del paso en ejecución) ---
+        self.live_plot = LiveEnergyPlot()
+        layout_run.addWidget(self.live_plot)
+        
         group_run.setLayout(layout_run)
         layout.addWidget(group_run)
         
@@ -703,23 +843,28 @@ class SimulationTab(QWidget):
             item = parent_item.child(i)
             name = item.text(0)
             
-            gro_path = os.path.join(storage, f"{name}.gro")
-            tpr_path = os.path.join(storage, f"{name}.tpr")
-            
-            status = "Pendiente"
-            if os.path.exists(gro_path):
-                status = "Completado"
-            elif os.path.exists(tpr_path):
-                status = "Listo (TPR)"
-            
+            status = self._disk_status(storage, name)
             item.setText(2, status)
             self._set_status_color(item, status)
             
             self._recursive_validate(item, storage)
 
+    def _disk_status(self, storage, name):
+        """Estado de un paso según sus archivos (la pausa se lee del marcador, no del .gro)"""
+        ckpt = MdrunCheckpoint(storage, name)
+        if ckpt.has_checkpoint():
+            return ckpt.status_text()
+        if os.path.exists(os.path.join(storage, f"{name}.gro")):
+            return "Completado"
+        if os.path.exists(os.path.join(storage, f"{name}.tpr")):
+            return "Listo (TPR)"
+        return "Pendiente"
+
     def _set_status_color(self, item, status):
         if status == 'Completado':
             item.setForeground(2, Qt.GlobalColor.green)
+        elif status.startswith('Pausado'):
+            item.setForeground(2, Qt.GlobalColor.darkCyan)
         elif status == 'Listo (TPR)':
             item.setForeground(2, Qt.GlobalColor.darkYellow)
         elif status == 'Error':
@@ -764,6 +909,10 @@ class SimulationTab(QWidget):
         self.execution_mode = mode
         item = self.tree_steps.currentItem()
         
+        if mode == 'parallel':
+            self.run_parallel_tree()
+            return
+        
         if mode == 'all':
             item = self.find_next_pending_node(self.tree_steps.invisibleRootItem())
             if not item:
@@ -790,6 +939,10 @@ class SimulationTab(QWidget):
         if not os.path.exists(os.path.join(d, input_gro)):
             QMessageBox.warning(self, "Bloqueo", f"Falta input: {input_gro}")
             return None
+        if parent and MdrunCheckpoint(d, parent.text(0)).has_checkpoint():
+            # El .gro de un paso pausado es el de la pausa, no el final
+            QMessageBox.warning(self, "Bloqueo", f"El paso {parent.text(0)} está pausado: reanúdelo antes.")
+            return None
         return f"{name}.mdp", input_gro, f"{name}.tpr"
 
     def run_grompp(self):
@@ -807,7 +960,7 @@ class SimulationTab(QWidget):
         
         cmd = ["gmx", "grompp", "-f", mdp, "-c", gro, "-p", "topol.top", "-o", tpr, "-maxwarn", "2"]
         
-        self.worker = CommandWorker(cmd, storage_dir)
+        self.worker = CommandJob(cmd, storage_dir)
         self.worker.log_signal.connect(lambda s: print(f"GROMPP: {s}"))
         self.worker.finished_signal.connect(self.on_grompp_finished)
         
@@ -834,6 +987,7 @@ class SimulationTab(QWidget):
 
         item = self.tree_steps.currentItem()
         if not item: return
+        self.restart_count = 0
         
         n = item.text(0)
         d = self.get_storage_path()
@@ -848,37 +1002,102 @@ class SimulationTab(QWidget):
             ns = self.spin_time_ns.value(); dt = self.spin_dt.value()
             self.total_steps_target = int((ns * 1000) / dt) if dt > 0 else 100000
         
-        cmd = ["gmx", "mdrun", "-v", "-deffnm", n]
+        # Los hilos se fijan aquí (ajuste guardado del sistema activo) y se reutilizan en los reinicios
+        self.mdrun_threads = self.mdrun_thread_args()
+        self._start_mdrun(item, d, self._mdrun_command(d, n, self.mdrun_threads[0]), self.mdrun_threads[1])
+
+    def _mdrun_command(self, d, n, thread_args):
+        # Checkpoint periódico; si hay .cpt se reanuda añadiendo a las salidas existentes
+        return ["gmx", "mdrun", "-v", "-deffnm", n] + MdrunCheckpoint(d, n).mdrun_args() + thread_args
+
+    def _start_mdrun(self, item, d, cmd, n_cores):
+        """
+        Lanza mdrun de un paso con carpeta y comando ya resueltos: un reinicio
+        automático no depende del sistema que esté activo cuando vence el temporizador.
+        """
+        self._cleanup_worker()
+        n = item.text(0)
+        
+        # Telemetría: el parseo de la salida ocurre en el hilo del worker
+        self.telemetry = MdrunTelemetry.for_step(d, n)
         
-        self.worker = CommandWorker(cmd, d)
-        self.worker.log_signal.connect(self.parse_log_output)
+        # Se reservan en el planificador solo los hilos que mdrun va a usar
+        self.worker = CommandJob(cmd, d, name=f"mdrun {n}", cores=n_cores, priority=1,
+                                 line_parser=self.telemetry)
+        self.worker.progress_signal.connect(self.on_mdrun_progress)
         self.worker.finished_signal.connect(self.on_mdrun_finished)
         
         self.btn_grompp.setEnabled(False); self.btn_mdrun.setEnabled(False); self.btn_stop.setEnabled(True)
+        self.running_item = item
         item.setText(2, "Corriendo...")
         item.setForeground(2, Qt.GlobalColor.blue)
-        self.lbl_gmx_info.setText("Iniciando...")
+        self.lbl_gmx_info.setText("Reanudando desde checkpoint..." if "-cpi" in cmd else "Iniciando...")
         
         self.elapsed_seconds_counter = 0; self.timer.start(1000)
         self.start_time_wall = datetime.datetime.now()
+        self.live_plot.start(os.path.join(d, f"{n}.edr"))
         
         self.worker.start()
 
     def stop_simulation(self):
+        if self.branch_runner and self.branch_runner.is_running():
+            self.branch_runner.stop()
         if self.worker:
             self.worker.stop_process()
 
     def on_mdrun_finished(self, success, msg):
         self.timer.stop()
-        item = self.tree_steps.currentItem()
+        self.live_plot.stop()
+        item = self.running_item or self.tree_steps.currentItem()
+        user_stop = getattr(self.worker, 'cancel_requested', False)
+        # Carpeta del trabajo que terminó (el usuario puede haber cambiado de sistema)
+        d = self.worker.wd
+        n = item.text(0)
+        ckpt = MdrunCheckpoint(d, n)
+        
+        # Detener = SIGTERM: mdrun guarda .cpt y .gro y sale con código 0, así que
+        # la cancelación se mira antes que 'success' y la pausa queda registrada
+        # (solo si mdrun llegó a correr: cancelado en cola no hay nada que pausar)
+        if user_stop:
+            if self.worker.was_started():
+                ckpt.mark_paused()
+        # Fallo no pedido por el usuario: reintentar desde el último checkpoint
+        # (sin .cpt y fallando al arrancar, repetir daría el mismo error)
+        elif not success and self.restart_count < MdrunCheckpoint.MAX_RESTARTS and \
+                ckpt.should_restart(self.worker.run_seconds()):
+            self.restart_count += 1
+            item.setText(2, f"Reiniciando ({self.restart_count}/{MdrunCheckpoint.MAX_RESTARTS})")
+            item.setForeground(2, Qt.GlobalColor.darkYellow)
+            self.lbl_gmx_info.setText(f"mdrun falló ({msg}); reintentando...")
+            thread_args, n_cores = self.mdrun_threads
+            cmd = self._mdrun_command(d, n, thread_args)
+            QTimer.singleShot(3000, lambda: self._start_mdrun(item, d, cmd, n_cores))
+            return
         
         self.btn_grompp.setEnabled(True); self.btn_mdrun.setEnabled(True); self.btn_stop.setEnabled(False)
-        status = "Completado" if success else "Error"
+        if user_stop:
+            status = self._disk_status(d, n)
+        elif success:
+            ckpt.clear_paused()
+            status = "Completado"
+        elif ckpt.has_checkpoint():
+            # Caído con checkpoint: queda pausado y se puede reanudar
+            status = ckpt.status_text()
+        else:
+            status = "Error"
         item.setText(2, status)
         self._set_status_color(item, status)
         
+        if user_stop:
+            self.lbl_gmx_info.setText(f"PAUSADO - {status}")
+            return
+        
         if success:
             self.lbl_gmx_info.setText("FINALIZADO")
+            # Aviso de regresión de rendimiento respecto a ejecuciones previas del paso
+            loss = performance_regression(self.telemetry.csv_path, self.telemetry.run_id) if self.telemetry else None
+            if loss:
+                self.lbl_gmx_info.setText(f"FINALIZADO - ⚠ {loss * 100:.0f}% más lento que la mejor ejecución previa")
             
             next_node = None
             if self.execution_mode == 'branch':
@@ -900,6 +1119,133 @@ class SimulationTab(QWidget):
         else:
             QMessageBox.warning(self, "Error", msg)
 
+    # --- AUTO-AJUSTE DE HILOS (MDRUN) ---
+    def mdrun_thread_args(self):
+        """
+        Hilos de mdrun: la distribución ajustada del sistema (solo si se midió con
+        estos núcleos) o, si no la hay, '-nt' con todos los núcleos del planificador.
+        Es una reserva fija: si hay núcleos ocupados, mdrun espera en la cola a
+        tenerlos en vez de arrancar con los pocos libres al encolarse.
+
+        Returns:
+            tuple: (argumentos, núcleos que ocupa mdrun)
+        """
+        tuned = self.project_mgr.get_system_setting("mdrun_layout") if self.project_mgr else None
+        if tuned and tuned.get("cores") == host_cores():
+            layout = tuned["layout"]
+            return MdrunTuner().layout_args(layout), layout['ntmpi'] * layout['ntomp']
+        n = JobScheduler.instance().total_cores
+        return ["-nt", str(n)], n
+
+    def run_mdrun_tuning(self):
+        item = self.tree_steps.currentItem()
+        d = self.get_storage_path()
+        if not item or not d: return
+        
+        n = item.text(0)
+        if not os.path.exists(os.path.join(d, f"{n}.tpr")):
+            QMessageBox.warning(self, "Error", "Compile primero el paso (falta TPR).")
+            return
+        
+        self.tuning_session = MdrunTuningSession(d, n)
+        self.tuning_session.progress_signal.connect(self.lbl_gmx_info.setText)
+        self.tuning_session.finished_signal.connect(self.on_tuning_finished)
+        self.btn_tune.setEnabled(False); self.btn_mdrun.setEnabled(False)
+        self.tuning_session.start()
+
+    def on_tuning_finished(self, success, msg):
+        self.btn_tune.setEnabled(True); self.btn_mdrun.setEnabled(True)
+        self.lbl_gmx_info.setText(msg)
+        if success and self.project_mgr:
+            self.project_mgr.update_system_setting("mdrun_layout", self.tuning_session.best)
+            QMessageBox.information(self, "Ajuste de mdrun", f"{msg}\nSe aplicará a los próximos mdrun de este sistema.")
+        elif not success:
+            QMessageBox.warning(self, "Ajuste de mdrun", msg)
+
+    # --- EJECUCIÓN CONCURRENTE (ÁRBOL COMO GRAFO) ---
+    def _tree_items(self, parent=None):
+        """Lista (item, nombre_padre) en preorden"""
+        parent = parent or self.tree_steps.invisibleRootItem()
+        items = []
+        for i in range(parent.childCount()):
+            child = parent.child(i)
+            items.append((child, child.parent().text(0) if child.parent() else None))
+            items.extend(self._tree_items(child))
+        return items
+
+    def _find_item(self, name):
+        for item, _ in self._tree_items():
+            if item.text(0) == name:
+                return item
+        return None
+
+    def _prepare_node_mdp(self, name):
+        """Asegura el .mdp del nodo en disco (plantilla + valores por defecto, como en la cascada)"""
+        d = self.get_storage_path()
+        if os.path.exists(os.path.join(d, f"{name}.mdp")):
+            return True
+        item = self._find_item(name)
+        if item is None:
+            return False
+        self.tree_steps.setCurrentItem(item)
+        self.on_node_selected(item, 0)
+        self.save_mdp_to_disk()
+        return os.path.exists(os.path.join(d, f"{name}.mdp"))
+
+    def run_parallel_tree(self):
+        d = self.get_storage_path()
+        if not d: return
+        if self.branch_runner and self.branch_runner.is_running():
+            QMessageBox.information(self, "Info", "Ya hay una ejecución en paralelo en curso.")
+            return
+        
+        # El nodo en edición se guarda antes de lanzar
+        self.save_mdp_to_disk()
+        nodes = [(item.text(0), parent, item.text(2)) for item, parent in self._tree_items()]
+        
+        self.branch_runner = BranchRunner(d, nodes, prepare_fn=self._prepare_node_mdp)
+        self.branch_runner.node_started.connect(self.on_parallel_node_started)
+        self.branch_runner.node_finished.connect(self.on_parallel_node_finished)
+        self.branch_runner.progress_signal.connect(lambda name, rec: self.on_mdrun_progress(rec, name))
+        self.branch_runner.finished_signal.connect(self.on_parallel_finished)
+        
+        self.btn_grompp.setEnabled(False); self.btn_mdrun.setEnabled(False); self.btn_stop.setEnabled(True)
+        self.btn_run_parallel.setEnabled(False)
+        self.elapsed_seconds_counter = 0; self.timer.start(1000)
+        self.start_time_wall = datetime.datetime.now()
+        self.branch_runner.start()
+
+    def on_parallel_node_started(self, name):
+        item = self._find_item(name)
+        if item:
+            item.setText(2, "Corriendo...")
+            item.setForeground(2, Qt.GlobalColor.blue)
+        running = [n for n in self.branch_runner.slots]
+        self.lbl_gmx_info.setText(f"En paralelo: {', '.join(running)}")
+
+    def on_parallel_node_finished(self, name, success, msg):
+        item = self._find_item(name)
+        if item:
+            ckpt = MdrunCheckpoint(self.get_storage_path(), name)
+            if success or ckpt.has_checkpoint() or self.branch_runner.stopped:
+                status = self._disk_status(self.get_storage_path(), name)
+            else:
+                status = "Error"
+            item.setText(2, status)
+            self._set_status_color(item, status)
+        if not success:
+            print(f"Error en {name}: {msg}")
+
+    def on_parallel_finished(self, success, msg):
+        self.timer.stop()
+        self.btn_grompp.setEnabled(True); self.btn_mdrun.setEnabled(True); self.btn_stop.setEnabled(False)
+        self.btn_run_parallel.setEnabled(True)
+        self.lbl_gmx_info.setText("FINALIZADO" if success else "Terminado con errores")
+        if success:
+            QMessageBox.information(self, "Secuencia Terminada", msg)
+        else:
+            QMessageBox.warning(self, "Aviso", msg)
+
     def find_next_pending_node(self, parent):
         for i in range(parent.childCount()):
             child = parent.child(i)
@@ -915,26 +1261,26 @@ class SimulationTab(QWidget):
         if not item or not d: return
         log = os.path.join(d, f"{item.text(0)}.log")
         if os.path.exists(log):
-            with open(log, 'r') as f: c = f.read()
-            LogViewerDialog(c, f"Log {item.text(0)}").exec()
+            # Paso en ejecución: abrir siguiendo el final del log
+            running = item is self.running_item and self.worker is not None and self.worker.isRunning()
+            LogViewerDialog(log, f"Log {item.text(0)}", follow=running).exec()
         else: QMessageBox.information(self, "Info", "No hay log.")
 
     def update_elapsed_time(self):
         self.elapsed_seconds_counter += 1
         self.lbl_elapsed.setText(str(datetime.timedelta(seconds=self.elapsed_seconds_counter)))
 
-    def parse_log_output(self, text):
-        l = text.strip()
-        if "finish time" in l.lower(): 
-            try: self.lbl_gmx_info.setText(f"Fin: {l.split(':',1)[1].strip()}")
-            except: pass
-        if "Rem:" in l: 
-            try: self.lbl_gmx_info.setText(f"Faltan: {l.split('Rem:')[1].split('  ')[0]}")
-            except: pass
-        match = re.search(r"^\s*(\d+)\s+[\d\.]+", l)
-        if match: 
-            if "GMX" not in self.lbl_gmx_info.text():
-                self.lbl_gmx_info.setText(f"Paso {match.group(1)}")
+    def on_mdrun_progress(self, record, node_name=None):
+        """Muestra el último registro de telemetría (ya parseado en el worker)"""
+        parts = [f"Paso {record['step']}"]
+        if record.get('time_ps') is not None:
+            parts.append(f"{record['time_ps'] / 1000.0:.3f} ns")
+        if record.get('ns_per_day'):
+            parts.append(f"{record['ns_per_day']:.1f} ns/día ({record['hours_per_ns']:.2f} h/ns)")
+        if record.get('eta_s') is not None:
+            parts.append(f"Faltan {datetime.timedelta(seconds=int(record['eta_s']))}")
+        prefix = f"[{node_name}] " if node_name else ""
+        self.lbl_gmx_info.setText(prefix + " | ".join(parts))
 
     # --- APLICAR T RAMA ---
     def apply_temp_to_branch(self):
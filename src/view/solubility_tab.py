@@ -1,4 +1,5 @@
 import os
+import threading
 import numpy as np
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
@@ -58,6 +59,7 @@ class SolubilityTab(QWidget):
         self.project_mgr = None
         self.manager = None # Se instancia al recibir el project_mgr
         self.worker = None
+        self.batch_cancel = threading.Event()
         
         # Datos calculados (Cache)
         self.calculated_results = {} 
@@ -152,12 +154,22 @@ class SolubilityTab(QWidget):
         l_right.addRow("Grupo Soluto (ndx):", self.txt_grp1)
         l_right.addRow("Grupo Solvente (ndx):", self.txt_grp2)
         
+        # Sistemas procesados a la vez: los núcleos se reparten entre ellos
+        self.sb_parallel = QSpinBox(); self.sb_parallel.setRange(1, max(os.cpu_count() or 1, 1))
+        self.sb_parallel.setValue(min(4, os.cpu_count() or 1))
+        l_right.addRow("Sistemas en paralelo:", self.sb_parallel)
+        
         # Botón Ejecutar Batch
         self.btn_calc_batch = QPushButton("▶ Calcular RDFs y Parámetros")
         self.btn_calc_batch.setStyleSheet("background-color: #d4edda; font-weight: bold; padding: 10px; color: green;")
         self.btn_calc_batch.clicked.connect(self.run_batch_calculation)
         l_right.addRow(self.btn_calc_batch)
         
+        self.btn_stop_batch = QPushButton("⏹ Detener")
+        self.btn_stop_batch.setEnabled(False)
+        self.btn_stop_batch.clicked.connect(self.stop_batch_calculation)
+        l_right.addRow(self.btn_stop_batch)
+        
         self.progress_bar = QProgressBar(); self.progress_bar.setTextVisible(True)
         l_right.addRow(self.progress_bar)
         
@@ -309,21 +321,37 @@ class SolubilityTab(QWidget):
         g2 = self.txt_grp2.text()
         
         self.btn_calc_batch.setEnabled(False)
+        self.btn_stop_batch.setEnabled(True)
         self.progress_bar.setRange(0, 0) # Indeterminado
         
-        # Primero ejecutamos la generación de RDFs (pesado)
+        # Primero ejecutamos la generación de RDFs (pesado): el generador encola un
+        # trabajo por sistema en el planificador global y reporta según terminan
+        self.batch_cancel = threading.Event()
         self.worker = BatchWorker(
             self.manager.run_batch_rdfs, 
-            systems_config, step, g1, g2
+            systems_config, step, g1, g2,
+            max_parallel=self.sb_parallel.value(),
+            cancel_event=self.batch_cancel
         )
         self.worker.progress_signal.connect(self.lbl_status.setText)
         # Al terminar RDFs, calculamos parámetros matemáticos (rápido)
         self.worker.finished_signal.connect(lambda s, m: self.on_batch_finished(s, m, systems_config))
         self.worker.start()
 
+    def stop_batch_calculation(self):
+        # Los sistemas en cola se descartan; los que ya corren terminan su pasada
+        self.batch_cancel.set()
+        self.btn_stop_batch.setEnabled(False)
+        self.lbl_status.setText("Deteniendo...")
+
     def on_batch_finished(self, success, msg, config):
         self.progress_bar.setRange(0, 100); self.progress_bar.setValue(100)
         self.btn_calc_batch.setEnabled(True)
+        self.btn_stop_batch.setEnabled(False)
+        
+        if self.batch_cancel.is_set():
+            self.lbl_status.setText("Cálculo detenido.")
+            return
         
         if not success:
             QMessageBox.critical(self, "Error", msg)
@@ -8,7 +8,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from src.model.chemistry_tools import ChemistryTools
-from src.controller.workers import CommandWorker
+from src.controller.job_scheduler import CommandJob
 
 class TopologyTab(QWidget):
     def __init__(self):
@@ -179,7 +179,7 @@ class TopologyTab(QWidget):
         val = str(self.box_size_nm)
         cmd = ["gmx", "editconf", "-f", "system_init.pdb", "-o", "system.gro", "-box", val, val, val]
         
-        self.worker = CommandWorker(cmd, storage_dir)
+        self.worker = CommandJob(cmd, storage_dir)
         # Conectar señal de fin
         self.worker.finished_signal.connect(self.on_editconf_finished)
         self.worker.start()